@@ -1,7 +1,7 @@
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, ConversationHandler, CallbackQueryHandler, filters
 
 from app.utils.time_calc import *
-from app.bot.handlers.jobs import check_overdue_tasks
+from app.bot.handlers.jobs import check_overdue_tasks, reconcile_overdue_tasks
 from app.bot.handlers.update_task_handler import get_update_task_conversation_handler
 from app.config import settings
 from app.bot.handlers.base_handlers import start_command, ayuda_command, handle_message
@@ -16,8 +16,12 @@ from app.bot.handlers.task_handler import agregar_tarea_command
 from app.bot.handlers.premium_handler import premium_command
 from app.bot.handlers.register_handler import registro_command, handle_survey_response
 from app.bot.handlers.update_handler import actualizar_habilidades_command, handle_survey_response2
+from app.bot.handlers.talent_handler import buscartalento_command
 from app.bot.handlers.task_handler import get_task_conversation_handler, listar_tareas_command
 from app.bot.handlers.llm.nlp_handler import NLPHandler
+from app.scheduler.deadlines import deadline_scheduler
+from app.services.llm_registry import LLMRegistry, LLM_REGISTRY_KEY
+from app.utils.load_prompt import prompt_registry
 
 
 class BotManager:
@@ -25,20 +29,29 @@ class BotManager:
         self.application = None
         self.bot_username = settings.BOT_USERNAME
         self.nlp_handler = None
-
-    async def initialize(self):
-        """Initializes the Telegram application"""
-        self.nlp_handler = NLPHandler(
+        self.llm_registry = LLMRegistry(
             api_key=settings.GEMINI_KEY,
             model=settings.LLM_MODEL
         )
 
+    async def initialize(self):
+        """Initializes the Telegram application"""
+        # Fail fast on a broken template instead of on the first LLM call
+        prompt_registry.load_all()
+
+        # Open the shared LLM connection before the first update arrives
+        await self.llm_registry.warm_up()
+        self.nlp_handler = NLPHandler(self.llm_registry.get())
+
         self.application = (
             ApplicationBuilder()
             .token(settings.TELEGRAM_TOKEN)
             .build()
         )
 
+        # Handlers and jobs get the shared LLM client through bot_data
+        self.application.bot_data[LLM_REGISTRY_KEY] = self.llm_registry
+
         # Configure scheduler
         self._setup_scheduler()
 
@@ -46,6 +59,10 @@ class BotManager:
         await self.application.initialize()
         await self.application.start()
 
+        # Fire the overdue job as soon as each deadline passes
+        await deadline_scheduler.load()
+        deadline_scheduler.start(self._on_deadlines)
+
     async def _register_handlers(self):
         """Registers all the handlers"""
 
@@ -73,6 +90,9 @@ class BotManager:
         self.application.add_handler(CallbackQueryHandler(handle_survey_response))
         self.application.add_handler(CallbackQueryHandler(handle_survey_response2))
 
+        # Talent search
+        self.application.add_handler(CommandHandler("buscartalento", buscartalento_command))
+
         # Conversation handlers
         self.application.add_handler(get_project_conversation_handler())
         self.application.add_handler(get_task_conversation_handler())
@@ -93,15 +113,20 @@ class BotManager:
         """Configure programmed jobs"""
         job_queue = self.application.job_queue
 
-        # Verify overdue tasks every 15 mins (can be changed)
+        # Deadlines are handled by deadline_scheduler; this full pass only reconciles
         job_queue.run_repeating(
-            check_overdue_tasks,
-            interval=900,
+            reconcile_overdue_tasks,
+            interval=settings.OVERDUE_RECONCILE_INTERVAL,
             first=seconds_until_next_quarter()
         )
 
+    async def _on_deadlines(self, task_ids):
+        """Runs the overdue job for the tasks whose deadline just passed"""
+        self.application.job_queue.run_once(check_overdue_tasks, when=0, data=task_ids)
+
     async def shutdown(self):
         """Shuts down the Telegram application"""
+        await deadline_scheduler.stop()
         if self.application:
             await self.application.stop()
             await self.application.shutdown()
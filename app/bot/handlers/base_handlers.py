@@ -2,8 +2,9 @@ import logging
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 
-from app.models.models import User, UserSkill
+from app.models.models import UserSkill
 from app.services.skill_service import SkillService
+from app.services.user_registry import user_registry
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ help_message = """
 ▫️ `/registro` → Registra tus habilidades técnicas (solo en chat privado).  
 ▫️ `/actualizar_habilidades` → Modifica tu perfil técnico.  
 ▫️ `/misproyectos` → Lista tus proyectos activos.  
+▫️ `/buscartalento` → Busca usuarios por habilidades (p. ej. `database>=4 orden=testing`).  
 ▫️ `/premium` → Mejora a plan premium (proyectos ilimitados).  
 ▫️ `/nuevoproyecto` → Crea un nuevo proyecto (solo en grupos).  
 ▫️ `/agregartarea` → Añade una tarea a un proyecto.  
@@ -63,7 +65,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     await update.message.reply_text(f"El chat ID de este grup es: {chat_id}")
 
-    if not (user := await User.get_or_none(id=user_id)):
+    if not await user_registry.is_registered(user_id):
         await update.message.reply_text(
             "❗No estás registrado en el sistema. Utiliza el comando /registro para registrarte."
         )
@@ -84,7 +86,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     chat_id = update.effective_chat.id
 
-    if not (user := await User.get_or_none(id=user_id)):
+    if not await user_registry.is_registered(user_id):
         await update.message.reply_text(
             "❗No estás registrado en el sistema. Utiliza el comando /registro para registrarte."
         )
@@ -1,58 +1,55 @@
 # app/bot/handlers/jobs.py
+import logging
 from datetime import datetime, timezone
 
-from app.config import Settings
-from app.models.models import Task, TaskStatus, ProjectUser, User
-from app.services.gemini_service import GeminiService
-from app.services.project_service import ProjectService
-from app.services.task_service import TaskService
+from app.scheduler.deadlines import deadline_scheduler
+from app.scheduler.state import OVERDUE_SCAN, get_watermark, set_watermark
+from app.services.llm_registry import get_llm
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
 
 
 async def check_overdue_tasks(context):
     now = datetime.now(timezone.utc)
 
-    # Get non completed overdue tasks
-    overdue_tasks = await Task.filter(
-        deadline__lt=now
-    ).exclude(
-        status=TaskStatus.DONE
-    ).prefetch_related('project')
+    # Jobs fired by the deadline scheduler carry the IDs of the tasks that just expired;
+    # otherwise only the slice after the last scan's watermark is read
+    job = getattr(context, "job", None)
+    task_ids = job.data if job is not None and job.data else None
+    since = await get_watermark(OVERDUE_SCAN) if task_ids is None else None
 
-    for task in overdue_tasks:
-        try:
-            chat_id = int(task.project.telegram_chat_id)
-            formatted_deadline = task.deadline.astimezone(timezone.utc).strftime('%d/%m/%Y %H:%M PST')
-
-            project_users = await ProjectService.get_project_members(task.project.id)
-            tasks = await TaskService.get_tasks_by_project(task.project.id)
-            assigned_user = await TaskService.get_user_by_task(task.id)
-
-            assigned_tasks = ''
-            for tk in tasks:
-                assigned_tasks += f"""
-                User {await TaskService.get_user_by_task(tk.id)} - Task {tk.custom_id} {tk.name} {tk.deadline}\n
-                """
-
-            # Build context for AI service
-            context_ai = {
-                "custom_id": task.custom_id,
-                "task_name": task.name,
-                "deadline": task.deadline.strftime('%d/%m/%Y %H:%M'),
-                "project_name": task.project.name,
-                "assigned_user": assigned_user,
-                "current_status": task.status.value,
-                "team_members": project_users,
-                "all_project_tasks": assigned_tasks,
-            }
-
-            llm = GeminiService(Settings.GEMINI_KEY, Settings.LLM_MODEL)
-            notification = await llm.solve_overdue_task(context_ai)
+    # One digest (one LLM call, one message) per project, only with the tasks that
+    # are new, changed or escalated since they were last notified
+    digests = await NotificationService.get_overdue_digests(now, task_ids=task_ids, since=since)
+    llm = get_llm(context) if digests else None
 
+    sent = []
+    for digest in digests:
+        try:
+            notification = await NotificationService.render_digest(digest, llm)
             await context.bot.send_message(
-                chat_id=chat_id,
+                chat_id=digest.chat_id,
                 text=notification,
                 parse_mode="Markdown"
             )
+            sent.append(digest)
 
         except Exception as e:
-            print(f"Error in task {task.id}: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error notifying project {digest.project_id}: {str(e)}")
+
+    await NotificationService.mark_notified(sent, now)
+
+    # A failed project keeps the watermark back so its slice is read again next time
+    if task_ids is None and len(sent) == len(digests):
+        await set_watermark(OVERDUE_SCAN, now)
+
+
+async def reconcile_overdue_tasks(context):
+    """
+    Low-frequency pass: rebuilds the deadline heap (catching tasks changed outside
+    TaskService) and scans the overdue tasks past the watermark.
+    """
+    scheduled = await deadline_scheduler.load()
+    logger.info(f"Deadline scheduler reloaded with {scheduled} tasks")
+    await check_overdue_tasks(context)
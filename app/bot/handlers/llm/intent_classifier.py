@@ -1,20 +1,73 @@
+import re
+import unicodedata
+
+from app.config import settings
 from app.services.gemini_service import GeminiService
+from app.services.nlp_schemas import Intent
+from app.utils.cache import TTLCache
+from app.utils.extract_data import extract_intent_and_params
+from app.utils.load_prompt import prompt_registry
 import yaml
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
-class IntentClassifier:
-    def __init__(self, api_key: str, model: str):
-        self.llm = GeminiService(api_key, model)
-        self.prompts = self._load_prompt()
+# Labels the intents prompt can answer with
+INTENTS = tuple(intent.value for intent in Intent)
+
+# Intents whose handlers need parameters extracted from the message
+PARAM_INTENTS = (Intent.CREAR_PROYECTO.value, Intent.AGREGAR_TAREA.value)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """
+    Normalizes a message for cache lookups: lowercase, no accents,
+    no punctuation and single spaces.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
-    def _load_prompt(self) -> str:
-        with open("app/services/prompts/intents.txt") as f:
-            return f.read()
+
+class IntentClassifier:
+    def __init__(self, llm: GeminiService, cache: TTLCache = None):
+        self.llm = llm
+        self.cache = cache or TTLCache(maxsize=settings.INTENT_CACHE_SIZE, ttl=settings.INTENT_CACHE_TTL)
 
     async def classify(self, text: str) -> str:
-        result = await self.llm.detect_intent(text=self.prompts, intent_prompt=text)
+        key = normalize_message(text)
+        intent = self.cache.get(key)
+        if intent:
+            return intent
+
+        result = await self.llm.detect_intent(text=prompt_registry.get("intents"), intent_prompt=text)
+        # Only cache real labels, so an LLM failure isn't remembered as "ayuda"
+        if result in INTENTS:
+            self.cache.set(key, result)
         return result if result else "ayuda"
 
+    async def classify_with_params(self, text: str) -> Tuple[str, Optional[dict]]:
+        """
+        Classifies a message and, for project/task creation, extracts its parameters
+        in the same LLM call.
+
+        Returns:
+            (intent, parameters or None if the intent doesn't take any)
+        """
+        key = normalize_message(text)
+        intent = self.cache.get(key)
+        if intent and intent not in PARAM_INTENTS:
+            return intent, None
+
+        result = await extract_intent_and_params(text, self.llm)
+        if result is None:
+            return intent or "ayuda", None
+
+        self.cache.set(key, result.intent.value)
+        return result.intent.value, result.params()
+
     """
     def _load_prompts(self) -> Dict[str, str]:
         with open("app/services/prompts/intents.yaml") as f:
@@ -28,4 +81,4 @@ class IntentClassifier:
                 print("RESULT: ", result)
                 return intent
         return "otras"
-    """
\ No newline at end of file
+    """
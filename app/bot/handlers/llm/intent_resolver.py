@@ -6,6 +6,7 @@ from app.bot.handlers.update_handler import actualizar_habilidades_command
 from app.bot.handlers.project_handler2 import  crear_proyecto_command, handle_nlp_project
 from telegram import Update
 from telegram.ext import ContextTypes, MessageHandler, filters
+from app.services.llm_registry import get_llm
 from app.utils.extract_data import extract_project_data, extract_task_data
 
 
@@ -18,7 +19,7 @@ class IntentResolver:
         "ayuda": ayuda_command,
     }
 
-    async def resolve(self, intent: str, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def resolve(self, intent: str, update: Update, context: ContextTypes.DEFAULT_TYPE, params: dict = None):
         handler = self.INTENT_HANDLERS.get(intent)
 
         if not handler:
@@ -27,14 +28,16 @@ class IntentResolver:
         text = update.message.text
         print("USER MESSAGE: ", text)
 
-        # Extract parameters based on the intent
+        # Extract parameters based on the intent, unless the classifier already did
         if intent == "crear_proyecto_nlp":
-            params = await extract_project_data(text)
+            if params is None:
+                params = await extract_project_data(text, get_llm(context))
             context.user_data["project_data"] = params
             print("PARAMS: ", params)
 
         if intent == "agregar_tarea_nlp":
-            params = await extract_task_data(text)
+            if params is None:
+                params = await extract_task_data(text, get_llm(context))
             context.user_data["task_data"] = params
             print("PARAMS: ", params)
 
@@ -0,0 +1,156 @@
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.bot.handlers.llm.intent_classifier import INTENTS, normalize_message
+
+CORPUS_PATH = Path(__file__).resolve().parent / "intent_corpus.tsv"
+
+# Keyword rules over the normalized message. A message matching the rules of exactly one
+# intent is answered with at least RULE_CONFIDENCE.
+INTENT_RULES: Dict[str, List[re.Pattern]] = {
+    "registro": [
+        re.compile(r"\bregistr(ar|arme|ame|o|arse)\b(?!.*\b(proyecto|tarea)\b)"),
+        re.compile(r"\b(dar|darme|dame) de alta\b(?!.*\bproyecto\b)"),
+        re.compile(r"\binscrib\w*"),
+        re.compile(r"\b(crear|abrir) (mi |una )?cuenta\b"),
+    ],
+    "actualizar_habilidades": [
+        re.compile(r"\b(actualiz|modific|cambi|edit|corrig|renov)\w*\b.*\b(habilidad\w*|skills?|perfil|nivel|lenguaje|framework)\b"),
+        re.compile(r"\b(habilidad\w*|skills?)\b.*\b(actualiz|modific|cambi|edit)\w*"),
+    ],
+    "crear_proyecto_nlp": [
+        re.compile(r"\b(crea|crear|creame|nuevo|inicia|iniciar|arma|armar|armemos|abre|abrir|empez\w*|comenz\w*|haz|registra)\b.*\bproyecto\b"),
+        re.compile(r"\bproyecto\b.*\b(nuevo|llamado)\b"),
+    ],
+    "agregar_tarea_nlp": [
+        re.compile(r"\b(agreg|anad|crea|nueva|asign|registr|pon|inclu|program)\w*\b.*\btarea\b"),
+        re.compile(r"^tarea\b"),
+    ],
+    "ayuda": [
+        re.compile(r"^(ayuda|hola|buenos dias|buenas tardes|gracias|menu)$"),
+        re.compile(r"\b(que puedes hacer|como funcion\w*|comandos|como (te )?us\w*)\b"),
+    ],
+}
+
+RULE_CONFIDENCE = 0.9
+# Sharpness of the model posterior, applied to the per-feature mean log likelihood
+MODEL_SCALE = 2.0
+
+
+def _features(text: str) -> List[str]:
+    """
+    Word unigrams plus character 3-5 grams of each word (with boundary markers).
+    """
+    features = []
+    for word in text.split():
+        features.append(f"w:{word}")
+        padded = f" {word} "
+        for n in (3, 4, 5):
+            features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return features
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[Tuple[str, str]]:
+    """
+    Reads a TAB separated (intent, message) file, skipping comments and blank lines.
+    """
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            intent, message = line.rstrip("\n").split("\t", 1)
+            samples.append((intent, message))
+    return samples
+
+
+class LocalIntentClassifier:
+    """
+    In-process intent classifier: keyword rules plus a multinomial Naive Bayes model over
+    word and character n-grams, trained on the corpus shipped next to this module.
+    Answers in well under a millisecond; callers fall back to the LLM on low confidence.
+    """
+
+    def __init__(self, samples: Optional[Iterable[Tuple[str, str]]] = None, alpha: float = 0.1):
+        self.alpha = alpha
+        self._fit(samples if samples is not None else load_corpus())
+
+    def _fit(self, samples: Iterable[Tuple[str, str]]) -> None:
+        doc_counts: Counter = Counter()
+        feature_counts: Dict[str, Counter] = defaultdict(Counter)
+        for intent, message in samples:
+            doc_counts[intent] += 1
+            feature_counts[intent].update(_features(normalize_message(message)))
+
+        total_docs = sum(doc_counts.values())
+        vocabulary = set()
+        for counts in feature_counts.values():
+            vocabulary.update(counts)
+        vocab_size = len(vocabulary)
+
+        self.intents = [intent for intent in INTENTS if doc_counts[intent]]
+        self.log_prior = {intent: math.log(doc_counts[intent] / total_docs) for intent in self.intents}
+        self.log_likelihood: Dict[str, Dict[str, float]] = {}
+        self.log_unseen: Dict[str, float] = {}
+        for intent in self.intents:
+            counts = feature_counts[intent]
+            denominator = sum(counts.values()) + self.alpha * vocab_size
+            self.log_likelihood[intent] = {
+                feature: math.log((count + self.alpha) / denominator) for feature, count in counts.items()
+            }
+            self.log_unseen[intent] = math.log(self.alpha / denominator)
+        self.vocabulary = vocabulary
+
+    def _model_probabilities(self, text: str) -> Dict[str, float]:
+        features = [f for f in _features(text) if f in self.vocabulary]
+        if not features:
+            return {intent: 1 / len(self.intents) for intent in self.intents}
+
+        scores = {}
+        for intent in self.intents:
+            likelihood = self.log_likelihood[intent]
+            unseen = self.log_unseen[intent]
+            score = sum(likelihood.get(f, unseen) for f in features)
+            # Averaging over features keeps overlapping n-grams from making the
+            # posterior overconfident on long messages
+            scores[intent] = self.log_prior[intent] + score / len(features) * MODEL_SCALE
+
+        top = max(scores.values())
+        exp_scores = {intent: math.exp(score - top) for intent, score in scores.items()}
+        total = sum(exp_scores.values())
+        return {intent: value / total for intent, value in exp_scores.items()}
+
+    def predict(self, text: Optional[str]) -> Tuple[str, float]:
+        """
+        Classifies a message.
+
+        Args:
+            text: User message
+
+        Returns:
+            (intent, confidence between 0 and 1)
+        """
+        normalized = normalize_message(text or "")
+        if not normalized:
+            return "ayuda", 0.0
+
+        probabilities = self._model_probabilities(normalized)
+        best = max(probabilities, key=probabilities.get)
+        matched = [
+            intent for intent, patterns in INTENT_RULES.items()
+            if any(pattern.search(normalized) for pattern in patterns)
+        ]
+        if len(matched) == 1:
+            intent = matched[0]
+            if intent == best:
+                return intent, max(RULE_CONFIDENCE, probabilities[intent])
+            # Rule and model disagree: let the caller decide with the lower score
+            return intent, probabilities.get(intent, 0.0)
+
+        # Without a rule, words never seen in training make the model answer a guess
+        words = normalized.split()
+        coverage = sum(f"w:{word}" in self.vocabulary for word in words) / len(words)
+        return best, probabilities[best] * coverage
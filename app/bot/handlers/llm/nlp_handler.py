@@ -1,17 +1,37 @@
 import re
+from typing import Optional, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes, MessageHandler, filters
 from app.bot.handlers.llm.intent_classifier import IntentClassifier
 from app.bot.handlers.llm.intent_resolver import IntentResolver
+from app.bot.handlers.llm.local_classifier import LocalIntentClassifier
+from app.config import settings
+from app.services.gemini_service import GeminiService
 from app.utils.extract_command import extract_command
 
 BOT_USERNAME = "CollabotusBot"
 
 class NLPHandler:
-    def __init__(self, api_key: str, model:str):
-        self.classifier = IntentClassifier(api_key, model)
+    def __init__(self, llm: GeminiService):
+        self.local_classifier = LocalIntentClassifier()
+        self.classifier = IntentClassifier(llm)
         self.resolver = IntentResolver()
 
+    async def classify(self, text: str) -> Tuple[str, Optional[dict]]:
+        """
+        Classifies locally and only asks the LLM when the local confidence is too low.
+        In combined mode that LLM call also returns the parameters for the intent.
+
+        Returns:
+            (intent, parameters or None if they still have to be extracted)
+        """
+        intent, confidence = self.local_classifier.predict(text)
+        if confidence >= settings.INTENT_CONFIDENCE_THRESHOLD:
+            return intent, None
+        if settings.NLP_COMBINED_MODE:
+            return await self.classifier.classify_with_params(text)
+        return await self.classifier.classify(text), None
+
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_message = update.message.text
 
@@ -28,8 +48,8 @@ class NLPHandler:
         if chat_type in ["group", "supergroup"]:
             clean_message = await extract_command(update, command)
             # Classify and resolve intent
-            intent = await self.classifier.classify(clean_message)
-            await self.resolver.resolve(intent, update, context)
+            intent, params = await self.classify(clean_message)
+            await self.resolver.resolve(intent, update, context, params)
             return
 
         # Extract directly if in private chat
@@ -44,7 +64,7 @@ class NLPHandler:
             return
 
         # Classify and solve intent
-        intent = await self.classifier.classify(clean_message)
+        intent, params = await self.classify(clean_message)
         print("INTENT: ", intent)
         await context.bot.deleteMessage(message_id=must_delete.message_id, chat_id=update.message.chat_id)
-        await self.resolver.resolve(intent, update, context)
+        await self.resolver.resolve(intent, update, context, params)
@@ -3,7 +3,8 @@ from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 from telegram.constants import ChatType
 
-from app.models.models import User, SubscriptionType
+from app.models.models import SubscriptionType
+from app.services.user_registry import user_registry
 from app.services.user_service import UserService
 
 
@@ -18,7 +19,7 @@ async def premium_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Verify if user exists in DB
-    if not (user := await User.get_or_none(id=user_id)):
+    if not await user_registry.is_registered(user_id):
         await update.message.reply_text(
             "❗No estás registrado en el sistema. Utiliza el comando /registro para registrarte."
         )
@@ -3,7 +3,7 @@ from telegram.constants import ChatType
 from telegram.ext import ContextTypes, CommandHandler, MessageHandler, filters
 
 from app.models.models import ProjectStatus, ProjectCreate_Pydantic, ProjectUser
-from app.models.models import User
+from app.services.user_registry import user_registry
 from app.services.project_service import ProjectService
 
 # Save the user's progress in a dictionary:
@@ -24,7 +24,7 @@ async def crear_proyecto_command(update: Update, context: ContextTypes.DEFAULT_T
     }
 
     # Verify if user exists in DB
-    if not (user := await User.get_or_none(id=user_id)):
+    if not await user_registry.is_registered(user_id):
         await update.message.send_message(
             chat_id=user_id,
             text="❗No estás registrado en el sistema. Utiliza el comando /registro para registrarte.",
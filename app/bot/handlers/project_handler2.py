@@ -7,10 +7,9 @@ from telegram.ext import (
     filters,
     ConversationHandler
 )
-from tortoise.expressions import Q
 
 from app.models.models import ProjectStatus, ProjectCreate_Pydantic, ProjectUser, SubscriptionType
-from app.models.models import User
+from app.services.user_registry import user_registry
 from app.services.project_service import ProjectService
 from app.services.user_service import UserService
 
@@ -30,7 +29,7 @@ async def crear_proyecto_command(update: Update, context: ContextTypes.DEFAULT_T
     context.user_data['group_id'] = chat.id
 
     # Verify if user exists in DB
-    if not (_user := await User.get_or_none(id=user.id)):
+    if not await user_registry.is_registered(user.id):
         await context.bot.send_message(
             chat_id=user.id,
             text="❗No estás registrado en el sistema. Utiliza el comando /registro para registrarte.",
@@ -208,7 +207,7 @@ async def handle_nlp_project(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
 
     # Verify if user exists in DB
-    if not (user := await User.get_or_none(id=user_id)):
+    if not await user_registry.is_registered(user_id):
         await update.message.reply_text(
             "❗No estás registrado en el sistema. Utiliza el comando /registro por chat privado para registrarte."
         )
@@ -222,9 +221,7 @@ async def handle_nlp_project(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     name = data.get("nombre")
     description = data.get("descripcion")
-    mentioned_users = data.get("miembros", [])
-    missing_users = []
-    valid_member_ids = []
+    mentioned_users = data.get("miembros") or []
 
     print(name, description, mentioned_users)
 
@@ -233,15 +230,7 @@ async def handle_nlp_project(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return"""
 
     # Buscar usuarios en DB
-    for user_identifier in mentioned_users:
-        user = await User.filter(
-            Q(username=user_identifier) | Q(first_name=user_identifier)
-        ).first()
-
-        if not user:
-            missing_users.append(user_identifier)
-        else:
-            valid_member_ids.append(user.id)
+    valid_member_ids, missing_users = await UserService.find_users_by_identifiers(mentioned_users)
 
     # Validar usuarios faltantes
     if missing_users:
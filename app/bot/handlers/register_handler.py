@@ -1,10 +1,16 @@
 import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
 from telegram.constants import ChatType
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes, CallbackQueryHandler
 
-from app.models.models import Skill, SkillType, User
-from app.services.survey_service import save_user_skill, save_user_skill_by_question_key
+from app.config import settings
+from app.models.models import Skill, SkillType
+from app.services.survey_service import save_survey_profile
+from app.services.user_registry import user_registry
+from app.utils.cache import TTLCache
 
 survey = [
     {
@@ -66,8 +72,33 @@ skill_mapping = {
     "devops": SkillType.DEVOPS,
 }
 
-# Dictionary for saving responses
-user_survey_progress = {}
+
+@dataclass
+class SurveySession:
+    user_id: int
+    username: Optional[str]
+    first_name: str
+    mode: str = "register"  # "update" when a registered user updates their skills
+    current: int = 0
+    answers: Dict[str, str] = field(default_factory=dict)
+
+
+# chat_id -> SurveySession. Answers stay here until the last one and are saved together;
+# abandoned surveys expire without touching the DB
+survey_sessions = TTLCache(maxsize=settings.SURVEY_SESSION_SIZE, ttl=settings.SURVEY_SESSION_TTL)
+
+# Callback key of the button that retries saving a finished survey
+RETRY_SAVE_KEY = "survey_retry"
+
+
+def start_survey(update: Update, mode: str = "register") -> None:
+    user = update.effective_user
+    survey_sessions.set(update.effective_chat.id, SurveySession(
+        user_id=user.id,
+        username=user.username.lower() if user.username else None,
+        first_name=user.first_name,
+        mode=mode
+    ))
 
 async def registro_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat = update.effective_chat
@@ -79,23 +110,13 @@ async def registro_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Verify if user exists in DB
-    if user := await User.get_or_none(id=user_id):
+    if await user_registry.is_registered(user_id):
         await update.message.reply_text(
             "❗Ya estás registrado en el sistema.\nUtiliza el comando /actualizar_habilidades para actualizar tu información."
         )
         return
 
-    user_survey_progress[chat_id] = {"current": 0, "answers": {}}
-
-    print("USER ID: ", update.effective_user.id)
-    print("USERNAME: ", update.effective_user.username)
-    print("FIRST NAME: ", update.effective_user.first_name)
-
-    _user, created = await User.get_or_create(
-        id=update.effective_user.id,
-        username=update.effective_user.username.lower(),
-        first_name=update.effective_user.first_name
-    )
+    start_survey(update)
 
     await context.bot.send_message(
         chat_id=chat_id,
@@ -104,20 +125,32 @@ async def registro_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await send_next_question(chat_id, context)
 
 async def send_next_question(chat_id, context):
-    user_data = user_survey_progress.get(chat_id)
-    if user_data is None:
+    session = survey_sessions.get(chat_id)
+    if session is None:
         return
 
-    current_index = user_data["current"]
+    current_index = session.current
     if current_index >= len(survey):
-        # End survey
-        answers = user_data["answers"]
-        summary = "\n".join([f"{k}: {v}" for k, v in answers.items()])
+        # End survey, the whole profile is saved at once. The session is kept until
+        # the save succeeds, so a failed save can be retried without answering again
+        try:
+            await save_survey_profile(session.user_id, session.username, session.first_name, session.answers)
+        except Exception as e:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text=f"❌ Error guardando las respuestas: {e}",
+                reply_markup=InlineKeyboardMarkup(
+                    [[InlineKeyboardButton("Reintentar", callback_data=f"{RETRY_SAVE_KEY}|")]]
+                )
+            )
+            return
+        survey_sessions.pop(chat_id)
+
+        summary = "\n".join([f"{k}: {v}" for k, v in session.answers.items()])
         await context.bot.send_message(
             chat_id=chat_id,
             text=f"✅ ¡Gracias! Aquí están tus respuestas:\n\n{summary}"
         )
-        del user_survey_progress[chat_id]
         return
 
     q = survey[current_index]
@@ -140,21 +173,14 @@ async def handle_survey_response(update: Update, context: ContextTypes.DEFAULT_T
     data = query.data  # Format: "key|answer"
     key, value = data.split("|")
 
-    user_data = user_survey_progress.get(chat_id)
-    if user_data:
-        user_data["answers"][key] = value
-        user_data["current"] += 1
-
-        # Save in db
-        try:
-            skill_type = skill_mapping.get(key)
-            if skill_type:
-                user_id = query.from_user.id
-                await save_user_skill_by_question_key(user_id, key, value, update_existing=True)
-        except Exception as e:
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=f"❌ Error guardando la respuesta: {e}"
-            )
+    session = survey_sessions.get(chat_id)
+    # Only answers to the current question count (a button pressed twice is ignored)
+    if session and session.current < len(survey) and key == survey[session.current]["key"]:
+        session.answers[key] = value
+        session.current += 1
+        # Answering keeps the session alive
+        survey_sessions.set(chat_id, session)
 
+        await send_next_question(chat_id, context)
+    elif session and session.current >= len(survey) and key == RETRY_SAVE_KEY:
         await send_next_question(chat_id, context)
\ No newline at end of file
@@ -0,0 +1,114 @@
+import shlex
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from telegram.constants import ChatType
+
+from app.config import settings
+from app.models.models import SkillType
+from app.services.talent_index import CATEGORICAL_SKILLS, MAX_LEVEL, TalentQuery, talent_index
+from app.services.user_registry import user_registry
+from app.services.user_service import UserService
+
+usage_message = f"""🔎 Uso: /buscartalento filtro... [orden=habilidad] [top=N]
+
+Filtros:
+▫️ habilidad>=nivel (1 a {MAX_LEVEL}), p. ej. database>=4
+▫️ language=valor o framework=valor, p. ej. framework=Django (usa comillas si el valor tiene espacios)
+
+Ejemplo: /buscartalento database>=4 framework=Django orden=testing top=20
+
+Habilidades: {", ".join(skill.value for skill in SkillType)}"""
+
+
+def _skill(name: str) -> SkillType:
+    try:
+        return SkillType(name.lower())
+    except ValueError:
+        raise ValueError(f"La habilidad '{name}' no existe.")
+
+
+def parse_talent_query(text: str) -> TalentQuery:
+    """
+    Parses the arguments of /buscartalento, e.g. `database>=4 framework=Django orden=testing top=20`.
+
+    Raises:
+        ValueError: With a message for the user if an argument isn't valid
+    """
+    query = TalentQuery()
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        raise ValueError("Hay comillas sin cerrar.")
+
+    for token in tokens:
+        if ">=" in token:
+            name, level = token.split(">=", 1)
+            skill = _skill(name)
+            if skill in CATEGORICAL_SKILLS:
+                raise ValueError(f"'{skill.value}' no tiene niveles, usa {skill.value}=valor.")
+            if not level.isdigit() or not 1 <= int(level) <= MAX_LEVEL:
+                raise ValueError(f"El nivel de '{skill.value}' debe ser un número del 1 al {MAX_LEVEL}.")
+            query.min_levels[skill] = int(level)
+        elif "=" in token:
+            name, value = token.split("=", 1)
+            if name.lower() == "orden":
+                query.order_by = _skill(value)
+                if query.order_by in CATEGORICAL_SKILLS:
+                    raise ValueError(f"No se puede ordenar por '{value}', elige una habilidad con niveles.")
+            elif name.lower() == "top":
+                if not value.isdigit() or not 1 <= int(value) <= settings.TALENT_SEARCH_MAX_RESULTS:
+                    raise ValueError(f"top debe ser un número del 1 al {settings.TALENT_SEARCH_MAX_RESULTS}.")
+                query.limit = int(value)
+            else:
+                skill = _skill(name)
+                if skill not in CATEGORICAL_SKILLS:
+                    raise ValueError(f"'{skill.value}' es un nivel, usa {skill.value}>=nivel.")
+                query.equals[skill] = value
+        else:
+            raise ValueError(f"No entiendo '{token}'.")
+
+    return query
+
+
+async def buscartalento_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Manage /buscartalento command"""
+    chat = update.effective_chat
+    user_id = update.effective_user.id
+
+    if chat.type != ChatType.PRIVATE:
+        await update.message.reply_text("❗ Este comando sólo puede usarse desde un chat privado.")
+        return
+
+    # Verify if user exists in DB
+    if not await user_registry.is_registered(user_id):
+        await update.message.reply_text(
+            "❗No estás registrado en el sistema. Utiliza el comando /registro para registrarte."
+        )
+        return
+
+    parts = update.message.text.split(maxsplit=1)
+    if len(parts) < 2:
+        await update.message.reply_text(usage_message)
+        return
+
+    try:
+        query = parse_talent_query(parts[1])
+    except ValueError as e:
+        await update.message.reply_text(f"❗ {e}\n\n{usage_message}")
+        return
+
+    found = talent_index.search(query)
+    if not found:
+        await update.message.reply_text("No hay usuarios que cumplan esos filtros.")
+        return
+
+    names = await UserService.get_display_names(found)
+    shown = [*query.equals, *query.min_levels, *([query.order_by] if query.order_by else [])]
+    lines = []
+    for position, found_id in enumerate(found, start=1):
+        profile = talent_index.profile(found_id)
+        skills = ", ".join(f"{skill.value}: {profile.get(skill.value, '-')}" for skill in dict.fromkeys(shown))
+        lines.append(f"{position}. {names.get(found_id, found_id)}" + (f" ({skills})" if skills else ""))
+
+    await update.message.reply_text(f"🔎 Talento encontrado ({len(found)}):\n\n" + "\n".join(lines))
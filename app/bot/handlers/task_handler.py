@@ -2,14 +2,17 @@ from datetime import datetime
 from telegram import Update, Chat
 from telegram.constants import ChatType
 from telegram.ext import ContextTypes, CommandHandler, MessageHandler, ConversationHandler, filters
+from tortoise.exceptions import IntegrityError
 
-from app.config import Settings
-from app.models.models import TaskStatus, TaskCreate_Pydantic, Task, Project, User
-from app.services.gemini_service import GeminiService
+from app.models.models import TaskStatus, TaskCreate_Pydantic, Task, Project
+from app.scheduler.deadlines import deadline_scheduler
+from app.services.assignment_service import AssignmentService
+from app.services.llm_registry import get_llm
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 from app.services.project_service import ProjectService
 from app.models.models import ProjectStatus
+from app.services.user_registry import user_registry
 from app.services.user_service import UserService
 
 # States
@@ -81,11 +84,10 @@ async def handle_task_deadline(update: Update, context: ContextTypes.DEFAULT_TYP
             deadline=deadline,
             project_id=project.id,
         )
-
-        llm = GeminiService(Settings.GEMINI_KEY, Settings.LLM_MODEL)
+        deadline_scheduler.track(task)
 
         user_to_assign = await UserService.get_user_by_id(
-            await llm.assign_task(project.id, task.name, task.description)
+            await AssignmentService.assign_task(project.id, task.name, task.description, llm=get_llm(context))
         )
 
         await TaskService.assign_user(task.id, user_to_assign.id)
@@ -97,6 +99,8 @@ async def handle_task_deadline(update: Update, context: ContextTypes.DEFAULT_TYP
             f"Deadline: {deadline.strftime('%Y-%m-%d %H:%M')}\n\n"
             f"Asginada a: @{user_to_assign.first_name}"
         )
+    except IntegrityError:
+        await update.message.reply_text("❌ Ya existe una tarea con ese identificador en este proyecto")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
 
@@ -137,7 +141,7 @@ async def agregar_tarea_nlp(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Verify if user exists in DB
-    if not (user := await User.get_or_none(id=user_id)):
+    if not await user_registry.is_registered(user_id):
         await update.message.reply_text(
             "❗No estás registrado en el sistema. Utiliza el comando /registro por chat privado para registrarte."
         )
@@ -158,6 +162,7 @@ async def agregar_tarea_nlp(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if not custom_id or not name or not deadline:
         await update.message.reply_text("❌ No pude crear la tarea. Necesito que me por lo menos me des el identificador, nombre y deadline")
+        return
 
     task_data = {
         "custom_id": data.get("identificador"),
@@ -177,11 +182,10 @@ async def agregar_tarea_nlp(update: Update, context: ContextTypes.DEFAULT_TYPE):
             deadline=task_data["deadline"],
             project_id=project.id,
         )
-
-        llm = GeminiService(Settings.GEMINI_KEY, Settings.LLM_MODEL)
+        deadline_scheduler.track(task)
 
         user_to_assign = await UserService.get_user_by_id(
-            await llm.assign_task(project.id, task.name, task.description)
+            await AssignmentService.assign_task(project.id, task.name, task.description, llm=get_llm(context))
         )
 
         await TaskService.assign_user(task.id, user_to_assign.id)
@@ -193,6 +197,8 @@ async def agregar_tarea_nlp(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"Deadline: {task_data['deadline'].strftime('%Y-%m-%d %H:%M')}\n\n"
             f"Asginada a: @{user_to_assign.first_name}"
         )
+    except IntegrityError:
+        await update.message.reply_text("❌ Ya existe una tarea con ese identificador en este proyecto")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
 
@@ -218,7 +224,6 @@ async def listar_tareas_command(update: Update, context: ContextTypes.DEFAULT_TY
     tasks_string = ''
 
     for task in tasks:
-        print(task.model_dump)
         tasks_string += f'{task.custom_id}: {task.name}\nstatus: {TaskStatus(task.status).name}\n\n'
 
     await update.message.reply_text("Tareas:\n" + tasks_string)
\ No newline at end of file
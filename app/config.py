@@ -15,10 +15,36 @@ class Settings:
     WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
 
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    WRITE_BATCH_SIZE: int = int(os.getenv("WRITE_BATCH_SIZE", "64"))  # Writes committed together at most
+    WRITE_BATCH_DELAY: float = float(os.getenv("WRITE_BATCH_DELAY", "0.002"))  # Seconds a batch waits for more writes
 
     # LLM config
     GEMINI_KEY: str = os.getenv("GEMINI_API_KEY")
     LLM_MODEL: str = os.getenv("LLM_MODEL")
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # In-flight LLM requests
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "30"))  # Seconds per LLM call
+    LLM_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "300"))  # Seconds an idle connection is kept
+
+    INTENT_CACHE_SIZE: int = int(os.getenv("INTENT_CACHE_SIZE", "5000"))
+    INTENT_CACHE_TTL: float = float(os.getenv("INTENT_CACHE_TTL", "86400"))  # Seconds
+    INTENT_CONFIDENCE_THRESHOLD: float = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.8"))  # Below it, ask the LLM
+    NLP_COMBINED_MODE: bool = os.getenv("NLP_COMBINED_MODE", "true").lower() == "true"  # Intent + params in one call
+    ASSIGNMENT_LLM_TIEBREAK: bool = os.getenv("ASSIGNMENT_LLM_TIEBREAK", "false").lower() == "true"
+    ASSIGNMENT_LOAD_WEIGHT: float = float(os.getenv("ASSIGNMENT_LOAD_WEIGHT", "0.15"))  # Cost of one open task
+    OVERDUE_DIGEST_LLM: bool = os.getenv("OVERDUE_DIGEST_LLM", "true").lower() == "true"  # Else template only
+    OVERDUE_NOTIFY_COOLDOWN: float = float(os.getenv("OVERDUE_NOTIFY_COOLDOWN", "3600"))  # Seconds between notifications of a task
+    OVERDUE_ESCALATION_HOURS: str = os.getenv("OVERDUE_ESCALATION_HOURS", "0,24,72,168")  # Hours overdue that raise the level
+    OVERDUE_RECONCILE_INTERVAL: float = float(os.getenv("OVERDUE_RECONCILE_INTERVAL", "21600"))  # Seconds between full scans
+    PROJECT_CACHE_SIZE: int = int(os.getenv("PROJECT_CACHE_SIZE", "10000"))  # Chats whose project is cached
+    PROJECT_CACHE_TTL: float = float(os.getenv("PROJECT_CACHE_TTL", "600"))  # Seconds
+    PROJECT_CACHE_NEGATIVE_TTL: float = float(os.getenv("PROJECT_CACHE_NEGATIVE_TTL", "60"))  # Seconds for "no project"
+    USER_REGISTRY_SIZE: int = int(os.getenv("USER_REGISTRY_SIZE", "500000"))  # Registered users kept in memory
+    SURVEY_SESSION_SIZE: int = int(os.getenv("SURVEY_SESSION_SIZE", "10000"))  # Surveys in progress kept in memory
+    SURVEY_SESSION_TTL: float = float(os.getenv("SURVEY_SESSION_TTL", "3600"))  # Seconds an idle survey is kept
+    SKILL_MATRIX_CACHE_SIZE: int = int(os.getenv("SKILL_MATRIX_CACHE_SIZE", "5000"))  # Projects whose skill matrix is kept
+    SKILL_MATRIX_TTL: float = float(os.getenv("SKILL_MATRIX_TTL", "3600"))  # Seconds an unused matrix is kept
+    TALENT_SEARCH_MAX_RESULTS: int = int(os.getenv("TALENT_SEARCH_MAX_RESULTS", "50"))  # Largest top=N of /buscartalento
+    PROMPT_RELOAD_INTERVAL: float = float(os.getenv("PROMPT_RELOAD_INTERVAL", "5"))  # Seconds between mtime checks
 
     # Additional config
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -4,7 +4,12 @@ from telegram import Update
 
 from app.config import settings
 from app.models.db import init_db, close_db
+from app.models.write_queue import write_queue
 from app.bot.core import BotManager
+from app.services.project_service import project_cache
+from app.services.skill_service import skill_catalogue
+from app.services.talent_index import talent_index
+from app.services.user_registry import user_registry
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -38,6 +43,10 @@ async def telegram_webhook(request: Request):
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    await user_registry.load()
+    await skill_catalogue.load()
+    await talent_index.load()
+    write_queue.start()
 
     if settings.TELEGRAM_TOKEN and settings.WEBHOOK_URL and settings.WEBHOOK_SECRET:
         await bot_manager.initialize()
@@ -48,7 +57,9 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await bot_manager.shutdown()
+    await write_queue.stop()
     await close_db()
+    logger.info(f"Project cache: {project_cache.stats()}")
 
 
 if __name__ == "__main__":
@@ -1,33 +1,109 @@
+import copy
+import itertools
+from typing import Any, Dict, Optional
+
 from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
+from tortoise.backends.sqlite.client import SqliteTransactionWrapper
+from tortoise.connection import connections
+
 from app.config import settings
 
-TORTOISE_ORM = {
-    "connections": {
-        "default": {
-            "engine": "tortoise.backends.sqlite",
-            "credentials": {
-                "file_path": "db.sqlite3"  # Archivo SQLite
-            }
-        }
-    },
-    "apps": {
-        "models": {
-            "models": ["app.models.models", "aerich.models"],
-            "default_connection": "default",
-        },
-    },
+DEFAULT_DB_URL = "sqlite://db.sqlite3"  # Archivo SQLite
+WRITE_CONNECTION = "default"
+READ_CONNECTION_PREFIX = "read_"
+
+# Pragmas applied on connect by the "tuned" SQLite profile
+TUNED_SQLITE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # Durable across app crashes; fsync only at checkpoints
+    "mmap_size": 268435456,  # 256 MiB
+    "cache_size": -65536,  # 64 MiB (negative = KiB)
+    "busy_timeout": 5000,  # ms a connection waits on a lock before failing
+    "temp_store": "MEMORY",
 }
+DB_PROFILES = ("default", "tuned")
+
+
+class ReadWriteRouter:
+    """
+    Sends reads to the read-only connections (round robin) and writes to the single
+    write connection. Reads inside a transaction stay on the transaction so they see
+    its uncommitted writes.
+    """
+
+    def __init__(self):
+        readers = sorted(name for name in connections.db_config if name.startswith(READ_CONNECTION_PREFIX))
+        self._readers = itertools.cycle(readers or [None])
+
+    def db_for_read(self, model) -> Optional[str]:
+        if isinstance(connections.get(WRITE_CONNECTION), SqliteTransactionWrapper):
+            return None
+        return next(self._readers)
+
+    def db_for_write(self, model) -> Optional[str]:
+        return WRITE_CONNECTION
+
+
+def build_tortoise_config(db_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Builds the Tortoise config from a database URL. The engine profile is chosen with
+    the `profile` query parameter, e.g. sqlite://db.sqlite3?profile=tuned&read_connections=2
+
+    Profiles:
+        default: one connection with Tortoise's defaults
+        tuned: (SQLite only) TUNED_SQLITE_PRAGMAS, one write connection and
+            `read_connections` read-only connections (default 2)
+
+    Raises:
+        ValueError: If the profile is unknown or doesn't support the engine
+    """
+    connection = expand_db_url(db_url or settings.DATABASE_URL or DEFAULT_DB_URL)
+    credentials = connection["credentials"]
+    profile = credentials.pop("profile", "default")
+    read_connections = int(credentials.pop("read_connections", 2))
+    if profile not in DB_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}', expected one of {DB_PROFILES}")
+
+    connections_config = {WRITE_CONNECTION: connection}
+    config = {
+        "connections": connections_config,
+        "apps": {
+            "models": {
+                "models": ["app.models.models", "aerich.models"],
+                "default_connection": WRITE_CONNECTION,
+            },
+        },
+    }
+    if profile == "default":
+        return config
+
+    if connection["engine"] != "tortoise.backends.sqlite":
+        raise ValueError(f"The '{profile}' profile only supports SQLite")
+    for pragma, value in TUNED_SQLITE_PRAGMAS.items():
+        credentials.setdefault(pragma, value)
+
+    # Every connection to :memory: is a different database, so it can't be shared
+    if credentials["file_path"] != ":memory:":
+        for i in range(read_connections):
+            reader = copy.deepcopy(connection)
+            reader["credentials"]["query_only"] = "ON"
+            connections_config[f"{READ_CONNECTION_PREFIX}{i}"] = reader
+        config["routers"] = ["app.models.db.ReadWriteRouter"]
+    return config
+
+
+TORTOISE_ORM = build_tortoise_config()
+
 
 async def init_db():
     """
-    Initialize connection to DB
+    Initialize connection to DB. The schema is created and migrated by `aerich upgrade`.
     """
     await Tortoise.init(config=TORTOISE_ORM)
-    # Generate the schema
-    await Tortoise.generate_schemas()
 
 async def close_db():
     """
     Close connection to DB
     """
-    await Tortoise.close_connections()
\ No newline at end of file
+    await Tortoise.close_connections()
@@ -40,7 +40,7 @@ class ProjectRole(str, Enum):
 # Models -----------------------------------------------------------------------
 class User(models.Model):
     id = fields.BigIntField(pk=True)
-    username = fields.CharField(max_length=100, null=True)
+    username = fields.CharField(max_length=100, null=True, db_index=True)
     first_name = fields.CharField(max_length=100)
     subscription_type = fields.CharEnumField(SubscriptionType, default=SubscriptionType.FREE)
     created_at = fields.DatetimeField(auto_now_add=True)
@@ -66,7 +66,7 @@ class Project(models.Model):
     name = fields.CharField(max_length=100)
     description = fields.TextField()
     status = fields.CharEnumField(ProjectStatus, default=ProjectStatus.ACTIVE)
-    telegram_chat_id = fields.CharField(max_length=50)
+    telegram_chat_id = fields.CharField(max_length=50, db_index=True)
     created_at = fields.DatetimeField(auto_now_add=True)
 
     class Meta:
@@ -81,6 +81,7 @@ class ProjectUser(models.Model):
     class Meta:
         table = "project_user"
         #unique_together = (("project", "role"),)  # A single admin per project
+        unique_together = (("project", "user"),)
 
 
 class Task(models.Model):
@@ -89,15 +90,35 @@ class Task(models.Model):
     name = fields.CharField(max_length=100)
     description = fields.TextField(null=True)
     status = fields.CharEnumField(TaskStatus, default=TaskStatus.ASSIGNED)
-    deadline = fields.DatetimeField()
+    deadline = fields.DatetimeField(db_index=True)  # Overdue scans across projects
     created_at = fields.DatetimeField(auto_now_add=True)
-    updated_at = fields.DatetimeField(auto_now=True)
+    updated_at = fields.DatetimeField(auto_now=True, db_index=True)  # Watermark scan
 
     project = fields.ForeignKeyField("models.Project", related_name="tasks")
     assigned_user = fields.ForeignKeyField("models.User", null=True, related_name="tasks")
 
     class Meta:
         table = "task"
+        unique_together = (("project", "custom_id"),)
+        indexes = (("project", "status", "deadline"),)
+
+
+class TaskNotification(models.Model):
+    task = fields.OneToOneField("models.Task", related_name="notification", on_delete=fields.CASCADE)
+    last_notified_at = fields.DatetimeField()
+    escalation_level = fields.IntField(default=0)
+    content_hash = fields.CharField(max_length=64)  # Hash of the fields shown in the notification
+
+    class Meta:
+        table = "task_notification"
+
+
+class SchedulerState(models.Model):
+    name = fields.CharField(max_length=50, pk=True)
+    watermark = fields.DatetimeField()  # Everything up to here was already processed
+
+    class Meta:
+        table = "scheduler_state"
 
 
 class UserSkill(models.Model):
@@ -107,6 +128,7 @@ class UserSkill(models.Model):
 
     class Meta:
         table = "user_skill"
+        unique_together = (("user", "skill"),)  # One answer per skill, upserted by the survey
 
 
 
@@ -0,0 +1,49 @@
+"""
+Read-only projections for list queries.
+
+Listing through the ORM builds a model instance per row and then a Pydantic model per
+row. The rows here are filled straight from `values_list()` with only the columns they
+declare, so a list costs one query and one small object per row. Convert to the
+Pydantic models only at the API boundary, with `Task_Pydantic.model_validate(row)`.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import List, Optional, Type, TypeVar
+
+from tortoise.queryset import QuerySet
+
+from app.models.models import ProjectStatus, TaskStatus
+
+RowT = TypeVar("RowT")
+
+
+@dataclass(slots=True, frozen=True)
+class ProjectRow:
+    id: int
+    name: str
+    description: str
+    status: ProjectStatus
+    telegram_chat_id: str
+    created_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class TaskRow:
+    id: int
+    custom_id: Optional[str]
+    name: str
+    description: Optional[str]
+    status: TaskStatus
+    deadline: datetime
+    created_at: datetime
+    updated_at: datetime
+    project_id: int
+    assigned_user_id: Optional[int]
+
+
+async def fetch_rows(queryset: QuerySet, row_type: Type[RowT]) -> List[RowT]:
+    """
+    Runs `queryset` selecting only the fields of `row_type`.
+    """
+    names = [field.name for field in fields(row_type)]
+    return [row_type(*values) for values in await queryset.values_list(*names)]
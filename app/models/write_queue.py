@@ -0,0 +1,258 @@
+import asyncio
+import inspect
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from tortoise.backends.base.client import TransactionalDBClient
+from tortoise.connection import connections
+from tortoise.transactions import in_transaction
+
+from app.config import settings
+from app.models.db import WRITE_CONNECTION
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Callbacks the running write registered with `after_commit`, None outside of one
+_commit_hooks: ContextVar[Optional[List[Callable[[], Any]]]] = ContextVar("commit_hooks", default=None)
+
+# Async callbacks started outside of a write, referenced until they finish
+_background: Set[asyncio.Future] = set()
+
+
+def after_commit(callback: Callable[[], Any]) -> None:
+    """
+    Runs `callback` (sync or async) once the running write has committed, and never if
+    it's rolled back. Use it for in-memory state (caches, registries, indexes) that must
+    only reflect saved data. Outside of a write wrapped by `group_commit` or
+    `with_commit_hooks` it runs right away; an async callback is then scheduled on the
+    running loop instead of awaited.
+    """
+    hooks = _commit_hooks.get()
+    if hooks is None:
+        pending = _run_hook(callback)
+        if pending is not None:
+            future = asyncio.ensure_future(pending)
+            _background.add(future)
+            future.add_done_callback(_background_done)
+    else:
+        hooks.append(callback)
+
+
+def _background_done(future: asyncio.Future) -> None:
+    _background.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("After-commit callback failed", exc_info=future.exception())
+
+
+def _run_hook(callback: Callable[[], Any]) -> Optional[Awaitable[Any]]:
+    try:
+        result = callback()
+    except Exception:
+        logger.exception("After-commit callback failed")
+        return None
+    return result if inspect.isawaitable(result) else None
+
+
+async def _run_hooks(hooks: List[Callable[[], Any]]) -> None:
+    # The data is already committed, a failing callback only gets logged
+    for callback in hooks:
+        pending = _run_hook(callback)
+        if pending is not None:
+            try:
+                await pending
+            except Exception:
+                logger.exception("After-commit callback failed")
+
+
+def with_commit_hooks(func: F) -> F:
+    """
+    Wraps a transactional write (goes above @atomic) so the callbacks it registers with
+    `after_commit` run after its transaction commits. Nested inside another such write,
+    they wait for the outer one.
+    """
+
+    @wraps(func)
+    async def wrapped(*args, **kwargs):
+        if _commit_hooks.get() is not None:
+            return await func(*args, **kwargs)
+
+        hooks: List[Callable[[], Any]] = []
+        token = _commit_hooks.set(hooks)
+        try:
+            result = await func(*args, **kwargs)
+        finally:
+            _commit_hooks.reset(token)
+        await _run_hooks(hooks)
+        return result
+
+    return wrapped  # type: ignore[return-value]
+
+
+@dataclass
+class _Write:
+    func: Callable[..., Awaitable[Any]]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class WriteQueue:
+    """
+    Group commit for small writes. Callers enqueue a write and await its result; a single
+    writer task runs the queued writes in one transaction and commits them together, so a
+    burst of writes pays for one commit instead of one each.
+
+    Every write runs in its own savepoint: a failing write is rolled back and its caller
+    gets the exception, the rest of the batch is committed. If the commit itself fails
+    every caller in the batch gets the error.
+
+    Callbacks a write registers with `after_commit` run once the batch is committed,
+    before its caller is resumed; those of failed writes or batches are dropped.
+
+    When the writer isn't running (scripts, tests) or the caller is already inside a
+    transaction, the write runs right away in its own (nested) transaction.
+    """
+
+    def __init__(
+            self,
+            connection_name: str = WRITE_CONNECTION,
+            max_batch: Optional[int] = None,
+            max_delay: Optional[float] = None
+    ):
+        self.connection_name = connection_name
+        self.max_batch = max_batch or settings.WRITE_BATCH_SIZE
+        self.max_delay = max_delay if max_delay is not None else settings.WRITE_BATCH_DELAY
+        self._queue: Optional[asyncio.Queue] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None and asyncio.get_running_loop() is self._loop
+
+    async def submit(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Runs `func(*args, **kwargs)` in the next batch and returns its result.
+
+        Raises:
+            Whatever `func` raises, or the commit error
+        """
+        # Writes issued from a queued write (or any open transaction) can't wait for the
+        # writer: it's the one holding the transaction
+        if not self.running or self._in_transaction():
+            return await with_commit_hooks(self._run_inline)(func, *args, **kwargs)
+
+        future = self._loop.create_future()
+        self._queue.put_nowait(_Write(func, args, kwargs, future))
+        return await future
+
+    async def _run_inline(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        async with in_transaction(self.connection_name):
+            return await func(*args, **kwargs)
+
+    def _in_transaction(self) -> bool:
+        return isinstance(connections.get(self.connection_name), TransactionalDBClient)
+
+    async def _next_batch(self) -> List[Optional[_Write]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_delay
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _commit(self, batch: List[_Write]) -> None:
+        results = []
+        hooks: List[Callable[[], Any]] = []
+        try:
+            async with in_transaction(self.connection_name):
+                for write in batch:
+                    # The caller gave up waiting, don't run it
+                    if write.future.done():
+                        continue
+                    write_hooks: List[Callable[[], Any]] = []
+                    token = _commit_hooks.set(write_hooks)
+                    try:
+                        async with in_transaction(self.connection_name):
+                            results.append((write, await write.func(*write.args, **write.kwargs), None))
+                        hooks += write_hooks
+                    except Exception as e:
+                        results.append((write, None, e))
+                    finally:
+                        _commit_hooks.reset(token)
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(e)
+            return
+
+        await _run_hooks(hooks)
+        for write, result, error in results:
+            if write.future.done():
+                continue
+            if error is not None:
+                write.future.set_exception(error)
+            else:
+                write.future.set_result(result)
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            stop = batch[-1] is None
+            writes = [write for write in batch if write is not None]
+            if writes:
+                await self._commit(writes)
+            if stop:
+                return
+
+    def start(self) -> None:
+        """
+        Starts the writer task on the running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Commits the pending writes and stops the writer task.
+        """
+        if self._runner is None:
+            return
+        self._queue.put_nowait(None)
+        try:
+            await self._runner
+        finally:
+            self._runner = None
+            self._queue = None
+            self._loop = None
+
+
+# Process-wide queue for the write connection
+write_queue = WriteQueue()
+
+
+def group_commit(func: F) -> F:
+    """
+    Routes every call of a write function through `write_queue`.
+    """
+
+    @wraps(func)
+    async def wrapped(*args, **kwargs):
+        return await write_queue.submit(func, *args, **kwargs)
+
+    return wrapped  # type: ignore[return-value]
@@ -0,0 +1,147 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.models.models import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+DueCallback = Callable[[List[int]], Awaitable[None]]
+
+
+def _timestamp(deadline: datetime) -> float:
+    # Naive datetimes come from the database in UTC
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return deadline.timestamp()
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (deadline, task ID) that calls `on_due` with the IDs of the tasks whose
+    deadline just passed, as soon as it passes.
+
+    Rescheduling or cancelling a task doesn't touch the heap: the current deadline of each
+    task is kept aside and entries that don't match it are dropped when they reach the top.
+    The callback is expected to re-read the tasks, so a stale entry costs a query at most.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.on_due: Optional[DueCallback] = None
+        self._heap: List[Tuple[float, int]] = []
+        self._deadlines: Dict[int, float] = {}  # task ID -> current deadline
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, task_id: int, deadline: datetime) -> None:
+        """
+        Adds a task or moves its deadline.
+        """
+        when = _timestamp(deadline)
+        if self._deadlines.get(task_id) == when:
+            return
+        self._deadlines[task_id] = when
+        heapq.heappush(self._heap, (when, task_id))
+        # Only an earlier head changes how long the runner has to sleep
+        if self._wakeup is not None and self._heap[0] == (when, task_id):
+            self._wakeup.set()
+
+    def cancel(self, task_id: int) -> None:
+        """
+        Forgets a task (done or deleted).
+        """
+        self._deadlines.pop(task_id, None)
+
+    def track(self, task: Task) -> None:
+        """
+        Schedules a task, or cancels it if it's done.
+        """
+        if task.status == TaskStatus.DONE:
+            self.cancel(task.id)
+        else:
+            self.schedule(task.id, task.deadline)
+
+    def pop_due(self, now: Optional[float] = None) -> List[int]:
+        """
+        Removes and returns the tasks whose deadline is at or before `now`.
+        """
+        now = self.clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, task_id = heapq.heappop(self._heap)
+            if self._deadlines.get(task_id) == when:
+                del self._deadlines[task_id]
+                due.append(task_id)
+        return due
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        Timestamp of the earliest pending deadline.
+        """
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def load(self) -> int:
+        """
+        Rebuilds the heap from the non completed tasks whose deadline hasn't passed yet.
+        Overdue ones are left to the reconciliation scan.
+
+        Returns:
+            Number of scheduled tasks
+        """
+        now = datetime.fromtimestamp(self.clock(), tz=timezone.utc)
+        rows = await Task.filter(deadline__gte=now).exclude(status=TaskStatus.DONE).values_list("id", "deadline")
+        self._deadlines = {task_id: _timestamp(deadline) for task_id, deadline in rows}
+        self._heap = [(when, task_id) for task_id, when in self._deadlines.items()]
+        heapq.heapify(self._heap)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return len(self._deadlines)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            head = self.next_deadline()
+            timeout = None if head is None else max(head - self.clock(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                continue  # Something earlier was scheduled
+            except asyncio.TimeoutError:
+                pass
+
+            due = self.pop_due()
+            if due and self.on_due is not None:
+                try:
+                    await self.on_due(due)
+                except Exception as e:
+                    logger.error(f"Deadline handling failed for tasks {due}: {e}")
+
+    def start(self, on_due: DueCallback) -> None:
+        """
+        Starts firing `on_due` from the running event loop.
+        """
+        self.on_due = on_due
+        self._wakeup = asyncio.Event()
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        self._runner = None
+        self._wakeup = None
+
+
+# Process-wide scheduler
+deadline_scheduler = DeadlineScheduler()
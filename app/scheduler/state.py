@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+
+from app.models.models import SchedulerState
+
+# Watermark of the overdue tasks scan
+OVERDUE_SCAN = "overdue_scan"
+
+
+async def get_watermark(name: str) -> Optional[datetime]:
+    """
+    Gets how far a job has processed, or None if it never ran.
+    """
+    state = await SchedulerState.get_or_none(name=name)
+    return state.watermark if state else None
+
+
+async def set_watermark(name: str, watermark: datetime) -> None:
+    """
+    Saves how far a job has processed, so a restart resumes from there.
+    """
+    await SchedulerState.update_or_create(name=name, defaults={"watermark": watermark})
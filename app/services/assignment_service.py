@@ -0,0 +1,617 @@
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from tortoise.functions import Count
+
+from app.config import settings
+from app.models.models import SkillType, Task, TaskStatus
+from app.services.skill_service import SkillService, skill_value
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Column order of the skill vectors
+SKILL_COLUMNS: Tuple[SkillType, ...] = tuple(SkillType)
+SKILL_INDEX: Dict[SkillType, int] = {skill: i for i, skill in enumerate(SKILL_COLUMNS)}
+LANGUAGE_COL = SKILL_INDEX[SkillType.LANGUAGE]
+FRAMEWORK_COL = SKILL_INDEX[SkillType.FRAMEWORK]
+
+# Survey answers are 1 (basic) to 5 (expert)
+MAX_LEVEL = 5.0
+
+# Words in a task's title/description that call for a numeric skill
+SKILL_LEXICON: Dict[SkillType, Tuple[str, ...]] = {
+    SkillType.DATABASE: (
+        "base de datos", "bases de datos", "bd", "sql", "nosql", "mysql", "postgres", "postgresql",
+        "sqlite", "mongo", "mongodb", "redis", "query", "consulta", "esquema", "migracion", "tabla",
+    ),
+    SkillType.PROTOTYPING: (
+        "figma", "uizard", "prototipo", "prototipado", "mockup", "wireframe", "maquet", "maqueta",
+        "maquetar", "ui", "ux", "pantalla", "pantallas", "interfaz", "diseno", "disenar",
+    ),
+    SkillType.AGILE: (
+        "scrum", "sprint", "kanban", "agil", "retrospectiva", "daily", "planning", "backlog", "jira",
+    ),
+    SkillType.REQUIREMENTS: (
+        "requerimiento", "requerimientos", "requisito", "requisitos", "historia de usuario",
+        "historias de usuario", "entrevista", "levantamiento", "caso de uso", "casos de uso", "alcance",
+    ),
+    SkillType.DOCUMENTATION: (
+        "documentar", "documentacion", "documento", "manual", "readme", "wiki", "reporte", "informe",
+    ),
+    SkillType.TESTING: (
+        "test", "tests", "testing", "prueba", "pruebas", "qa", "selenium", "unitaria", "unitarias",
+        "unit", "integracion", "cypress", "pytest", "junit", "bug", "bugs",
+    ),
+    SkillType.DEVOPS: (
+        "docker", "kubernetes", "k8s", "deploy", "desplegar", "despliegue", "ci", "cd", "ci/cd",
+        "pipeline", "nube", "cloud", "aws", "azure", "gcp", "servidor", "infraestructura", "github actions",
+    ),
+}
+
+# Keyword -> (language answer, framework answer), using the survey's option texts
+STACK_LEXICON: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    "python": ("Python", None),
+    "django": ("Python", "Django"),
+    "java": ("Java", None),
+    "spring": ("Java", "SpringBoot"),
+    "springboot": ("Java", "SpringBoot"),
+    "javascript": ("JavaScript", None),
+    "js": ("JavaScript", None),
+    "typescript": ("JavaScript", None),
+    "react": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "angular": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "vue": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "node": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "nodejs": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "express": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "frontend": ("JavaScript", "React, Angular, Node.js, Express, Vue, etc."),
+    "php": ("PHP", None),
+    "laravel": ("PHP", "Laravel"),
+    "c#": ("C#", None),
+    "csharp": ("C#", None),
+    "net": ("C#", ".NET"),
+    "dotnet": ("C#", ".NET"),
+    "c++": ("C/C++", None),
+    "cpp": ("C/C++", None),
+}
+
+# Relative weight of a matching language/framework against one numeric skill at full level
+STACK_WEIGHT = 1.0
+
+
+@dataclass
+class SkillMatrix:
+    """
+    Skills of a set of members encoded column-wise: one row per member, one column per
+    SkillType. Numeric skills are scaled to [0, 1]; language and framework answers are
+    kept in parallel string arrays and matched per task.
+    """
+    user_ids: np.ndarray      # (n,) int64
+    levels: np.ndarray        # (n, len(SKILL_COLUMNS)) float32
+    languages: np.ndarray     # (n,) str
+    frameworks: np.ndarray    # (n,) str
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+
+@dataclass
+class TaskRequirements:
+    """
+    Skill weights a task calls for, plus the language/framework it mentions (if any).
+    """
+    weights: np.ndarray       # (len(SKILL_COLUMNS),) float32
+    language: Optional[str] = None
+    framework: Optional[str] = None
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _level(value: Any) -> float:
+    try:
+        return min(max(float(value), 0.0), MAX_LEVEL) / MAX_LEVEL
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def encode_member(skills: Dict[str, Any]) -> Tuple[np.ndarray, str, str]:
+    """
+    Encodes one member's {skill name: value} as a row of levels plus their language
+    and framework answers.
+    """
+    levels = np.zeros(len(SKILL_COLUMNS), dtype=np.float32)
+    for skill, col in SKILL_INDEX.items():
+        if col not in (LANGUAGE_COL, FRAMEWORK_COL):
+            levels[col] = _level(skills.get(skill.value))
+    return (
+        levels,
+        str(skills.get(SkillType.LANGUAGE.value) or ""),
+        str(skills.get(SkillType.FRAMEWORK.value) or ""),
+    )
+
+
+def encode_members(skills_by_user: Dict[int, Dict[str, Any]]) -> SkillMatrix:
+    """
+    Encodes the output of SkillService.get_user_skills_by_project. Members are ordered
+    by user ID so ties always resolve the same way.
+
+    Args:
+        skills_by_user: user ID -> {skill name: value}
+
+    Returns:
+        Encoded skill matrix
+    """
+    user_ids = sorted(skills_by_user)
+    levels = np.zeros((len(user_ids), len(SKILL_COLUMNS)), dtype=np.float32)
+    languages = []
+    frameworks = []
+    for row, user_id in enumerate(user_ids):
+        levels[row], language, framework = encode_member(skills_by_user[user_id])
+        languages.append(language)
+        frameworks.append(framework)
+
+    return SkillMatrix(
+        user_ids=np.asarray(user_ids, dtype=np.int64),
+        levels=levels,
+        languages=np.asarray(languages, dtype=str),
+        frameworks=np.asarray(frameworks, dtype=str),
+    )
+
+
+def _contains(text: str, keyword: str) -> bool:
+    return re.search(rf"(?<![\w#+]){re.escape(keyword)}(?![\w#+])", text) is not None
+
+
+def task_requirements(title: str, description: Optional[str] = None) -> TaskRequirements:
+    """
+    Maps a task's text to the skills it needs using the keyword lexicons.
+    A task that matches no keyword weighs every numeric skill equally.
+
+    Args:
+        title: Task name
+        description: Task description
+
+    Returns:
+        Required-skill weights
+    """
+    text = _normalize(f"{title or ''} {description or ''}")
+    weights = np.zeros(len(SKILL_COLUMNS), dtype=np.float32)
+
+    for skill, keywords in SKILL_LEXICON.items():
+        weights[SKILL_INDEX[skill]] = sum(1 for keyword in keywords if _contains(text, keyword))
+
+    language = framework = None
+    for keyword, (lang, fw) in STACK_LEXICON.items():
+        if _contains(text, keyword):
+            language = language or lang
+            framework = framework or fw
+    if language:
+        weights[LANGUAGE_COL] = STACK_WEIGHT
+    if framework:
+        weights[FRAMEWORK_COL] = STACK_WEIGHT
+
+    if not weights.any():
+        weights[:] = 1.0
+        weights[LANGUAGE_COL] = weights[FRAMEWORK_COL] = 0.0
+
+    return TaskRequirements(weights=weights / weights.sum(), language=language, framework=framework)
+
+
+def score_members(matrix: SkillMatrix, requirements: TaskRequirements) -> np.ndarray:
+    """
+    Scores every member against a task in one vectorized pass.
+
+    Returns:
+        (n,) array of fit scores in [0, 1]
+    """
+    levels = matrix.levels
+    if requirements.language or requirements.framework:
+        levels = levels.copy()
+        if requirements.language:
+            levels[:, LANGUAGE_COL] = matrix.languages == requirements.language
+        if requirements.framework:
+            levels[:, FRAMEWORK_COL] = matrix.frameworks == requirements.framework
+    return levels @ requirements.weights
+
+
+def min_cost_plan(cost: np.ndarray, open_tasks: np.ndarray, load_weight: float) -> np.ndarray:
+    """
+    Gives every task to one member minimizing sum(cost[task, member]) plus a load
+    penalty: the k-th new task of a member costs load_weight * (open tasks + k).
+
+    Solved exactly as a min-cost flow (tasks -> members -> sink, with convex member->sink
+    costs) by successive shortest paths: each task is routed through a Dijkstra search
+    over the members, reassigning earlier tasks when that is cheaper.
+
+    Args:
+        cost: (tasks, members) assignment costs
+        open_tasks: (members,) current open tasks
+        load_weight: cost of one extra open task
+
+    Returns:
+        (tasks,) array with the member chosen for each task
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n_tasks, n_members = cost.shape
+    columns = np.arange(n_members)
+
+    # Duals keep the reduced costs non-negative and zero on assigned pairs
+    u = np.zeros(n_tasks)
+    v = np.zeros(n_members)
+    marginal = load_weight * np.asarray(open_tasks, dtype=np.float64)
+    member_of = np.full(n_tasks, -1, dtype=np.int64)
+    tasks_of: List[List[int]] = [[] for _ in range(n_members)]
+
+    for root in range(n_tasks):
+        dist = cost[root] - u[root] - v
+        pred = np.full(n_members, root, dtype=np.int64)
+        unvisited = np.ones(n_members, dtype=bool)
+        scanned, scanned_dist = [root], [0.0]
+        visited, visited_dist = [], []
+        sink, sink_dist = -1, np.inf
+
+        while True:
+            j = int(np.argmin(np.where(unvisited, dist, np.inf)))
+            dj = dist[j]
+            if not unvisited[j] or dj >= sink_dist:
+                break
+            unvisited[j] = False
+            visited.append(j)
+            visited_dist.append(dj)
+            if dj + marginal[j] + v[j] < sink_dist:
+                sink, sink_dist = j, dj + marginal[j] + v[j]
+
+            # Continue through the tasks j already holds (tight edges)
+            rows = tasks_of[j]
+            if rows:
+                block = cost[rows] - u[rows][:, None]
+                best = np.argmin(block, axis=0)
+                reduced = block[best, columns] + dj - v
+                better = unvisited & (reduced < dist)
+                dist[better] = reduced[better]
+                pred[better] = np.asarray(rows)[best[better]]
+                scanned.extend(rows)
+                scanned_dist.extend([dj] * len(rows))
+
+        u[scanned] += sink_dist - np.asarray(scanned_dist)
+        v[visited] -= sink_dist - np.asarray(visited_dist)
+
+        # Shift the tasks along the path, ending at the sink member
+        j = sink
+        while True:
+            i = pred[j]
+            previous = member_of[i]
+            member_of[i] = j
+            tasks_of[j].append(i)
+            if previous >= 0:
+                tasks_of[previous].remove(i)
+            if i == root:
+                break
+            j = previous
+        marginal[sink] += load_weight
+
+    return member_of
+
+
+def plan_batch(
+        matrix: SkillMatrix,
+        requirements: Sequence[TaskRequirements],
+        open_tasks: np.ndarray,
+        load_weight: float
+) -> np.ndarray:
+    """
+    Assigns several tasks at once, minimizing total cost = -skill fit + load penalty,
+    so piling work on the strongest member has to pay for itself in skill fit.
+
+    Args:
+        matrix: Encoded members
+        requirements: Required skills of each task
+        open_tasks: (n,) number of open tasks each member already has
+        load_weight: Cost of one extra open task relative to a full skill-fit point
+
+    Returns:
+        (len(requirements),) array with the member row chosen for each task
+    """
+    if not requirements or not len(matrix):
+        return np.empty(0, dtype=np.int64)
+
+    fit = np.stack([score_members(matrix, r) for r in requirements])  # (tasks, members)
+    return min_cost_plan(-fit, open_tasks, load_weight)
+
+
+@dataclass
+class _CachedProject:
+    """
+    A project's skill matrix plus the raw answers of its members, for the LLM tie-break.
+    """
+    matrix: SkillMatrix
+    skills: Dict[int, Dict[str, Any]]
+
+
+def _answers(skills: Dict[str, Any]) -> Dict[str, Any]:
+    # Survey writes pass the stored text, builds read levels as int
+    return {name: skill_value(str(value)) for name, value in skills.items()}
+
+
+class ProjectSkillMatrices:
+    """
+    Materialized skill matrix of each project, so assignment reads members and skills
+    without a query.
+
+    A project's matrix is built on first use and then kept up to date by the membership
+    and survey writes (`add_member`, `remove_member`, `update_skills`). Matrices are
+    replaced, never modified in place, so a caller holding one keeps a consistent view.
+    Projects not used for `SKILL_MATRIX_TTL` seconds are dropped and rebuilt on demand.
+    Members' answers live in the cached entry, so nothing outlives an evicted project.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._matrices = TTLCache(
+            maxsize=maxsize or settings.SKILL_MATRIX_CACHE_SIZE,
+            ttl=ttl or settings.SKILL_MATRIX_TTL,
+            on_evict=self._forget
+        )
+        # user ID -> cached projects they belong to
+        self._projects_by_user: Dict[int, Set[int]] = {}
+        # Bumped on every change so a build that raced with one isn't cached
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._matrices)
+
+    def clear(self) -> None:
+        self._matrices.clear()
+        self._projects_by_user.clear()
+        self._version += 1
+
+    def _store(self, project_id: int, entry: _CachedProject) -> None:
+        self._matrices.set(project_id, entry)
+        for user_id in entry.skills:
+            self._projects_by_user.setdefault(user_id, set()).add(project_id)
+
+    def _forget(self, project_id: int, entry: Optional[_CachedProject]) -> None:
+        if entry is not None:
+            self._unlink(project_id, entry.skills)
+
+    def _unlink(self, project_id: int, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            projects = self._projects_by_user.get(user_id)
+            if projects is not None:
+                projects.discard(project_id)
+                if not projects:
+                    del self._projects_by_user[user_id]
+
+    async def get(self, project_id: int) -> SkillMatrix:
+        """
+        Gets the skill matrix of a project, building it on a miss.
+        """
+        entry = self._matrices.get(project_id)
+        if entry is not None:
+            return entry.matrix
+
+        version = self._version
+        skills_by_user = await SkillService.get_user_skills_by_project(project_id)
+        matrix = encode_members(skills_by_user)
+        if version == self._version:
+            self._store(project_id, _CachedProject(matrix, skills_by_user))
+        return matrix
+
+    def skills_of(self, project_id: int, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Gets the {skill name: value} answers of members of a cached project.
+        """
+        entry = self._matrices.get(project_id)
+        skills = entry.skills if entry is not None else {}
+        return {user_id: skills.get(user_id, {}) for user_id in user_ids}
+
+    def _cached_answers(self, user_id: int) -> Optional[Dict[str, Any]]:
+        # A lookup may evict the project, and with it change the set
+        for project_id in list(self._projects_by_user.get(user_id, ())):
+            entry = self._matrices.get(project_id)
+            if entry is not None:
+                return entry.skills[user_id]
+        return None
+
+    async def add_member(self, project_id: int, user_id: int) -> None:
+        """
+        Inserts a new member's row into the project's matrix, if it's cached.
+        """
+        self._version += 1
+        if self._matrices.get(project_id) is None:
+            return
+
+        skills = self._cached_answers(user_id)
+        if skills is None:
+            skills = await SkillService.get_user_skills(user_id)
+
+        # The skills query may have let another write drop or change the matrix
+        entry = self._matrices.get(project_id)
+        if entry is None or user_id in entry.skills:
+            return
+        matrix = entry.matrix
+        levels, language, framework = encode_member(skills)
+        row = int(np.searchsorted(matrix.user_ids, user_id))
+        self._store(project_id, _CachedProject(
+            SkillMatrix(
+                user_ids=np.insert(matrix.user_ids, row, user_id),
+                levels=np.insert(matrix.levels, row, levels, axis=0),
+                languages=np.asarray([*matrix.languages[:row], language, *matrix.languages[row:]], dtype=str),
+                frameworks=np.asarray([*matrix.frameworks[:row], framework, *matrix.frameworks[row:]], dtype=str),
+            ),
+            {**entry.skills, user_id: skills},
+        ))
+
+    def remove_member(self, project_id: int, user_id: int) -> None:
+        """
+        Deletes a member's row from the project's matrix, if it's cached.
+        """
+        self._version += 1
+        entry = self._matrices.get(project_id)
+        if entry is None or user_id not in entry.skills:
+            return
+
+        self._unlink(project_id, [user_id])
+        matrix = entry.matrix
+        rows = np.flatnonzero(matrix.user_ids == user_id)
+        self._matrices.set(project_id, _CachedProject(
+            SkillMatrix(
+                user_ids=np.delete(matrix.user_ids, rows),
+                levels=np.delete(matrix.levels, rows, axis=0),
+                languages=np.delete(matrix.languages, rows),
+                frameworks=np.delete(matrix.frameworks, rows),
+            ),
+            {member_id: skills for member_id, skills in entry.skills.items() if member_id != user_id},
+        ))
+
+    def update_skills(self, user_id: int, skills: Dict[str, Any]) -> None:
+        """
+        Applies new survey answers of a user to every cached project they belong to.
+
+        Args:
+            user_id: user ID
+            skills: skill name -> new value (other skills are kept)
+        """
+        self._version += 1
+        skills = _answers(skills)
+
+        for project_id in list(self._projects_by_user.get(user_id, ())):
+            entry = self._matrices.get(project_id)
+            if entry is None:
+                continue
+            merged = {**entry.skills[user_id], **skills}
+            levels, language, framework = encode_member(merged)
+            matrix = entry.matrix
+            rows = matrix.user_ids == user_id
+            updated = SkillMatrix(
+                user_ids=matrix.user_ids,
+                levels=matrix.levels.copy(),
+                # Rebuilt so a longer answer isn't truncated to the array's string width
+                languages=np.where(rows, language, matrix.languages.astype(object)).astype(str),
+                frameworks=np.where(rows, framework, matrix.frameworks.astype(object)).astype(str),
+            )
+            updated.levels[rows] = levels
+            self._matrices.set(project_id, _CachedProject(updated, {**entry.skills, user_id: merged}))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drops the matrices of every project the user belongs to, for writes whose
+        resulting answers aren't known here.
+        """
+        self._version += 1
+        for project_id in list(self._projects_by_user.get(user_id, ())):
+            self._forget(project_id, self._matrices.pop(project_id))
+
+    def drop(self, project_id: int) -> None:
+        """
+        Forgets a project's matrix (created or deleted projects).
+        """
+        self._version += 1
+        self._forget(project_id, self._matrices.pop(project_id))
+
+
+# Process-wide matrices
+skill_matrices = ProjectSkillMatrices()
+
+
+class AssignmentService:
+    """
+    Skill-based task assignment without an LLM round trip.
+    """
+
+    @staticmethod
+    def best_members(matrix: SkillMatrix, requirements: TaskRequirements) -> np.ndarray:
+        """
+        Gets the IDs of the members tied for the best score, in user ID order.
+        """
+        if not len(matrix):
+            return np.empty(0, dtype=np.int64)
+        scores = score_members(matrix, requirements)
+        return matrix.user_ids[np.isclose(scores, scores.max())]
+
+    @staticmethod
+    async def assign_task(project_id: int, task_title: str, task_desc: Optional[str], llm=None) -> Optional[int]:
+        """
+        Picks the project member whose skills best fit a task.
+
+        Args:
+            project_id: project ID
+            task_title: task name
+            task_desc: task description
+            llm: Optional GeminiService used to break ties when ASSIGNMENT_LLM_TIEBREAK is set
+
+        Returns:
+            User ID of the chosen member or None if the project has no members
+        """
+        matrix = await skill_matrices.get(project_id)
+        candidates = AssignmentService.best_members(matrix, task_requirements(task_title, task_desc))
+        if not len(candidates):
+            return None
+
+        if len(candidates) > 1 and llm is not None and settings.ASSIGNMENT_LLM_TIEBREAK:
+            tied = skill_matrices.skills_of(project_id, candidates.tolist())
+            chosen = await llm.assign_task(project_id, task_title, task_desc, users=tied)
+            if chosen in tied:
+                return chosen
+            logger.warning(f"LLM tie-break returned {chosen}, not one of {list(tied)}")
+
+        return int(candidates[0])
+
+    @staticmethod
+    async def get_open_task_counts(user_ids: Sequence[int], exclude_task_ids: Sequence[int] = ()) -> Dict[int, int]:
+        """
+        Counts the tasks that are not DONE per user, across all projects.
+
+        Args:
+            user_ids: users to count for
+            exclude_task_ids: tasks left out of the count (e.g. the ones being reassigned)
+
+        Returns:
+            user ID -> open tasks (users without open tasks are omitted)
+        """
+        rows = await Task.filter(
+            assigned_user_id__in=list(user_ids)
+        ).exclude(
+            status=TaskStatus.DONE
+        ).exclude(
+            id__in=list(exclude_task_ids)
+        ).annotate(
+            open_tasks=Count("id")
+        ).group_by("assigned_user_id").values_list("assigned_user_id", "open_tasks")
+        return dict(rows)
+
+    @staticmethod
+    async def plan_tasks(project_id: int, tasks: List[Task]) -> Dict[int, int]:
+        """
+        Chooses an assignee for each task, balancing skill fit against current workload.
+
+        Args:
+            project_id: project ID
+            tasks: tasks to assign (their name and description are used)
+
+        Returns:
+            task ID -> user ID (empty if the project has no members)
+        """
+        matrix = await skill_matrices.get(project_id)
+        if not len(matrix) or not tasks:
+            return {}
+
+        counts = await AssignmentService.get_open_task_counts(
+            matrix.user_ids.tolist(), exclude_task_ids=[t.id for t in tasks]
+        )
+        open_tasks = np.asarray([counts.get(int(u), 0) for u in matrix.user_ids], dtype=np.float64)
+
+        rows = plan_batch(
+            matrix,
+            [task_requirements(t.name, t.description) for t in tasks],
+            open_tasks,
+            settings.ASSIGNMENT_LOAD_WEIGHT
+        )
+        return {t.id: int(matrix.user_ids[row]) for t, row in zip(tasks, rows)}
@@ -1,68 +1,147 @@
+import asyncio
 import logging
+import re
 import google.genai as genai
-from typing import Optional
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+from typing import Optional, Type, TypeVar
 from typing import Dict, Any
 
 from app.config import settings
-from app.services.skill_service import SkillService
-from app.utils.load_prompt import LoadPrompt
+from app.services.assignment_service import skill_matrices
+from app.utils.load_prompt import prompt_registry
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Matches a JSON payload wrapped in a ```json ... ``` block
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+
+def parse_json_response(text: str, schema: Type[SchemaT]) -> SchemaT:
+    """
+    Validates an LLM JSON response against a Pydantic model, tolerating code fences.
+
+    Raises:
+        ValidationError: If the payload doesn't match the schema
+    """
+    match = _CODE_FENCE_RE.match(text)
+    return schema.model_validate_json(match.group(1) if match else text.strip())
 
 
 class GeminiService:
-    def __init__(self, api_key: str, model: str):
-        self.client = genai.Client(api_key=api_key)
+    def __init__(
+            self,
+            api_key: str,
+            model: str,
+            max_concurrency: Optional[int] = None,
+            timeout: Optional[float] = None,
+            http_options: Optional[types.HttpOptions] = None
+    ):
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
         self.model = model
+        self.timeout = timeout if timeout is not None else settings.LLM_TIMEOUT
+        # Bounds the number of in-flight requests sent through this service
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.LLM_MAX_CONCURRENCY)
+
+    async def _generate(self, prompt: str, config: Optional[types.GenerateContentConfig] = None) -> str:
+        """
+        Sends a prompt through the async client without blocking the event loop.
+
+        Args:
+            prompt: Fully formatted prompt
+            config: Optional generation config (e.g. a response schema)
+
+        Returns:
+            Raw response text
+
+        Raises:
+            asyncio.TimeoutError: If the call takes longer than the configured timeout
+        """
+        logger.debug("WILL PROCESS THE RESPONSE FOR THIS PROMPT: %s", prompt)
+        async with self._semaphore:
+            # wait_for cancels the underlying request on timeout, and a cancelled caller
+            # cancels it too, so the slot is always released
+            response = await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=config
+                ),
+                timeout=self.timeout
+            )
+        logger.debug("RESPONSE: %s", response.text)
+        return response.text
+
+    async def warm_up(self) -> None:
+        """
+        Opens the connection to the API ahead of the first real request.
+        """
+        await asyncio.wait_for(self.client.aio.models.get(model=self.model), timeout=self.timeout)
 
     async def detect_intent(self, text: str, intent_prompt: str) -> Optional[str]:
         try:
-            print("WILL PROCESS THE RESPONSE FOR THIS PROMPT: ", text.format(user_message=intent_prompt))
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=text.format(user_message=intent_prompt)
+            response = await self._generate(text.format(user_message=intent_prompt))
+            return response.strip().lower()
+        except Exception as e:
+            logging.error(f"Gemini Service ERROR: {e}")
+            return None
+
+    async def generate_structured(self, prompt: str, schema: Type[SchemaT]) -> Optional[SchemaT]:
+        """
+        Asks for a JSON response constrained to a Pydantic model.
+
+        Args:
+            prompt: Fully formatted prompt
+            schema: Pydantic model the response must follow
+
+        Returns:
+            Validated model or None if the call or the validation failed
+        """
+        try:
+            response = await self._generate(
+                prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=schema
+                )
             )
-            print("RESPONSE: ", response.text)
-            return response.text.strip().lower()
+            return parse_json_response(response, schema)
+        except ValidationError as e:
+            logging.error(f"Gemini Service ERROR: invalid structured response: {e}")
+            return None
         except Exception as e:
             logging.error(f"Gemini Service ERROR: {e}")
             return None
 
-    async def assign_task(self, project_id:int, task_title: str, task_desc: str) -> Optional[int]:
-        text = LoadPrompt.load_prompt("app/services/prompts/assignation.txt")
-        users = await SkillService.get_user_skills_by_project(project_id)
-        print(text)
-        print(text.format(task_title=task_title, task_description=task_desc, users=users))
+    async def assign_task(self, project_id:int, task_title: str, task_desc: str, users: Optional[dict] = None) -> Optional[int]:
+        text = prompt_registry.get("assignation")
+        # Callers breaking a tie pass only the tied candidates
+        if users is None:
+            matrix = await skill_matrices.get(project_id)
+            users = skill_matrices.skills_of(project_id, matrix.user_ids.tolist())
 
         try:
             prompt = text.format(task_title=task_title, task_description=task_desc, users=users)
-            print("WILL PROCESS THE RESPONSE FOR THIS PROMPT: ", prompt)
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
-            print("RESPONSE: ", response.text)
-            return int(response.text.strip().lower())
+            response = await self._generate(prompt)
+            return int(response.strip().lower())
         except Exception as e:
             logging.error(f"Gemini Service ERROR: {e}")
             return None
 
-    async def solve_overdue_task(self, context) -> Optional[str]:
-        text = LoadPrompt.load_prompt("app/services/prompts/notify.txt")
-        print(text)
-
-        prompt = text.format(
-            custom_id=context['custom_id'],
-            task_name=context['task_name'],
-            deadline=context['deadline'],
-            project_name=context['project_name'],
-            assigned_user=context['assigned_user'],
-            current_status=context['current_status'],
-            team_members=context['team_members'],
-            all_project_tasks=context['all_project_tasks']
-        )
-        print("WILL PROCESS THE RESPONSE FOR THIS PROMPT: ", prompt)
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt
-        )
-        print("RESPONSE: ", response.text)
-        return response.text
+    async def summarize_overdue_project(self, context: Dict[str, str]) -> Optional[str]:
+        """
+        Writes one notification covering all of a project's overdue tasks.
+
+        Args:
+            context: Values for the notify_digest prompt
+
+        Returns:
+            Notification text or None if the call failed
+        """
+        try:
+            return await self._generate(prompt_registry.get("notify_digest").format(**context))
+        except Exception as e:
+            logging.error(f"Gemini Service ERROR: {e}")
+            return None
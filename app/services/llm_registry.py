@@ -0,0 +1,70 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+import httpx
+from google.genai import types
+
+from app.config import settings
+from app.services.gemini_service import GeminiService
+
+logger = logging.getLogger(__name__)
+
+# Key under which the registry is stored in Application.bot_data
+LLM_REGISTRY_KEY = "llm_registry"
+
+
+class LLMRegistry:
+    """
+    Keeps one long-lived GeminiService per (api_key, model) so every handler and job
+    shares the same HTTP connection pool instead of building a client per call.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        self.api_key = api_key or settings.GEMINI_KEY
+        self.model = model or settings.LLM_MODEL
+        self._services: Dict[Tuple[str, str], GeminiService] = {}
+
+    def get(self, api_key: Optional[str] = None, model: Optional[str] = None) -> GeminiService:
+        """
+        Gets the shared service for a key and model, creating it on first use.
+
+        Args:
+            api_key: API key (default: the registry's key)
+            model: Model name (default: the registry's model)
+
+        Returns:
+            Shared GeminiService
+        """
+        key = (api_key or self.api_key, model or self.model)
+        service = self._services.get(key)
+        if service is None:
+            service = GeminiService(
+                api_key=key[0],
+                model=key[1],
+                http_options=types.HttpOptions(async_client_args={
+                    "limits": httpx.Limits(
+                        max_connections=settings.LLM_MAX_CONCURRENCY,
+                        max_keepalive_connections=settings.LLM_MAX_CONCURRENCY,
+                        keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+                    )
+                })
+            )
+            self._services[key] = service
+        return service
+
+    async def warm_up(self) -> None:
+        """
+        Creates the default service and opens its connection so the first user message
+        doesn't pay for the TLS handshake. Failures are logged, not raised.
+        """
+        try:
+            await self.get().warm_up()
+        except Exception as e:
+            logger.warning(f"LLM warm-up failed: {e}")
+
+
+def get_llm(context) -> GeminiService:
+    """
+    Gets the shared LLM service injected by BotManager into a handler or job context.
+    """
+    return context.bot_data[LLM_REGISTRY_KEY].get()
@@ -0,0 +1,56 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, field_validator
+
+
+class Intent(str, Enum):
+    REGISTRO = "registro"
+    ACTUALIZAR_HABILIDADES = "actualizar_habilidades"
+    CREAR_PROYECTO = "crear_proyecto_nlp"
+    AGREGAR_TAREA = "agregar_tarea_nlp"
+    AYUDA = "ayuda"
+
+
+class ProjectParams(BaseModel):
+    """
+    Parameters for creating a project from a message.
+    """
+    nombre: Optional[str] = None
+    descripcion: Optional[str] = None
+    miembros: Optional[List[str]] = None
+
+    @field_validator("miembros")
+    @classmethod
+    def strip_mentions(cls, members: Optional[List[str]]) -> List[str]:
+        # Users are stored without the leading @
+        return [m.strip().lstrip("@") for m in members or [] if m and m.strip().lstrip("@")]
+
+
+class TaskParams(BaseModel):
+    """
+    Parameters for creating a task from a message. The deadline uses %Y-%m-%d %H:%M.
+    """
+    identificador: Optional[str] = None
+    nombre: Optional[str] = None
+    descripcion: Optional[str] = None
+    deadline: Optional[str] = None
+
+
+class IntentParams(BaseModel):
+    """
+    Intent and, for project/task creation, its parameters from a single LLM response.
+    """
+    intent: Intent
+    proyecto: Optional[ProjectParams] = None
+    tarea: Optional[TaskParams] = None
+
+    def params(self) -> Optional[dict]:
+        """
+        Gets the parameters for the detected intent as the dict the handlers expect.
+        """
+        if self.intent == Intent.CREAR_PROYECTO:
+            return (self.proyecto or ProjectParams()).model_dump()
+        if self.intent == Intent.AGREGAR_TAREA:
+            return (self.tarea or TaskParams()).model_dump()
+        return None
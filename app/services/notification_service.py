@@ -0,0 +1,287 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from telegram.helpers import escape_markdown
+from tortoise.expressions import Q
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+
+from app.models.db import WRITE_CONNECTION
+from app.config import settings
+from app.models.models import Task, TaskNotification, TaskStatus
+from app.services.project_service import ProjectService
+
+# Overdue tasks listed one by one in a digest; the rest are only counted
+DIGEST_MAX_TASKS = 15
+
+
+def mention(username: Optional[str], first_name: Optional[str]) -> str:
+    """
+    How a user is referred to in notifications: @username, or the first name if there's none.
+    """
+    return f"@{username}" if username else (first_name or "sin asignar")
+
+
+def parse_hours(value: str) -> List[float]:
+    """
+    Parses a comma separated list of hours, e.g. "0,24,72".
+    """
+    return sorted(float(hour) for hour in value.split(",") if hour.strip())
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def escalation_level(deadline: datetime, now: datetime, thresholds: Optional[Sequence[float]] = None) -> int:
+    """
+    Number of escalation thresholds (hours overdue) a task has crossed.
+    """
+    if thresholds is None:
+        thresholds = parse_hours(settings.OVERDUE_ESCALATION_HOURS)
+    hours_overdue = (now - _as_utc(deadline)).total_seconds() / 3600
+    return sum(1 for hours in thresholds if hours_overdue >= hours)
+
+
+def content_hash(task: Task) -> str:
+    """
+    Hash of the task fields a notification shows; a change means the task needs a new one.
+    """
+    content = f"{task.name}|{task.status.value}|{task.assigned_user_id}|{_as_utc(task.deadline).isoformat()}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def needs_notification(
+        task: Task,
+        state: Optional[TaskNotification],
+        now: datetime,
+        level: int,
+        cooldown: Optional[float] = None
+) -> bool:
+    """
+    A task is notified the first time it's overdue, and again only when it reached a new
+    escalation level or its content changed, and never twice within the cooldown.
+    """
+    if state is None:
+        return True
+    if cooldown is None:
+        cooldown = settings.OVERDUE_NOTIFY_COOLDOWN
+    if (now - _as_utc(state.last_notified_at)).total_seconds() < cooldown:
+        return False
+    return level > state.escalation_level or content_hash(task) != state.content_hash
+
+
+@dataclass
+class ProjectDigest:
+    """
+    Everything needed to notify a project's group about its overdue tasks.
+    """
+    project_id: int
+    project_name: str
+    chat_id: int
+    overdue: List[Task] = field(default_factory=list)
+    members: List[Dict[str, Any]] = field(default_factory=list)
+    open_tasks: Dict[int, int] = field(default_factory=dict)  # user ID -> open tasks in the project
+    levels: Dict[int, int] = field(default_factory=dict)  # task ID -> escalation level
+    states: Dict[int, TaskNotification] = field(default_factory=dict)  # task ID -> previous state
+
+
+class NotificationService:
+    @staticmethod
+    async def get_overdue_digests(
+            now: datetime,
+            task_ids: Optional[Sequence[int]] = None,
+            since: Optional[datetime] = None
+    ) -> List[ProjectDigest]:
+        """
+        Groups by project the non completed overdue tasks that need a notification
+        (see needs_notification).
+
+        Args:
+            now: Current time
+            task_ids: Only look at these tasks (e.g. the ones whose deadline just passed)
+            since: Watermark of the previous scan. Only tasks that expired, changed,
+                crossed an escalation threshold or left their notification cooldown
+                after it are looked at
+
+        Returns:
+            One digest per project with tasks to notify
+        """
+        thresholds = parse_hours(settings.OVERDUE_ESCALATION_HOURS)
+        query = Task.filter(deadline__lt=now)
+        if task_ids is not None:
+            query = query.filter(id__in=list(task_ids))
+        if since is not None:
+            window = Q(deadline__gte=since) | Q(updated_at__gte=since)
+            for hours in thresholds:
+                if hours > 0:
+                    shift = timedelta(hours=hours)
+                    window |= Q(deadline__gte=since - shift, deadline__lt=now - shift)
+            # Changes held back by the cooldown are read again once it ends
+            cooldown = timedelta(seconds=settings.OVERDUE_NOTIFY_COOLDOWN)
+            window |= Q(
+                notification__last_notified_at__gte=since - cooldown,
+                notification__last_notified_at__lt=now - cooldown
+            )
+            query = query.filter(window)
+        overdue_tasks = await query.exclude(
+            status=TaskStatus.DONE
+        ).order_by("deadline").select_related("project", "assigned_user")
+        if not overdue_tasks:
+            return []
+
+        states = {
+            state.task_id: state
+            for state in await TaskNotification.filter(task_id__in=[t.id for t in overdue_tasks])
+        }
+
+        digests: Dict[int, ProjectDigest] = {}
+        for task in overdue_tasks:
+            level = escalation_level(task.deadline, now, thresholds)
+            state = states.get(task.id)
+            if not needs_notification(task, state, now, level):
+                continue
+
+            digest = digests.get(task.project_id)
+            if digest is None:
+                digest = digests[task.project_id] = ProjectDigest(
+                    project_id=task.project_id,
+                    project_name=task.project.name,
+                    chat_id=int(task.project.telegram_chat_id)
+                )
+            digest.overdue.append(task)
+            digest.levels[task.id] = level
+            if state is not None:
+                digest.states[task.id] = state
+
+        if not digests:
+            return []
+
+        # Members and workload of every affected project, one query each
+        project_ids = list(digests)
+        members = await ProjectService.get_members_by_projects(project_ids)
+        open_tasks = await Task.filter(
+            project_id__in=project_ids, assigned_user_id__not_isnull=True
+        ).exclude(
+            status=TaskStatus.DONE
+        ).annotate(
+            count=Count("id")
+        ).group_by("project_id", "assigned_user_id").values_list("project_id", "assigned_user_id", "count")
+
+        for project_id, digest in digests.items():
+            digest.members = members[project_id]
+        for project_id, user_id, count in open_tasks:
+            digests[project_id].open_tasks[user_id] = count
+
+        return list(digests.values())
+
+    @staticmethod
+    async def mark_notified(digests: Sequence[ProjectDigest], now: datetime) -> None:
+        """
+        Saves the notification state of every task in the sent digests.
+        """
+        new_states, old_states = [], []
+        for digest in digests:
+            for task in digest.overdue:
+                state = digest.states.get(task.id)
+                if state is None:
+                    state = TaskNotification(task_id=task.id)
+                    new_states.append(state)
+                else:
+                    old_states.append(state)
+                state.last_notified_at = now
+                state.escalation_level = digest.levels[task.id]
+                state.content_hash = content_hash(task)
+
+        if not new_states and not old_states:
+            return
+        async with in_transaction(WRITE_CONNECTION):
+            if new_states:
+                await TaskNotification.bulk_create(new_states)
+            if old_states:
+                await TaskNotification.bulk_update(
+                    old_states, fields=["last_notified_at", "escalation_level", "content_hash"]
+                )
+
+    @staticmethod
+    def _task_line(task: Task, level: int) -> str:
+        user = task.assigned_user
+        assignee = mention(user.username, user.first_name) if user else "sin asignar"
+        return (
+            f"{task.custom_id} | {task.name} | vence {task.deadline.strftime('%d/%m/%Y %H:%M')} | "
+            f"{assignee} | {task.status.value} | nivel {level}"
+        )
+
+    @staticmethod
+    def build_context(digest: ProjectDigest) -> Dict[str, str]:
+        """
+        Compact prompt context for one project: one line per overdue task and per member.
+        """
+        lines = [
+            NotificationService._task_line(t, digest.levels.get(t.id, 1)) for t in digest.overdue[:DIGEST_MAX_TASKS]
+        ]
+        hidden = len(digest.overdue) - DIGEST_MAX_TASKS
+        if hidden > 0:
+            lines.append(f"... y {hidden} tareas atrasadas más")
+
+        members = [
+            f"{mention(m['username'], m['first_name'])} ({m['role']}) | "
+            f"{digest.open_tasks.get(m['user_id'], 0)} tareas abiertas"
+            for m in digest.members
+        ]
+        return {
+            "project_name": digest.project_name,
+            "overdue_count": str(len(digest.overdue)),
+            "overdue_tasks": "\n".join(lines),
+            "team_members": "\n".join(members),
+        }
+
+    @staticmethod
+    def format_digest(digest: ProjectDigest) -> str:
+        """
+        Deterministic Markdown digest, used when the LLM is disabled or fails.
+        """
+        by_user: Dict[str, List[Task]] = defaultdict(list)
+        for task in digest.overdue[:DIGEST_MAX_TASKS]:
+            user = task.assigned_user
+            by_user[mention(user.username, user.first_name) if user else "sin asignar"].append(task)
+
+        lines = [
+            f"⏰ *{escape_markdown(digest.project_name)}*: "
+            f"{len(digest.overdue)} tarea(s) atrasada(s)",
+            "",
+        ]
+        for assignee, tasks in by_user.items():
+            lines.append(f"👤 {escape_markdown(assignee)}")
+            for task in tasks:
+                urgent = " ‼️" if digest.levels.get(task.id, 1) > 1 else ""
+                lines.append(
+                    f"  • {escape_markdown(task.custom_id or str(task.id))} "
+                    f"{escape_markdown(task.name)} (venció {task.deadline.strftime('%d/%m/%Y %H:%M')}){urgent}"
+                )
+        hidden = len(digest.overdue) - DIGEST_MAX_TASKS
+        if hidden > 0:
+            lines.append(f"… y {hidden} más")
+        lines += ["", "💡 Revisen prioridades o redistribuyan las tareas con quien tenga menos carga."]
+        return "\n".join(lines)
+
+    @staticmethod
+    async def render_digest(digest: ProjectDigest, llm=None) -> str:
+        """
+        Writes the digest with one LLM call, falling back to the template.
+
+        Args:
+            digest: Project digest
+            llm: GeminiService, or None to use the template
+
+        Returns:
+            Notification text
+        """
+        if llm is not None and settings.OVERDUE_DIGEST_LLM:
+            text = await llm.summarize_overdue_project(NotificationService.build_context(digest))
+            if text and text.strip():
+                return text.strip()
+        return NotificationService.format_digest(digest)
@@ -1,12 +1,59 @@
-from typing import List, Optional, Union, Dict, Any, Tuple
+from contextvars import ContextVar
+from functools import partial, wraps
+from typing import List, Optional, Set, Union, Dict, Any, Tuple
 from tortoise.exceptions import DoesNotExist
 from tortoise.transactions import atomic
 
+from app.models.db import WRITE_CONNECTION
 from app.models.models import (
     Project, User, ProjectUser, Task, ProjectRole, ProjectStatus,
     Project_Pydantic, ProjectCreate_Pydantic,
     ProjectUser_Pydantic, ProjectUserCreate_Pydantic
 )
+from app.models.rows import ProjectRow, fetch_rows
+from app.models.write_queue import after_commit, with_commit_hooks
+from app.config import settings
+from app.services.assignment_service import skill_matrices
+from app.services.task_service import TaskService
+from app.utils.cache import TTLCache
+
+# telegram_chat_id -> Project_Pydantic, or None for chats without a project
+project_cache = TTLCache(maxsize=settings.PROJECT_CACHE_SIZE, ttl=settings.PROJECT_CACHE_TTL)
+_NOT_CACHED = object()
+
+# Chats whose cached project the running write has made stale
+_stale_chats: ContextVar[Optional[Set[str]]] = ContextVar("stale_chats", default=None)
+
+
+def _invalidate_chat(chat_id: str) -> None:
+    """
+    Drops the cached project of a chat, now and again once the running write's
+    transaction is over (a read in between could cache the old row).
+    """
+    project_cache.pop(chat_id)
+    stale = _stale_chats.get()
+    if stale is not None:
+        stale.add(chat_id)
+
+
+def _invalidates_project_cache(func):
+    """
+    Wraps a transactional write (goes above @atomic) so the chats it passed to
+    `_invalidate_chat` are dropped from the cache after commit or rollback.
+    """
+
+    @wraps(func)
+    async def wrapped(*args, **kwargs):
+        stale = set()
+        token = _stale_chats.set(stale)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _stale_chats.reset(token)
+            for chat_id in stale:
+                project_cache.pop(chat_id)
+
+    return wrapped
 
 
 class ProjectService:
@@ -34,7 +81,8 @@ class ProjectService:
     @staticmethod
     async def get_project_by_chat_id(chat_id: str) -> Optional[Project_Pydantic]:
         """
-        Gets a project by its chatID.
+        Gets a project by its chatID. Results, including "not found", are served from
+        `project_cache` until they expire or the project is written.
 
         Args:
             project_id: Project ID
@@ -42,14 +90,20 @@ class ProjectService:
         Returns:
             Project details or None if not found
         """
+        cached = project_cache.get(chat_id, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
+
         try:
-            project = await Project.get(telegram_chat_id=chat_id)
-            return await Project_Pydantic.from_tortoise_orm(project)
+            project = await Project_Pydantic.from_tortoise_orm(await Project.get(telegram_chat_id=chat_id))
+            project_cache.set(chat_id, project)
         except DoesNotExist:
-            return None
+            project = None
+            project_cache.set(chat_id, None, ttl=settings.PROJECT_CACHE_NEGATIVE_TTL)
+        return project
 
     @staticmethod
-    async def get_projects_by_user(user_id: int) -> List[Project_Pydantic]:
+    async def get_projects_by_user(user_id: int) -> List[ProjectRow]:
         """
         Gets all projects where a given user participates.
 
@@ -59,13 +113,10 @@ class ProjectService:
         Returns:
             List of projects where the given user participates
         """
-        user = await User.get(id=user_id)
-        projects = await user.projects
-        #print(projects)
-        return [await Project_Pydantic.from_tortoise_orm(project) for project in projects]
+        return await fetch_rows(Project.filter(project_users__user_id=user_id), ProjectRow)
 
     @staticmethod
-    async def get_projects_by_status(status: Union[ProjectStatus, str]) -> List[Project_Pydantic]:
+    async def get_projects_by_status(status: Union[ProjectStatus, str]) -> List[ProjectRow]:
         """
         Gets all projects with a specific status.
 
@@ -77,8 +128,7 @@ class ProjectService:
         """
         # Manage enum objects and string values
         status_value = status.value if isinstance(status, ProjectStatus) else status
-        projects = await Project.filter(status=status_value)
-        return [await Project_Pydantic.from_tortoise_orm(project) for project in projects]
+        return await fetch_rows(Project.filter(status=status_value), ProjectRow)
 
     @staticmethod
     async def get_user_role_in_project(user_id: int, project_id: int) -> Optional[ProjectRole]:
@@ -115,6 +165,30 @@ class ProjectService:
         except DoesNotExist:
             return None
 
+    @staticmethod
+    async def get_members_by_projects(project_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Gets the members of several projects in a single query.
+
+        Args:
+            project_ids: project IDs
+
+        Returns:
+            project ID -> members, in the format of get_project_members
+        """
+        members: Dict[int, List[Dict[str, Any]]] = {project_id: [] for project_id in project_ids}
+        rows = await ProjectUser.filter(project_id__in=project_ids).order_by("id").values_list(
+            "project_id", "user_id", "user__username", "user__first_name", "role"
+        )
+        for project_id, user_id, username, first_name, role in rows:
+            members[project_id].append({
+                'user_id': user_id,
+                'username': username,
+                'first_name': first_name,
+                'role': role.value if isinstance(role, ProjectRole) else role
+            })
+        return members
+
     @staticmethod
     async def get_project_members(project_id: int) -> List[Dict[str, Any]]:
         """
@@ -141,7 +215,9 @@ class ProjectService:
         return members
 
     @staticmethod
-    @atomic()
+    @_invalidates_project_cache
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
     async def create_project(
             project_data: Union[Dict[str, Any], ProjectCreate_Pydantic],
             admin_user_id: int,
@@ -159,7 +235,7 @@ class ProjectService:
             Created project
 
         Raises:
-            DoesNotExist: If none of the users exist
+            DoesNotExist: If the admin or any of the members doesn't exist (lists the missing IDs)
             ValueError: If there are problems with the project data
         """
         # Turn Enums into strings if it's a dictionary
@@ -172,12 +248,18 @@ class ProjectService:
             project_data = ProjectCreate_Pydantic(**project_data)
 
 
-        # Verify that the admin exists
-        admin_user = await User.get(id=admin_user_id)
-
+        # The admin isn't added again as a regular member
+        member_ids = [member_id for member_id in dict.fromkeys(member_ids or []) if member_id != admin_user_id]
 
+        # Verify that the admin and the members exist
+        user_ids = [admin_user_id, *member_ids]
+        existing = set(await User.filter(id__in=user_ids).values_list("id", flat=True))
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        if missing:
+            raise DoesNotExist(f"Users with ids={missing} not found")
 
         # Create the project
+        _invalidate_chat(project_data.telegram_chat_id)
         project = await Project.create(
             name=project_data.name,
             description=project_data.description,
@@ -185,37 +267,18 @@ class ProjectService:
             status=project_data.status if hasattr(project_data, 'status') else ProjectStatus.ACTIVE.value
         )
 
-
-
-        existing_admin = await ProjectUser.filter(project=project, role=ProjectRole.ADMIN).exists()
-        if existing_admin:
-            raise ValueError("This project has already an assigned admin.")
-
-        # Assign the admin
-        await ProjectUser.create(
-            project=project,
-            user=admin_user,
-            role=ProjectRole.ADMIN
-        )
-
-        # Add members if provided
-        if member_ids:
-            for member_id in member_ids:
-                # Check if member exists
-                member = await User.get(id=member_id) # CHANGE TO INT ID to iterate
-
-                # Don't add the admin as a regular member
-                if member.id != admin_user_id:
-                    await ProjectUser.create(
-                        project=project,
-                        user=member,
-                        role=ProjectRole.MEMBER
-                    )
+        # Assign the admin and the members
+        await ProjectUser.bulk_create([
+            ProjectUser(project=project, user_id=admin_user_id, role=ProjectRole.ADMIN),
+            *(ProjectUser(project=project, user_id=member_id, role=ProjectRole.MEMBER) for member_id in member_ids)
+        ])
+        after_commit(partial(skill_matrices.drop, project.id))
 
         return await Project_Pydantic.from_tortoise_orm(project)
 
     @staticmethod
-    @atomic()
+    @_invalidates_project_cache
+    @atomic(WRITE_CONNECTION)
     async def update_project(
             project_id: int,
             project_data: Dict[str, Any],
@@ -243,6 +306,7 @@ class ProjectService:
 
             # Get and update the project
             project = await Project.get(id=project_id)
+            _invalidate_chat(project.telegram_chat_id)
 
             # Only update the provided fields
             if 'name' in project_data:
@@ -257,6 +321,7 @@ class ProjectService:
                     project.status = project_data['status']
             if 'telegram_chat_id' in project_data:
                 project.telegram_chat_id = project_data['telegram_chat_id']
+                _invalidate_chat(project.telegram_chat_id)
 
             await project.save()
             return await Project_Pydantic.from_tortoise_orm(project)
@@ -265,7 +330,8 @@ class ProjectService:
             return None
 
     @staticmethod
-    @atomic()
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
     async def add_member_to_project(
             project_id: int,
             member_id: int,
@@ -303,6 +369,7 @@ class ProjectService:
                 user=member,
                 role=ProjectRole.MEMBER
             )
+            after_commit(partial(skill_matrices.add_member, project_id, member_id))
 
             return True
 
@@ -310,7 +377,8 @@ class ProjectService:
             return False
 
     @staticmethod
-    @atomic()
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
     async def remove_member_from_project(
             project_id: int,
             member_id: int,
@@ -340,6 +408,7 @@ class ProjectService:
 
             # Delete the member from the project
             await member_role.delete()
+            after_commit(partial(skill_matrices.remove_member, project_id, member_id))
 
             return True
 
@@ -347,7 +416,7 @@ class ProjectService:
             return False
 
     @staticmethod
-    @atomic()
+    @atomic(WRITE_CONNECTION)
     async def change_project_admin(
             project_id: int,
             new_admin_id: int,
@@ -388,7 +457,9 @@ class ProjectService:
             return False
 
     @staticmethod
-    @atomic()
+    @_invalidates_project_cache
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
     async def delete_project(project_id: int, admin_id: int) -> bool:
         """
         Deletes a project and all its relations, verifying that the requester is an admin.
@@ -440,13 +511,16 @@ class ProjectService:
 
             # Delete in secure order to avoid FK problems
             # 1. Delete all project tasks
-            await Task.filter(project_id=project_id).delete()
+            await TaskService.delete_tasks_by_project(project_id)
 
             # 2. Delete all Project User relations
             await ProjectUser.filter(project_id=project_id).delete()
 
             # 3. Delete project
+            for chat_id in await Project.filter(id=project_id).values_list("telegram_chat_id", flat=True):
+                _invalidate_chat(chat_id)
             await Project.filter(id=project_id).delete()
+            after_commit(partial(skill_matrices.drop, project_id))
 
             return True
 
@@ -1,12 +1,56 @@
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
 from fastapi import HTTPException
 from tortoise.exceptions import DoesNotExist
 
-from app.models.models import UserSkill, Project, ProjectUser
+from app.models.models import UserSkill, Project, ProjectUser, Skill, SkillType
 from app.models.models import UserSkill_Pydantic, UserSkillCreate_Pydantic
 
 
+class SkillCatalogue:
+    """
+    Skill IDs by SkillType. The catalogue holds one Skill row per type, named after the
+    type's value; missing rows are created on load.
+    """
+
+    def __init__(self):
+        self._ids: Optional[Dict[SkillType, int]] = None
+
+    async def load(self) -> Dict[SkillType, int]:
+        """
+        Seeds the missing catalogue rows (a no-op once they exist) and loads their IDs.
+        """
+        await Skill.bulk_create(
+            [Skill(name=skill_type.value, type=skill_type) for skill_type in SkillType],
+            ignore_conflicts=True
+        )
+        rows = await Skill.filter(name__in=[skill_type.value for skill_type in SkillType]).values_list("id", "type")
+        self._ids = {SkillType(skill_type): skill_id for skill_id, skill_type in rows}
+        return self._ids
+
+    async def get_id(self, skill_type: SkillType) -> int:
+        """
+        Gets the catalogue skill of a type, loading the catalogue on first use.
+        """
+        if self._ids is None:
+            await self.load()
+        return self._ids[skill_type]
+
+
+# Process-wide catalogue
+skill_catalogue = SkillCatalogue()
+
+
+def skill_value(value: str) -> Any:
+    """
+    Survey levels are stored as text, numeric ones are returned as int.
+    """
+    try:
+        return int(value)  # Convert to int if possible
+    except ValueError:
+        return value  # Keep as string if failed
+
+
 class SkillService:
     @staticmethod
     async def list_by_project(project_id: int) -> List[UserSkill]:
@@ -20,42 +64,37 @@ class SkillService:
     @staticmethod
     async def get_user_skills_by_project(project_id: int) -> dict:
         # Verify if project exists
-        project = await Project.get_or_none(id=project_id)
-        if not project:
+        if not await Project.filter(id=project_id).exists():
             raise HTTPException(status_code=404, detail="Project not found")
 
-        # Get all project members with their skills prefetched
-        project_users = await ProjectUser.filter(project=project).prefetch_related(
-            'user__user_skills__skill'
-        )
-
-        skills_by_user = {}
-        for pu in project_users:
-            user = pu.user
-            user_skills = user.user_skills  # Preloaded with fetch
-
-            skills_dict = {}
-            for us in user_skills:
-                skill_name = us.skill.name
-                try:
-                    skill_value = int(us.value)  # Convert to int if possible
-                except ValueError:
-                    skill_value = us.value  # Keep as string if failed
+        # Members without skills are kept with an empty dict
+        member_ids = await ProjectUser.filter(project_id=project_id).values_list("user_id", flat=True)
+        skills_by_user = {user_id: {} for user_id in member_ids}
 
-                skills_dict[skill_name] = skill_value
-
-            # Use first_name as key (could be username if available)
-            skills_by_user[user.id] = skills_dict
+        # Flat rows instead of prefetching model instances per member
+        rows = await UserSkill.filter(user__user_projects__project_id=project_id).values_list(
+            "user_id", "skill__name", "value"
+        )
+        for user_id, skill_name, value in rows:
+            skills_by_user[user_id][skill_name] = skill_value(value)
 
         return skills_by_user
 
     @staticmethod
-    async def fetch_all_user_skills() -> Dict[int, List[Tuple[str,int]]]:
+    async def get_user_skills(user_id: int) -> Dict[str, Any]:
+        """
+        Gets a user's skills as {skill name: value}.
+        """
+        rows = await UserSkill.filter(user_id=user_id).values_list("skill__name", "value")
+        return {skill_name: skill_value(value) for skill_name, value in rows}
+
+    @staticmethod
+    async def fetch_all_user_skills() -> Dict[int, List[Tuple[str, Any]]]:
         """
         Returns a dict user_id → list of (skill_name, valor)
         """
-        skills = await UserSkill.all().prefetch_related("skill")
-        result: Dict[int, List[Tuple[str,int]]] = {}
-        for us in skills:
-            result.setdefault(us.user.id, []).append((us.skill.name, us.value))
+        rows = await UserSkill.all().values_list("user_id", "skill__name", "value")
+        result: Dict[int, List[Tuple[str, Any]]] = {}
+        for user_id, skill_name, value in rows:
+            result.setdefault(user_id, []).append((skill_name, skill_value(value)))
         return result
\ No newline at end of file
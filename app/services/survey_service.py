@@ -1,7 +1,16 @@
-from tortoise.exceptions import DoesNotExist
+from functools import partial
+from typing import Dict, Optional
+
+from tortoise.exceptions import DoesNotExist, IntegrityError
 from tortoise.transactions import atomic
 
-from app.models.models import User, Skill, UserSkill, SkillType
+from app.models.db import WRITE_CONNECTION
+from app.models.write_queue import after_commit, group_commit
+from app.models.models import User, Skill, UserSkill, SkillType, SubscriptionType
+from app.services.assignment_service import skill_matrices
+from app.services.skill_service import skill_catalogue
+from app.services.talent_index import talent_index
+from app.services.user_registry import user_registry
 """from app.models.models import (
     User, Skill, UserSkill, SkillType,
     UserSkill_Pydantic, UserSkillCreate_Pydantic
@@ -32,37 +41,71 @@ QUESTION_KEY_TO_TYPE = {
     "devops": SkillType.DEVOPS,
 }
 
+@group_commit
 async def save_user_skill_by_question_key(user_id: int, question_key: str, skill_name: str, update_existing: bool = True):
-    try:
-        user = await User.get(id=user_id)
-    except DoesNotExist:
-        raise ValueError(f"Usuario con user_id={user_id} no encontrado")
-
-    print(question_key)
     skill_type = QUESTION_KEY_TO_TYPE.get(question_key)
     if not skill_type:
         raise ValueError(f"No se pudo determinar el tipo de skill para la clave: {question_key}")
+    skill_id = await skill_catalogue.get_id(skill_type)
 
+    # A single upsert on (user, skill); without update_existing a previous answer is kept
+    if update_existing:
+        conflict = {"on_conflict": ["user_id", "skill_id"], "update_fields": ["value"]}
+    else:
+        conflict = {"ignore_conflicts": True}
     try:
-        skill = await Skill.get(type=skill_type, name=skill_type)
-        #print(skill)
-    except DoesNotExist:
-        raise ValueError(f"Skill '{skill_name}' con tipo '{skill_type.value}' no encontrado")
+        await UserSkill.bulk_create([UserSkill(user_id=user_id, skill_id=skill_id, value=skill_name)], **conflict)
+    except IntegrityError:
+        raise ValueError(f"Usuario con user_id={user_id} no encontrado")
 
     if update_existing:
-        existing = await UserSkill.filter(user=user, skill__type=skill_type).first()
-        if existing:
-            existing.skill = skill
-            existing.value = skill_name
-            await existing.save()
-            return
+        after_commit(partial(skill_matrices.update_skills, user_id, {skill_type.value: skill_name}))
+    else:
+        # The previous answer may have been kept
+        after_commit(partial(skill_matrices.invalidate_user, user_id))
+    after_commit(partial(talent_index.update, user_id, {skill_type.value: skill_name}, overwrite=update_existing))
+
+
+@group_commit
+async def save_survey_profile(user_id: int, username: Optional[str], first_name: str, answers: Dict[str, str]) -> None:
+    """
+    Saves a finished survey in one transaction: upserts the user (new users are FREE,
+    existing ones keep their subscription) and all their answers.
+
+    Args:
+        user_id: Telegram ID
+        username: Telegram username
+        first_name: Telegram first name
+        answers: Question key -> answer
+
+    Raises:
+        ValueError: If a question key doesn't match a skill type
+    """
+    unknown = set(answers) - set(QUESTION_KEY_TO_TYPE)
+    if unknown:
+        raise ValueError(f"No se pudo determinar el tipo de skill para las claves: {sorted(unknown)}")
 
-    await UserSkill.create(user=user, skill=skill, value=skill_name)
+    await User.bulk_create(
+        [User(id=user_id, username=username, first_name=first_name)],
+        on_conflict=["id"], update_fields=["username", "first_name"]
+    )
+    await UserSkill.bulk_create(
+        [
+            UserSkill(user_id=user_id, skill_id=await skill_catalogue.get_id(QUESTION_KEY_TO_TYPE[key]), value=value)
+            for key, value in answers.items()
+        ],
+        on_conflict=["user_id", "skill_id"], update_fields=["value"]
+    )
+    skills = {QUESTION_KEY_TO_TYPE[key].value: value for key, value in answers.items()}
+    after_commit(partial(skill_matrices.update_skills, user_id, skills))
+    after_commit(partial(talent_index.update, user_id, skills))
+    if await user_registry.get_subscription(user_id) is None:
+        after_commit(partial(user_registry.add, user_id, SubscriptionType.FREE))
 
 """
 class SurveyService:
     @staticmethod
-    @atomic()
+    @atomic(WRITE_CONNECTION)
     async def save_user_skill(
             telegram_username: str,
             skill_type: SkillType,
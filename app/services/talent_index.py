@@ -0,0 +1,238 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.models import SkillType
+from app.services.skill_service import SkillService, skill_value
+
+logger = logging.getLogger(__name__)
+
+# Answers kept as category codes; every other skill is a 1-5 level
+CATEGORICAL_SKILLS: Tuple[SkillType, ...] = (SkillType.LANGUAGE, SkillType.FRAMEWORK)
+NUMERIC_SKILLS: Tuple[SkillType, ...] = tuple(s for s in SkillType if s not in CATEGORICAL_SKILLS)
+
+# Survey levels go up to 5; 0 means "not answered"
+MAX_LEVEL = 5
+
+# Rows added to the columns at once when a new user doesn't fit
+_GROWTH = 1024
+
+
+@dataclass
+class TalentQuery:
+    """
+    Filters and ordering of a talent search, e.g. database >= 4 and framework = Django,
+    top 20 by testing.
+    """
+    min_levels: Dict[SkillType, int] = field(default_factory=dict)
+    equals: Dict[SkillType, str] = field(default_factory=dict)
+    order_by: Optional[SkillType] = None
+    limit: int = 20
+
+
+def _level(value: Any) -> int:
+    value = skill_value(str(value))
+    return min(max(value, 0), MAX_LEVEL) if isinstance(value, int) else 0
+
+
+class TalentIndex:
+    """
+    Column store of every user's survey answers for talent searches.
+
+    Each SkillType is one NumPy column with a row per user: int8 levels for the numeric
+    skills and int32 category codes for language and framework (code 0 is "not
+    answered"). A search is a handful of vectorized comparisons over the columns, so it
+    takes milliseconds even with a million users.
+
+    `load` reads all skills at startup with rows sorted by user ID; users registered
+    afterwards are appended by `update`, which skill writes call to keep the index
+    current without reloading.
+    """
+
+    def __init__(self):
+        # Writes that arrive while `load` is reading the table, replayed after it
+        self._pending: Optional[List[Tuple[int, Dict[str, Any], bool]]] = None
+        self._reset(0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reset(self, capacity: int) -> None:
+        self._size = 0
+        self._user_ids = np.zeros(capacity, dtype=np.int64)
+        self._columns: Dict[SkillType, np.ndarray] = {
+            skill: np.zeros(capacity, dtype=np.int32 if skill in CATEGORICAL_SKILLS else np.int8)
+            for skill in SkillType
+        }
+        # Category labels by code and codes by case-folded label
+        self._labels: Dict[SkillType, List[str]] = {skill: [""] for skill in CATEGORICAL_SKILLS}
+        self._codes: Dict[SkillType, Dict[str, int]] = {skill: {} for skill in CATEGORICAL_SKILLS}
+        # Rows up to _sorted_size are in user ID order; later ones were added after `load`
+        self._sorted_size = 0
+        self._appended: Dict[int, int] = {}
+
+    def _code(self, skill: SkillType, label: str) -> int:
+        key = label.casefold()
+        code = self._codes[skill].get(key)
+        if code is None:
+            code = len(self._labels[skill])
+            self._labels[skill].append(label)
+            self._codes[skill][key] = code
+        return code
+
+    def _encode(self, skill: SkillType, value: Any) -> int:
+        if skill in CATEGORICAL_SKILLS:
+            return self._code(skill, str(value)) if value else 0
+        return _level(value)
+
+    def _row_of(self, user_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self._user_ids[:self._sorted_size], user_id))
+        if row < self._sorted_size and self._user_ids[row] == user_id:
+            return row
+        return self._appended.get(user_id)
+
+    def build(self, skills_by_user: Dict[int, Iterable[Tuple[str, Any]]]) -> int:
+        """
+        Replaces the index with the output of SkillService.fetch_all_user_skills.
+
+        Returns:
+            Number of indexed users
+        """
+        user_ids = sorted(skills_by_user)
+        self._reset(len(user_ids))
+        self._user_ids[:] = user_ids
+        self._size = self._sorted_size = len(user_ids)
+
+        # Gather each skill's rows and answers, then fill its column at once
+        gathered = {skill.value: ([], []) for skill in SkillType}
+        for row, user_id in enumerate(user_ids):
+            for name, value in skills_by_user[user_id]:
+                entry = gathered.get(name)
+                if entry is not None:
+                    entry[0].append(row)
+                    entry[1].append(value)
+
+        for name, (rows, values) in gathered.items():
+            skill = SkillType(name)
+            # Answers repeat a lot, so each distinct one is encoded once
+            codes = {value: self._encode(skill, value) for value in dict.fromkeys(values)}
+            self._columns[skill][rows] = [codes[value] for value in values]
+        return self._size
+
+    async def load(self) -> int:
+        """
+        Builds the index from the user_skills table.
+
+        Returns:
+            Number of indexed users
+        """
+        self._pending = []
+        try:
+            self.build(await SkillService.fetch_all_user_skills())
+            pending = self._pending
+        finally:
+            self._pending = None
+        for user_id, skills, overwrite in pending:
+            self.update(user_id, skills, overwrite)
+        logger.info(f"Talent index loaded with {self._size} users")
+        return self._size
+
+    def update(self, user_id: int, skills: Dict[str, Any], overwrite: bool = True) -> None:
+        """
+        Applies a user's new answers, adding the user if they aren't indexed yet.
+
+        Args:
+            user_id: user ID
+            skills: skill name -> value (unknown names are ignored)
+            overwrite: False keeps answers the user already has, like the
+                `update_existing=False` survey writes
+        """
+        if self._pending is not None:
+            self._pending.append((user_id, dict(skills), overwrite))
+
+        row = self._row_of(user_id)
+        if row is None:
+            if self._size == len(self._user_ids):
+                extra = max(_GROWTH, self._size // 8)
+                self._user_ids = np.concatenate([self._user_ids, np.zeros(extra, np.int64)])
+                for skill, column in self._columns.items():
+                    self._columns[skill] = np.concatenate([column, np.zeros(extra, column.dtype)])
+            row = self._size
+            self._size += 1
+            self._user_ids[row] = user_id
+            self._appended[user_id] = row
+
+        for name, value in skills.items():
+            try:
+                skill = SkillType(name)
+            except ValueError:
+                continue
+            column = self._columns[skill]
+            if overwrite or not column[row]:
+                column[row] = self._encode(skill, value)
+
+    def search(self, query: TalentQuery) -> List[int]:
+        """
+        Finds the users matching a query.
+
+        Returns:
+            Up to `query.limit` user IDs, best `order_by` level first and then by user ID
+
+        Raises:
+            ValueError: If a level filter or the ordering uses language or framework
+        """
+        leveled = [*query.min_levels, *([query.order_by] if query.order_by else [])]
+        if any(skill in CATEGORICAL_SKILLS for skill in leveled):
+            raise ValueError("Language and framework have no levels, filter them by value")
+
+        n = self._size
+        mask = np.ones(n, dtype=bool)
+        for skill, level in query.min_levels.items():
+            mask &= self._columns[skill][:n] >= level
+        for skill, label in query.equals.items():
+            code = self._codes[skill].get(label.casefold())
+            if code is None:
+                return []
+            mask &= self._columns[skill][:n] == code
+
+        rows = np.flatnonzero(mask)
+        limit = max(query.limit, 0)
+        if query.order_by is None:
+            return self._lowest_ids(rows, limit)
+
+        # Levels are 0-5, so take whole levels from the top and break the last tie by ID
+        keys = self._columns[query.order_by][rows]
+        found: List[int] = []
+        for level in range(MAX_LEVEL, -1, -1):
+            if len(found) >= limit:
+                break
+            found += self._lowest_ids(rows[keys == level], limit - len(found))
+        return found
+
+    def _lowest_ids(self, rows: np.ndarray, limit: int) -> List[int]:
+        user_ids = self._user_ids[rows]
+        if len(user_ids) > limit:
+            user_ids = np.partition(user_ids, limit - 1)[:limit] if limit else user_ids[:0]
+        return np.sort(user_ids).tolist()
+
+    def profile(self, user_id: int) -> Dict[str, Any]:
+        """
+        Gets the indexed answers of a user as {skill name: value}, without the
+        unanswered ones.
+        """
+        row = self._row_of(user_id)
+        if row is None:
+            return {}
+
+        answers: Dict[str, Any] = {}
+        for skill, column in self._columns.items():
+            value = int(column[row])
+            if value:
+                answers[skill.value] = self._labels[skill][value] if skill in CATEGORICAL_SKILLS else value
+        return answers
+
+
+# Process-wide index
+talent_index = TalentIndex()
@@ -1,8 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 from typing import List, Optional, Union, Dict, Any, Tuple
 from tortoise.exceptions import DoesNotExist
-from tortoise.transactions import atomic
+from tortoise.transactions import atomic, in_transaction
 
+from app.models.db import WRITE_CONNECTION
+from app.models.write_queue import after_commit, group_commit, with_commit_hooks
 from app.models.models import (
     Project, User, ProjectUser, ProjectRole, ProjectStatus, Task,
     Project_Pydantic, ProjectCreate_Pydantic,
@@ -10,11 +13,15 @@ from app.models.models import (
     Task_Pydantic, TaskCreate_Pydantic, User_Pydantic
 )
 from app.models.models import TaskStatus
+from app.models.rows import TaskRow, fetch_rows
+from app.scheduler.deadlines import deadline_scheduler
+from app.services.assignment_service import AssignmentService
 
 class TaskService:
     @staticmethod
     async def create_task(task_data: Union[Dict[str, Any], TaskCreate_Pydantic]) -> Task_Pydantic:
         task_obj = await Task.create(**task_data)
+        after_commit(partial(deadline_scheduler.track, task_obj))
         return await Task_Pydantic.from_tortoise_orm(task_obj)
 
     @staticmethod
@@ -40,6 +47,7 @@ class TaskService:
             for field, value in update_data.items():
                 setattr(task, field, value)
             await task.save()
+            after_commit(partial(deadline_scheduler.track, task))
             return await Task_Pydantic.from_tortoise_orm(task)
         except DoesNotExist:
             return None
@@ -47,18 +55,20 @@ class TaskService:
     @staticmethod
     async def delete_task(task_id: int) -> bool:
         deleted_count = await Task.filter(id=task_id).delete()
+        after_commit(partial(deadline_scheduler.cancel, task_id))
         return deleted_count > 0
 
     @staticmethod
     async def delete_tasks_by_project(project_id: int) -> int:
+        task_ids = await Task.filter(project_id=project_id).values_list("id", flat=True)
         deleted_count = await Task.filter(project_id=project_id).delete()
+        for task_id in task_ids:
+            after_commit(partial(deadline_scheduler.cancel, task_id))
         return deleted_count
 
     @staticmethod
-    async def get_tasks_by_project(project_id: int) -> List[Task_Pydantic]:
-        tasks = await Task.filter(project_id=project_id).all()
-        #print("TASKS: ", tasks)
-        return [await Task_Pydantic.from_tortoise_orm(task) for task in tasks]
+    async def get_tasks_by_project(project_id: int) -> List[TaskRow]:
+        return await fetch_rows(Task.filter(project_id=project_id), TaskRow)
 
     @staticmethod
     async def get_tasks_by_user(user_id: int) -> List[Task_Pydantic]:
@@ -77,11 +87,40 @@ class TaskService:
             return None
 
     @staticmethod
+    async def assign_users_batch(project_id: int, task_ids: List[int]) -> Dict[int, int]:
+        """
+        Assigns several tasks of a project at once, balancing skill fit and the members'
+        open workload, and saves every assignment in a single transaction.
+
+        Args:
+            project_id: project ID
+            task_ids: IDs of the project's tasks to (re)assign
+
+        Returns:
+            task ID -> assigned user ID (tasks outside the project are ignored)
+        """
+        tasks = await Task.filter(id__in=task_ids, project_id=project_id).order_by("id")
+        plan = await AssignmentService.plan_tasks(project_id, tasks)
+        if not plan:
+            return {}
+
+        # bulk_update skips auto_now, and the overdue scan needs updated_at to see reassignments
+        now = datetime.now(timezone.utc)
+        async with in_transaction(WRITE_CONNECTION):
+            for task in tasks:
+                task.assigned_user_id = plan[task.id]
+                task.updated_at = now
+            await Task.bulk_update(tasks, fields=["assigned_user_id", "updated_at"])
+        return plan
+
+    @staticmethod
+    @group_commit
     async def change_status(task_id: int, status: TaskStatus) -> Optional[Task_Pydantic]:
         try:
             task = await Task.get(id=task_id)
             task.status = status
             await task.save()
+            after_commit(partial(deadline_scheduler.track, task))
             return await Task_Pydantic.from_tortoise_orm(task)
         except DoesNotExist:
             return None
@@ -121,7 +160,8 @@ class TaskService:
         ).first()
 
     @staticmethod
-    @atomic()
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
     async def update_task(
             task_id: int,
             status: Optional[TaskStatus] = None,
@@ -134,6 +174,7 @@ class TaskService:
             if deadline:
                 task.deadline = deadline
             await task.save()
+            after_commit(partial(deadline_scheduler.track, task))
             return True
         except DoesNotExist:
             return False
\ No newline at end of file
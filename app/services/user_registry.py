@@ -0,0 +1,73 @@
+import logging
+from typing import Dict, Optional
+
+from app.config import settings
+from app.models.models import SubscriptionType, User
+
+logger = logging.getLogger(__name__)
+
+
+class UserRegistry:
+    """
+    In-memory map of registered Telegram IDs to their subscription type, so handlers can
+    check registration without a query.
+
+    `load` reads every user at startup. If there are more than `maxsize` the map only
+    holds the ones seen so far and IDs missing from it are looked up in the database.
+    Before `load` (scripts, tests) every miss goes to the database too.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or settings.USER_REGISTRY_SIZE
+        self._subscriptions: Dict[int, SubscriptionType] = {}
+        # True when every registered user is in the map, so a miss means "not registered"
+        self.complete = False
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    async def load(self) -> int:
+        """
+        Fills the map from the users table.
+
+        Returns:
+            Number of loaded users
+        """
+        rows = await User.all().limit(self.maxsize + 1).values_list("id", "subscription_type")
+        self.complete = len(rows) <= self.maxsize
+        self._subscriptions = dict(rows[:self.maxsize])
+        if not self.complete:
+            logger.warning(f"More than {self.maxsize} users, registration checks will query unknown IDs")
+        return len(self._subscriptions)
+
+    def add(self, user_id: int, subscription: SubscriptionType) -> None:
+        """
+        Records a registered user or a subscription change.
+        """
+        if user_id in self._subscriptions or len(self._subscriptions) < self.maxsize:
+            self._subscriptions[user_id] = SubscriptionType(subscription)
+        else:
+            self.complete = False
+
+    async def get_subscription(self, user_id: int) -> Optional[SubscriptionType]:
+        """
+        Gets the subscription type of a user.
+
+        Returns:
+            Subscription type or None if the user isn't registered
+        """
+        subscription = self._subscriptions.get(user_id)
+        if subscription is not None or self.complete:
+            return subscription
+
+        subscription = await User.filter(id=user_id).first().values_list("subscription_type", flat=True)
+        if subscription is not None:
+            self.add(user_id, subscription)
+        return subscription
+
+    async def is_registered(self, user_id: int) -> bool:
+        return await self.get_subscription(user_id) is not None
+
+
+# Process-wide registry
+user_registry = UserRegistry()
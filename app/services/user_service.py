@@ -1,11 +1,19 @@
+from functools import partial
+
 from tortoise.exceptions import IntegrityError, DoesNotExist
 from tortoise.expressions import Q
+from tortoise.functions import Lower
 from tortoise.transactions import in_transaction
 
+from app.models.db import WRITE_CONNECTION
+from app.models.write_queue import after_commit, group_commit, with_commit_hooks
 from app.models.models import User, Skill, UserSkill, SubscriptionType, UserCreate_Pydantic, ProjectStatus, ProjectUser, \
     ProjectRole
 from app.models.models import User_Pydantic, UserCreate_Pydantic  # Pydantic schema for validation
-from typing import Optional, List, Tuple
+from app.services.assignment_service import skill_matrices
+from app.services.talent_index import talent_index
+from app.services.user_registry import user_registry
+from typing import Dict, Optional, List, Tuple
 
 
 class UserService:
@@ -19,20 +27,26 @@ class UserService:
 
     @staticmethod
     async def can_create_project(user_id: int) -> bool:
-        user = await User.get_or_none(id=user_id).prefetch_related("projects")
-        if not user:
+        subscription = await user_registry.get_subscription(user_id)
+        if subscription is None:
             return False
 
-        if user.subscription_type == SubscriptionType.PREMIUM:
+        if subscription == SubscriptionType.PREMIUM:
             return True
 
-        active_projects = await user.projects.filter(status=ProjectStatus.ACTIVE).count()
+        active_projects = await ProjectUser.filter(user_id=user_id, project__status=ProjectStatus.ACTIVE).count()
         return active_projects < 1
 
     @staticmethod
     async def find_users_by_identifiers(identifiers: List[str]) -> Tuple[List[int], List[str]]:
         """
-        Finds user by username or first_name
+        Finds users by username or first_name. Matching ignores case and a leading @,
+        and a username match wins over a first_name match.
+
+        Usernames are stored lowercased, so they're looked up through the username index
+        in one query; only the identifiers left over are matched against first_name, which
+        scans the table. SQLite's LOWER only folds ASCII, so a non-ASCII first name must
+        be written with the same case as stored ("ángela" doesn't find "Ángela").
 
         Args:
             identifiers: List of user identifiers
@@ -40,23 +54,36 @@ class UserService:
         Returns:
             List of valid ids, list of not found identifiers
         """
+        names = {identifier.strip().lstrip("@") for identifier in identifiers} - {""}
+        if not names:
+            return [], list(identifiers)
+
+        keys = {name.lower() for name in names}
+        found = dict(await User.filter(username__in=keys).values_list("username", "id"))
+
+        left = {name for name in names if name.lower() not in found}
+        if left:
+            rows = await User.annotate(first_name_lower=Lower("first_name")).filter(
+                Q(first_name__in=left) | Q(first_name_lower__in={name.lower() for name in left})
+            ).order_by("id").values_list("id", "first_name")
+            for user_id, first_name in rows:
+                found.setdefault(first_name.lower(), user_id)
+
         valid_ids = []
         missing = []
-
         for identifier in identifiers:
-            user = await User.filter(
-                Q(username=identifier) | Q(first_name=identifier)
-            ).first()
-
-            if user:
-                valid_ids.append(user.id)
+            user_id = found.get(identifier.strip().lstrip("@").lower())
+            if user_id is not None:
+                valid_ids.append(user_id)
             else:
                 missing.append(identifier)
 
         return valid_ids, missing
 
     @staticmethod
+    @group_commit
     async def create_or_update_user(telegram_id: int, username: str, first_name: str) -> User:
+        username = username.lower() if username else None
         user, created = await User.get_or_create(
             id=telegram_id,
             defaults={
@@ -69,6 +96,7 @@ class UserService:
             user.username = username
             user.first_name = first_name
             await user.save()
+        after_commit(partial(user_registry.add, user.id, user.subscription_type))
         return user
 
     @staticmethod
@@ -77,6 +105,7 @@ class UserService:
             user = await User.get(id=user_id)
             user.subscription_type = new_subscription
             await user.save()
+            user_registry.add(user.id, new_subscription)
             return user
         except DoesNotExist:
             return None
@@ -90,6 +119,15 @@ class UserService:
         except DoesNotExist:
             return None
 
+    @staticmethod
+    async def get_display_names(user_ids: List[int]) -> Dict[int, str]:
+        """
+        Gets how to mention several users in one query: @username, or the first name
+        for users without one.
+        """
+        rows = await User.filter(id__in=user_ids).values_list("id", "username", "first_name")
+        return {user_id: f"@{username}" if username else first_name for user_id, username, first_name in rows}
+
     @staticmethod
     async def update_user_skills(telegram_id: int, skills_data: List[dict]) -> User:
         user = await User.get(id=telegram_id).prefetch_related('skills')
@@ -112,15 +150,18 @@ class UserService:
                 skill=skill,
                 defaults={'value': skill_value}
             )
+            after_commit(partial(talent_index.update, telegram_id, {skill_name: skill_value}))
+        after_commit(partial(skill_matrices.invalidate_user, telegram_id))
 
         return await user.fetch_related('skills')
 
     @staticmethod
+    @with_commit_hooks
     async def complete_registration(telegram_id: int, survey_data: dict) -> User:
         # Validate data with pydantic
         user_data = UserCreate_Pydantic(**survey_data)
 
-        async with in_transaction():
+        async with in_transaction(WRITE_CONNECTION):
             user = await UserService.create_or_update_user(
                 telegram_id=telegram_id,
                 username=user_data.username,
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after `ttl` seconds.
+
+    `on_evict(key, value)` is called for the entries the cache drops by itself
+    (expired or least recently used), not for `pop`, `clear` or overwrites.
+    """
+
+    def __init__(
+            self,
+            maxsize: int,
+            ttl: float,
+            clock: Callable[[], float] = time.monotonic,
+            on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._on_evict = on_evict
+        # key -> (expires_at, value), least recently used first
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Gets a cached value, counting the lookup as a hit or miss.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or an expired entry
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            if self._on_evict is not None:
+                self._on_evict(key, value)
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+        """
+        self._data[key] = (self._clock() + (ttl if ttl is not None else self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted_key, (_, evicted) = self._data.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Removes an entry and returns its value, expired or not.
+        """
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets hit/miss counters and the current size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,26 +1,32 @@
-import json
-import re
-import json
+from datetime import datetime
+from typing import Optional
 
-from app.config import Settings
 from app.services.gemini_service import GeminiService
-from app.utils.load_prompt import LoadPrompt
+from app.services.nlp_schemas import IntentParams, ProjectParams, TaskParams
+from app.utils.load_prompt import prompt_registry
 
-async def extract_project_data(text: str) -> dict:
-    llm = GeminiService(Settings.GEMINI_KEY, Settings.LLM_MODEL)
+async def extract_project_data(text: str, llm: GeminiService) -> dict:
+    prompt = prompt_registry.get("params")
+    params = await llm.generate_structured(prompt.format(user_message=text), ProjectParams)
+    return (params or ProjectParams()).model_dump()
 
-    prompt = LoadPrompt.load_prompt("app/services/prompts/params.txt")
-    #print("\n\n\n\n\n\nPROMPT FOR PARAMS: ", prompt.format(user_message=text))
-    response = await llm.detect_intent(text=prompt, intent_prompt=text)
-    print("RESPONSE FOR PARAMS: ", (str(response)))
-    #print(response)
-    #print("JSON FINAL: ", json.loads(str(response)))
-    return json.loads(str(response))
+async def extract_task_data(text: str, llm: GeminiService) -> dict:
+    prompt = prompt_registry.get("task_params")
+    params = await llm.generate_structured(
+        prompt.format(user_message=text, current_date=datetime.now().strftime("%Y-%m-%d")),
+        TaskParams
+    )
+    return (params or TaskParams()).model_dump()
 
-async def extract_task_data(text: str) -> dict:
-    llm = GeminiService(Settings.GEMINI_KEY, Settings.LLM_MODEL)
+async def extract_intent_and_params(text: str, llm: GeminiService) -> Optional[IntentParams]:
+    """
+    Classifies a message and extracts its parameters with a single LLM call.
 
-    prompt = LoadPrompt.load_prompt("app/services/prompts/task_params.txt")
-    response = await llm.detect_intent(text=prompt, intent_prompt=text)
-    print("RESPONSE FOR PARAMS: ", (str(response)))
-    return json.loads(str(response))
\ No newline at end of file
+    Returns:
+        Intent with its parameters, or None if the LLM call failed
+    """
+    prompt = prompt_registry.get("intent_params")
+    return await llm.generate_structured(
+        prompt.format(user_message=text, current_date=datetime.now().strftime("%Y-%m-%d")),
+        IntentParams
+    )
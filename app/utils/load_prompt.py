@@ -1,6 +1,129 @@
+import logging
+import os
+import time
+from pathlib import Path
+from string import Formatter
+from typing import Dict, Optional, Set, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "services" / "prompts"
+
+# Keys passed to .format() for every template
+PROMPT_PLACEHOLDERS: Dict[str, Set[str]] = {
+    "intents": {"user_message"},
+    "params": {"user_message"},
+    "task_params": {"user_message", "current_date"},
+    "intent_params": {"user_message", "current_date"},
+    "assignation": {"task_title", "task_description", "users"},
+    "notify_digest": {"project_name", "overdue_count", "overdue_tasks", "team_members"},
+}
+
+
 class LoadPrompt:
     @staticmethod
     def load_prompt(prompt_file):
         with open(prompt_file, 'r', encoding='utf-8') as f:
             prompt = f.read()
-        return prompt
\ No newline at end of file
+        return prompt
+
+
+class PromptRegistry:
+    """
+    Keeps every prompt template in memory. A template is read again only when its
+    file's mtime changes, and is checked at most every `check_interval` seconds.
+    """
+
+    def __init__(
+            self,
+            prompts_dir: Path = PROMPTS_DIR,
+            placeholders: Optional[Dict[str, Set[str]]] = None,
+            check_interval: Optional[float] = None
+    ):
+        self.prompts_dir = Path(prompts_dir)
+        self.placeholders = placeholders if placeholders is not None else PROMPT_PLACEHOLDERS
+        self.check_interval = check_interval if check_interval is not None else settings.PROMPT_RELOAD_INTERVAL
+        # name -> (template, mtime, last check)
+        self._templates: Dict[str, Tuple[str, float, float]] = {}
+
+    @staticmethod
+    def get_placeholders(template: str) -> Set[str]:
+        """
+        Gets the names of the fields used by a .format() template.
+        """
+        return {field for _, field, _, _ in Formatter().parse(template) if field is not None}
+
+    def _path(self, name: str) -> Path:
+        return self.prompts_dir / f"{name}.txt"
+
+    def _read(self, name: str) -> Tuple[str, float]:
+        """
+        Reads and validates a template.
+
+        Raises:
+            ValueError: If the template's placeholders don't match the expected keys
+        """
+        path = self._path(name)
+        mtime = os.stat(path).st_mtime
+        template = LoadPrompt.load_prompt(path)
+
+        expected = self.placeholders.get(name)
+        if expected is not None:
+            found = self.get_placeholders(template)
+            if found != expected:
+                raise ValueError(
+                    f"Prompt '{name}' placeholders {sorted(found)} don't match the expected {sorted(expected)}"
+                )
+        return template, mtime
+
+    def load_all(self) -> None:
+        """
+        Loads and validates every known template. Meant to be called once at startup.
+
+        Raises:
+            ValueError: If any template is invalid
+        """
+        now = time.monotonic()
+        for name in self.placeholders:
+            template, mtime = self._read(name)
+            self._templates[name] = (template, mtime, now)
+
+    def get(self, name: str) -> str:
+        """
+        Gets a template from memory, reloading it if the file changed on disk.
+        A changed template that fails validation is logged and the previous one kept.
+
+        Args:
+            name: Template name (file name without .txt)
+
+        Returns:
+            Template text
+        """
+        cached = self._templates.get(name)
+        if cached is None:
+            template, mtime = self._read(name)
+            self._templates[name] = (template, mtime, time.monotonic())
+            return template
+
+        template, mtime, checked_at = cached
+        now = time.monotonic()
+        if now - checked_at < self.check_interval:
+            return template
+
+        try:
+            current_mtime = os.stat(self._path(name)).st_mtime
+            if current_mtime != mtime:
+                # Remember the new mtime even if validation fails, so a broken file is reported once
+                mtime = current_mtime
+                template, mtime = self._read(name)
+                logger.info(f"Prompt '{name}' reloaded")
+        except (OSError, ValueError) as e:
+            logger.error(f"Prompt '{name}' reload failed, keeping the previous version: {e}")
+        self._templates[name] = (template, mtime, now)
+        return template
+
+
+# Process-wide registry
+prompt_registry = PromptRegistry()
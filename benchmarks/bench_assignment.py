@@ -0,0 +1,88 @@
+"""
+Times skill-based task assignment for projects of 5 to 5,000 members.
+
+"engine" is the vectorized scoring alone; "assign_task" includes loading the
+project's skills from an in-memory SQLite database.
+
+Usage:
+    python -m benchmarks.bench_assignment
+"""
+import asyncio
+import random
+import time
+
+from tortoise import Tortoise
+
+from app.models.models import User, Skill, SkillType, Project, ProjectUser, UserSkill, ProjectRole
+from app.services.assignment_service import AssignmentService, encode_members, task_requirements
+
+SIZES = (5, 50, 500, 5000)
+LANGUAGES = ["Python", "Java", "JavaScript", "PHP", "C#", "C/C++"]
+FRAMEWORKS = ["Django", "SpringBoot", "React, Angular, Node.js, Express, Vue, etc.", "Laravel", ".NET"]
+TASK = ("Pruebas de integración", "Escribir tests de la API en Django contra Postgres")
+
+
+def random_skills(rng):
+    skills = {skill.value: rng.randint(1, 5) for skill in SkillType}
+    skills["language"] = rng.choice(LANGUAGES)
+    skills["framework"] = rng.choice(FRAMEWORKS)
+    return skills
+
+
+async def seed_project(size, rng, next_user_id, skills):
+    project = await Project.create(name=f"P{size}", description="bench", telegram_chat_id=str(size))
+    users = [User(id=next_user_id + i, first_name=f"u{i}") for i in range(size)]
+    await User.bulk_create(users)
+    await ProjectUser.bulk_create([
+        ProjectUser(project_id=project.id, user_id=u.id, role=ProjectRole.ADMIN if i == 0 else ProjectRole.MEMBER)
+        for i, u in enumerate(users)
+    ])
+    rows = []
+    for u in users:
+        for name, value in random_skills(rng).items():
+            rows.append(UserSkill(user_id=u.id, skill_id=skills[name].id, value=str(value)))
+    await UserSkill.bulk_create(rows)
+    return project
+
+
+def best_of(fn, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+    try:
+        await run()
+    finally:
+        await Tortoise.close_connections()
+
+
+async def run():
+    await Tortoise.generate_schemas()
+    skills = {s.value: await Skill.create(type=s, name=s.value) for s in SkillType}
+
+    rng = random.Random(42)
+    next_user_id = 1
+    print(f"{'members':>8} {'engine':>10} {'assign_task':>12}")
+    for size in SIZES:
+        project = await seed_project(size, rng, next_user_id, skills)
+        next_user_id += size
+
+        members = {i: random_skills(rng) for i in range(size)}
+        matrix = encode_members(members)
+        engine = best_of(lambda: AssignmentService.best_members(matrix, task_requirements(*TASK)))
+
+        start = time.perf_counter()
+        await AssignmentService.assign_task(project.id, *TASK)
+        full = time.perf_counter() - start
+
+        print(f"{size:>8} {engine * 1000:>8.3f}ms {full * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
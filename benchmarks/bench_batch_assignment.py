@@ -0,0 +1,46 @@
+"""
+Times the batch (min-cost) assignment of T pending tasks over n members.
+
+Usage:
+    python -m benchmarks.bench_batch_assignment
+"""
+import random
+import time
+
+import numpy as np
+
+from app.models.models import SkillType
+from app.services.assignment_service import encode_members, plan_batch, task_requirements
+
+SIZES = ((50, 50), (100, 100), (200, 200), (300, 300), (500, 100), (100, 500))
+TITLES = [
+    ("Esquema", "Diseñar la base de datos en Postgres"),
+    ("Pruebas", "Tests de integración con pytest"),
+    ("Despliegue", "Docker y CI/CD en la nube"),
+    ("Sprint", "Planning y retrospectiva"),
+    ("Manual", "Documentar la API"),
+    ("Frontend", "Pantallas en React"),
+]
+LOAD_WEIGHT = 0.15
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'tasks':>6} {'members':>8} {'plan':>10} {'max new/member':>15}")
+    for n_tasks, n_members in SIZES:
+        members = {
+            i: {skill.value: rng.randint(1, 5) for skill in SkillType} for i in range(n_members)
+        }
+        matrix = encode_members(members)
+        requirements = [task_requirements(*rng.choice(TITLES)) for _ in range(n_tasks)]
+        open_tasks = np.asarray([rng.randint(0, 4) for _ in range(n_members)], dtype=np.float64)
+
+        start = time.perf_counter()
+        rows = plan_batch(matrix, requirements, open_tasks, LOAD_WEIGHT)
+        elapsed = time.perf_counter() - start
+
+        print(f"{n_tasks:>6} {n_members:>8} {elapsed * 1000:>8.1f}ms {np.bincount(rows).max():>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Mixed read/write throughput of the "default" and "tuned" database profiles on a
+file-backed SQLite database.
+
+Each worker loops over the bot's hot queries (a project by chat ID, its overdue
+tasks, its members) and, every `write_every` operations, a task status change in a
+transaction.
+
+The second scenario measures contention: readers run while a writer keeps a long
+transaction open (`HOLD` seconds, like a batch reassignment or the overdue job), and
+the report gives the readers' throughput and latency percentiles.
+
+Usage:
+    python -m benchmarks.bench_db_profile [workers] [seconds]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from app.models.db import WRITE_CONNECTION, build_tortoise_config
+from app.models.models import Project, ProjectUser, Task, TaskStatus, User
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+
+PROJECTS = 200
+USERS = 1_000
+TASKS_PER_PROJECT = 50
+WORKERS = 32
+SECONDS = 5.0
+WRITE_EVERY = 5  # 1 write every 5 operations
+HOLD = 0.05  # Seconds the contending writer keeps each transaction open
+
+
+async def seed():
+    now = datetime.now(timezone.utc)
+    await User.bulk_create([User(id=i, username=f"user{i}", first_name=f"U{i}") for i in range(1, USERS + 1)])
+    await Project.bulk_create([
+        Project(id=i, name=f"P{i}", description="bench", telegram_chat_id=str(-100000 - i)) for i in range(1, PROJECTS + 1)
+    ])
+    await ProjectUser.bulk_create([
+        ProjectUser(project_id=p, user_id=(p * 5 + k) % USERS + 1)
+        for p in range(1, PROJECTS + 1) for k in range(5)
+    ])
+    await Task.bulk_create([
+        Task(custom_id=f"T{t}", name=f"Task {t}", project_id=p, assigned_user_id=(p * 5 + t % 5) % USERS + 1,
+             deadline=now + timedelta(days=t - TASKS_PER_PROJECT // 2))
+        for p in range(1, PROJECTS + 1) for t in range(TASKS_PER_PROJECT)
+    ])
+
+
+async def worker(seed_value, deadline, write_every):
+    rng = random.Random(seed_value)
+    statuses = list(TaskStatus)
+    now = datetime.now(timezone.utc)
+    reads = writes = 0
+    while time.perf_counter() < deadline:
+        project_id = rng.randint(1, PROJECTS)
+        if (reads + writes) % write_every == write_every - 1:
+            task = await Task.filter(project_id=project_id, custom_id=f"T{rng.randrange(TASKS_PER_PROJECT)}").first()
+            await TaskService.change_status(task.id, rng.choice(statuses))
+            writes += 1
+        else:
+            await ProjectService.get_project_by_chat_id(str(-100000 - project_id))
+            await Task.filter(project_id=project_id, deadline__lt=now).exclude(status=TaskStatus.DONE)
+            await ProjectService.get_members_by_projects([project_id])
+            reads += 1
+    return reads, writes
+
+
+async def long_writer(deadline, hold):
+    rng = random.Random(0)
+    transactions = 0
+    while time.perf_counter() < deadline:
+        async with in_transaction(WRITE_CONNECTION):
+            project_id = rng.randint(1, PROJECTS)
+            await Task.filter(project_id=project_id).update(status=rng.choice(list(TaskStatus)))
+            await asyncio.sleep(hold)
+        transactions += 1
+        await asyncio.sleep(0)
+    return transactions
+
+
+async def reader(seed_value, deadline):
+    rng = random.Random(seed_value)
+    now = datetime.now(timezone.utc)
+    latencies = []
+    while time.perf_counter() < deadline:
+        project_id = rng.randint(1, PROJECTS)
+        start = time.perf_counter()
+        await Task.filter(project_id=project_id, deadline__lt=now).exclude(status=TaskStatus.DONE).count()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run_contended(db_path, profile, workers, seconds, hold):
+    await Tortoise.init(config=build_tortoise_config(f"sqlite://{db_path}?profile={profile}"))
+    try:
+        deadline = time.perf_counter() + seconds
+        transactions, *latencies = await asyncio.gather(
+            long_writer(deadline, hold), *(reader(i, deadline) for i in range(workers))
+        )
+    finally:
+        await Tortoise.close_connections()
+    latencies = sorted(latency for worker_latencies in latencies for latency in worker_latencies)
+
+    def percentile(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+    return len(latencies) / seconds, percentile(0.5), percentile(0.99), transactions / seconds
+
+
+async def run(db_path, profile, workers, seconds):
+    await Tortoise.init(config=build_tortoise_config(f"sqlite://{db_path}?profile={profile}"))
+    try:
+        deadline = time.perf_counter() + seconds
+        results = await asyncio.gather(*(worker(i, deadline, WRITE_EVERY) for i in range(workers)))
+    finally:
+        await Tortoise.close_connections()
+    reads = sum(r for r, _ in results)
+    writes = sum(w for _, w in results)
+    return reads / seconds, writes / seconds
+
+
+async def main(workers, seconds):
+    mixed = {}
+    contended = {}
+    for profile in ("default", "tuned"):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "bench.sqlite3")
+            await Tortoise.init(config=build_tortoise_config(f"sqlite://{db_path}"))
+            try:
+                await Tortoise.generate_schemas()
+                await seed()
+            finally:
+                await Tortoise.close_connections()
+            mixed[profile] = await run(db_path, profile, workers, seconds)
+            contended[profile] = await run_contended(db_path, profile, workers, seconds, HOLD)
+
+    print(f"{workers} workers, {seconds:.0f}s each")
+    print(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10}")
+    for profile, (reads, writes) in mixed.items():
+        print(f"{profile:<10} {reads:>10.0f} {writes:>10.0f}")
+
+    print(f"\nreaders while a writer holds {HOLD * 1000:.0f} ms transactions")
+    print(f"{'profile':<10} {'reads/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'txns/s':>10}")
+    for profile, (reads, p50, p99, transactions) in contended.items():
+        print(f"{profile:<10} {reads:>10.0f} {p50:>10.1f} {p99:>10.1f} {transactions:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else WORKERS,
+        float(sys.argv[2]) if len(sys.argv) > 2 else SECONDS,
+    ))
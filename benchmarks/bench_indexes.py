@@ -0,0 +1,134 @@
+"""
+Times the hot lookups on a SQLite database with 1M tasks, before and after the
+indexes of migrations/models/1_*_indexes.py (the schema is built with the
+migrations themselves).
+
+The data is written with the sqlite3 module for speed; the lookups go through the
+same Tortoise queries the bot uses.
+
+Usage:
+    python -m benchmarks.bench_indexes [tasks]
+"""
+import asyncio
+import importlib.util
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from tortoise import Tortoise
+
+from app.models.models import Task, TaskStatus, User
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+
+TASKS = 1_000_000
+PROJECTS = 20_000
+USERS = 50_000
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations" / "models"
+
+
+def load_migration(pattern):
+    path = next(MIGRATIONS_DIR.glob(pattern))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def migrate(db_path, pattern):
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["app.models.models"]})
+    try:
+        conn = Tortoise.get_connection("default")
+        await conn.execute_script(await load_migration(pattern).upgrade(conn))
+    finally:
+        await Tortoise.close_connections()
+
+
+def seed(db_path, tasks):
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            'INSERT INTO "user" (id, username, first_name, subscription_type, created_at) VALUES (?, ?, ?, ?, ?)',
+            ((i, f"user{i}", f"U{i}", "free", now) for i in range(1, USERS + 1))
+        )
+        conn.executemany(
+            'INSERT INTO project (id, name, description, status, telegram_chat_id, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            ((i, f"P{i}", "bench", "active", str(-100000 - i), now) for i in range(1, PROJECTS + 1))
+        )
+        conn.executemany(
+            'INSERT INTO project_user (project_id, user_id, role) VALUES (?, ?, ?)',
+            ((p, (p * 5 + k) % USERS + 1, "member") for p in range(1, PROJECTS + 1) for k in range(5))
+        )
+        statuses = [s.value for s in TaskStatus]
+        conn.executemany(
+            'INSERT INTO task (custom_id, name, description, status, deadline, created_at, updated_at, '
+            'project_id, assigned_user_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                (f"T{i // PROJECTS}", f"Task {i}", None, rng.choice(statuses),
+                 now + timedelta(hours=rng.randint(-24 * 365, 24 * 30)), now, now,
+                 i % PROJECTS + 1, (i % PROJECTS * 5 + i % 5) % USERS + 1)
+                for i in range(tasks)
+            )
+        )
+
+
+async def time_lookups(db_path, repeat=20):
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["app.models.models"]})
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    lookups = {
+        "project by chat id": lambda: ProjectService.get_project_by_chat_id(str(-100000 - rng.randint(1, PROJECTS))),
+        "task by custom id": lambda: Task.filter(
+            project_id=rng.randint(1, PROJECTS), custom_id=f"T{rng.randint(0, 40)}"
+        ).first(),
+        "task by custom id + assignee": lambda: TaskService.get_task_by_custom_id_and_project(
+            f"T{rng.randint(0, 40)}", rng.randint(1, PROJECTS), rng.randint(1, USERS)
+        ),
+        "project overdue tasks": lambda: Task.filter(
+            project_id=rng.randint(1, PROJECTS), deadline__lt=now
+        ).exclude(status=TaskStatus.DONE),
+        "user by username": lambda: User.filter(username=f"user{rng.randint(1, USERS)}").first(),
+    }
+    results = {}
+    try:
+        for name, lookup in lookups.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await lookup()
+            results[name] = (time.perf_counter() - start) / repeat
+    finally:
+        await Tortoise.close_connections()
+    return results
+
+
+async def main(tasks):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite3")
+        # Schema as it was before the indexes
+        await migrate(db_path, "0_*_init.py")
+
+        start = time.perf_counter()
+        seed(db_path, tasks)
+        print(f"Seeded {tasks:,} tasks in {time.perf_counter() - start:.1f}s")
+
+        before = await time_lookups(db_path)
+
+        start = time.perf_counter()
+        await migrate(db_path, "1_*_indexes.py")
+        print(f"Migration applied in {time.perf_counter() - start:.1f}s")
+
+        after = await time_lookups(db_path)
+
+    print(f"{'lookup':<30} {'before':>10} {'after':>10}")
+    for name in before:
+        print(f"{name:<30} {before[name] * 1000:>8.2f}ms {after[name] * 1000:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else TASKS))
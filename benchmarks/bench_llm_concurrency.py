@@ -0,0 +1,62 @@
+"""
+Compares N concurrent NLP messages going through the blocking client (old behaviour)
+against the async client with the bounded pool.
+
+Usage:
+    python -m benchmarks.bench_llm_concurrency [messages] [latency_seconds]
+"""
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from app.services.gemini_service import GeminiService
+
+
+class FakeAsyncModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text="ayuda")
+
+
+class FakeSyncModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(self.latency)
+        return SimpleNamespace(text="ayuda")
+
+
+async def blocking_detect_intent(llm: GeminiService, text: str) -> str:
+    # What detect_intent used to do: a sync call inside a coroutine
+    return llm.client.models.generate_content(model=llm.model, contents=text).text
+
+
+async def run(messages: int, latency: float):
+    llm = GeminiService(api_key="bench", model="bench", max_concurrency=messages)
+    llm.client = SimpleNamespace(
+        models=FakeSyncModels(latency),
+        aio=SimpleNamespace(models=FakeAsyncModels(latency))
+    )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(blocking_detect_intent(llm, "? ayuda") for _ in range(messages)))
+    blocking = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(llm.detect_intent("{user_message}", "? ayuda") for _ in range(messages)))
+    non_blocking = time.perf_counter() - start
+
+    print(f"{messages} concurrent messages, {latency:.2f}s simulated LLM latency")
+    print(f"  sync client : {blocking:.3f}s")
+    print(f"  async client: {non_blocking:.3f}s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    lat = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    asyncio.run(run(n, lat))
@@ -0,0 +1,76 @@
+"""
+Time and peak memory of listing a project's tasks through per-row Pydantic
+conversion (the old get_tasks_by_project) versus the TaskRow projection, and the
+projection plus Pydantic conversion at the boundary.
+
+Usage:
+    python -m benchmarks.bench_projection [tasks]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from tortoise import Tortoise
+
+from app.models.models import Project, Task, Task_Pydantic
+from app.models.rows import TaskRow, fetch_rows
+
+TASKS = 10_000
+REPEAT = 5
+
+
+async def pydantic_per_row(project_id):
+    tasks = await Task.filter(project_id=project_id).all()
+    return [await Task_Pydantic.from_tortoise_orm(task) for task in tasks]
+
+
+async def projection(project_id):
+    return await fetch_rows(Task.filter(project_id=project_id), TaskRow)
+
+
+async def projection_then_pydantic(project_id):
+    return [Task_Pydantic.model_validate(row) for row in await projection(project_id)]
+
+
+async def measure(listing, project_id):
+    start = time.process_time()
+    for _ in range(REPEAT):
+        await listing(project_id)
+    cpu = (time.process_time() - start) / REPEAT
+
+    tracemalloc.start()
+    result = await listing(project_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result) > 0
+    return cpu, peak
+
+
+async def main(tasks):
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+    try:
+        await Tortoise.generate_schemas()
+        project = await Project.create(name="P", description="bench", telegram_chat_id="-1")
+        deadline = datetime.now(timezone.utc) + timedelta(days=7)
+        await Task.bulk_create([
+            Task(custom_id=f"T{i}", name=f"Task {i}", description="bench", project=project, deadline=deadline)
+            for i in range(tasks)
+        ], batch_size=1000)
+
+        print(f"Listing {tasks:,} tasks")
+        print(f"{'path':<26} {'cpu':>9} {'peak memory':>12}")
+        for name, listing in (
+                ("pydantic per row", pydantic_per_row),
+                ("projection", projection),
+                ("projection + pydantic", projection_then_pydantic),
+        ):
+            cpu, peak = await measure(listing, project.id)
+            print(f"{name:<26} {cpu * 1000:>7.0f}ms {peak / 2 ** 20:>10.1f}MB")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else TASKS))
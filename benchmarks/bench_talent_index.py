@@ -0,0 +1,90 @@
+"""
+Latency of talent searches over the columnar index with a synthetic population,
+against a plain Python scan of the same answers, plus build time, incremental
+updates and the index's memory.
+
+Usage:
+    python -m benchmarks.bench_talent_index [users]
+"""
+import random
+import sys
+import time
+
+from app.models.models import SkillType
+from app.services.talent_index import NUMERIC_SKILLS, TalentIndex, TalentQuery
+
+USERS = 1_000_000
+REPEAT = 20
+
+LANGUAGES = ["Python", "Java", "JavaScript", "PHP", "C#", "C/C++"]
+FRAMEWORKS = ["Django", "SpringBoot", "React, Angular, Node.js, Express, Vue, etc.", "Laravel", ".NET"]
+
+QUERIES = {
+    "database>=4 framework=Django top 20 by testing": TalentQuery(
+        min_levels={SkillType.DATABASE: 4}, equals={SkillType.FRAMEWORK: "Django"},
+        order_by=SkillType.TESTING, limit=20
+    ),
+    "devops>=5 agile>=3": TalentQuery(min_levels={SkillType.DEVOPS: 5, SkillType.AGILE: 3}),
+    "language=Java top 50 by documentation": TalentQuery(
+        equals={SkillType.LANGUAGE: "Java"}, order_by=SkillType.DOCUMENTATION, limit=50
+    ),
+}
+
+
+def population(users):
+    rng = random.Random(42)
+    return {
+        user_id: [
+            (SkillType.LANGUAGE.value, rng.choice(LANGUAGES)),
+            (SkillType.FRAMEWORK.value, rng.choice(FRAMEWORKS)),
+            *((skill.value, rng.randint(1, 5)) for skill in NUMERIC_SKILLS),
+        ]
+        for user_id in range(1, users + 1)
+    }
+
+
+def scan(skills_by_user, query):
+    """The same search over the dict fetch_all_user_skills returns"""
+    found = []
+    for user_id, answers in skills_by_user.items():
+        skills = dict(answers)
+        if all(skills.get(skill.value, 0) >= level for skill, level in query.min_levels.items()) and all(
+                str(skills.get(skill.value, "")).casefold() == value.casefold() for skill, value in query.equals.items()
+        ):
+            found.append((-skills.get(query.order_by.value, 0) if query.order_by else 0, user_id))
+    return [user_id for _, user_id in sorted(found)[:query.limit]]
+
+
+def main(users):
+    skills_by_user = population(users)
+    index = TalentIndex()
+
+    start = time.perf_counter()
+    index.build(skills_by_user)
+    print(f"build {users} users: {time.perf_counter() - start:.2f} s")
+    memory = index._user_ids.nbytes + sum(column.nbytes for column in index._columns.values())
+    print(f"columns: {memory / 2 ** 20:.1f} MB")
+
+    for name, query in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            found = index.search(query)
+        indexed = (time.perf_counter() - start) / REPEAT
+
+        start = time.perf_counter()
+        expected = scan(skills_by_user, query)
+        scanned = time.perf_counter() - start
+        assert found == expected, name
+        print(f"{name}: index {indexed * 1000:.1f} ms, python scan {scanned * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    for user_id in range(users + 1, users + 10_001):
+        index.update(user_id, {SkillType.DATABASE.value: 5, SkillType.FRAMEWORK.value: "Django"})
+    for user_id in range(1, 10_001):
+        index.update(user_id, {SkillType.TESTING.value: 5})
+    updates = (time.perf_counter() - start) / 20_000
+    print(f"incremental update: {updates * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else USERS)
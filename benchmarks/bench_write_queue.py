@@ -0,0 +1,93 @@
+"""
+Write throughput of bursts of small writes on a file-backed SQLite database, one
+transaction per write versus group commit through WriteQueue.
+
+Each burst fires `writes` concurrent calls mixing the three queued writes of the bot:
+TaskService.change_status, UserService.create_or_update_user and
+save_user_skill_by_question_key.
+
+Usage:
+    python -m benchmarks.bench_write_queue [writes] [profile]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from tortoise import Tortoise
+
+from app.models.db import build_tortoise_config
+from app.models.models import Project, Skill, SkillType, Task, TaskStatus, User
+from app.models.write_queue import WriteQueue
+from app.services.survey_service import save_user_skill_by_question_key
+from app.services.task_service import TaskService
+from app.services.user_service import UserService
+
+WRITES = 2_000
+USERS = 500
+TASKS = 500
+STATUSES = list(TaskStatus)
+
+
+async def seed():
+    await Skill.bulk_create([Skill(name=skill_type, type=skill_type) for skill_type in SkillType])
+    await User.bulk_create([User(id=i, username=f"user{i}", first_name=f"U{i}") for i in range(1, USERS + 1)])
+    project = await Project.create(name="P", description="bench", telegram_chat_id="-1")
+    deadline = datetime.now(timezone.utc) + timedelta(days=7)
+    await Task.bulk_create([
+        Task(id=i, custom_id=f"T{i}", name=f"Task {i}", project=project, deadline=deadline) for i in range(1, TASKS + 1)
+    ])
+
+
+def burst(writes):
+    calls = []
+    for i in range(writes):
+        kind = i % 3
+        if kind == 0:
+            calls.append((TaskService.change_status.__wrapped__, (i % TASKS + 1, STATUSES[i % len(STATUSES)])))
+        elif kind == 1:
+            calls.append((UserService.create_or_update_user.__wrapped__, (i % USERS + 1, f"user{i}", f"U{i}")))
+        else:
+            calls.append((save_user_skill_by_question_key.__wrapped__, (i % USERS + 1, "language", "Python")))
+    return calls
+
+
+async def run(db_path, profile, writes, grouped):
+    await Tortoise.init(config=build_tortoise_config(f"sqlite://{db_path}?profile={profile}"))
+    queue = WriteQueue()
+    try:
+        if grouped:
+            queue.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(queue.submit(func, *args) for func, args in burst(writes)))
+        return writes / (time.perf_counter() - start)
+    finally:
+        await queue.stop()
+        await Tortoise.close_connections()
+
+
+async def main(writes, profile):
+    results = {}
+    for grouped in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "bench.sqlite3")
+            await Tortoise.init(config=build_tortoise_config(f"sqlite://{db_path}"))
+            try:
+                await Tortoise.generate_schemas()
+                await seed()
+            finally:
+                await Tortoise.close_connections()
+            results["group commit" if grouped else "one commit each"] = await run(db_path, profile, writes, grouped)
+
+    print(f"{writes:,} concurrent writes, {profile} profile")
+    for name, rate in results.items():
+        print(f"{name:<16} {rate:>8.0f} writes/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else WRITES,
+        sys.argv[2] if len(sys.argv) > 2 else "default",
+    ))
@@ -0,0 +1,87 @@
+"""
+Offline evaluation of the local intent classifier against the LLM classifier.
+
+Reports accuracy and p50/p99 latency for each path on a labeled Spanish corpus, plus how
+many messages the local stage answers on its own at the configured threshold.
+The LLM path only runs when GEMINI_API_KEY and LLM_MODEL are set.
+
+Usage:
+    python -m benchmarks.eval_intent_classifier [corpus.tsv] [threshold]
+"""
+import asyncio
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from app.bot.handlers.llm.intent_classifier import IntentClassifier
+from app.bot.handlers.llm.local_classifier import LocalIntentClassifier, load_corpus
+from app.config import settings
+from app.services.gemini_service import GeminiService
+from app.utils.cache import TTLCache
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "data" / "intents_eval.tsv"
+MENTION_RE = re.compile(r"^@\w+\s*")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def report(name, hits, latencies):
+    accuracy = sum(hits) / len(hits)
+    print(
+        f"{name:<8} accuracy={accuracy:.1%}  "
+        f"p50={percentile(latencies, 50) * 1000:.3f}ms  p99={percentile(latencies, 99) * 1000:.3f}ms"
+    )
+
+
+async def evaluate(corpus_path: Path, threshold: float):
+    # Same cleanup the handlers do before classifying: drop the leading bot mention
+    samples = [(intent, MENTION_RE.sub("", message)) for intent, message in load_corpus(corpus_path)]
+    local = LocalIntentClassifier()
+
+    local_hits, local_latencies, local_answers = [], [], []
+    for intent, message in samples:
+        start = time.perf_counter()
+        predicted, confidence = local.predict(message)
+        local_latencies.append(time.perf_counter() - start)
+        local_hits.append(predicted == intent)
+        local_answers.append((predicted, confidence))
+
+    print(f"{len(samples)} labeled messages, threshold={threshold}")
+    report("local", local_hits, local_latencies)
+
+    confident = [(hit, conf) for hit, (_, conf) in zip(local_hits, local_answers) if conf >= threshold]
+    if confident:
+        print(
+            f"         answered locally: {len(confident)}/{len(samples)} "
+            f"({sum(hit for hit, _ in confident) / len(confident):.1%} correct)"
+        )
+
+    if not (settings.GEMINI_KEY and settings.LLM_MODEL):
+        print("llm      skipped (GEMINI_API_KEY / LLM_MODEL not set)")
+        return
+
+    # No caching: every message pays a real round trip
+    classifier = IntentClassifier(GeminiService(settings.GEMINI_KEY, settings.LLM_MODEL), cache=TTLCache(0, 0))
+    llm_hits, llm_latencies, hybrid_hits = [], [], []
+    for (intent, message), (local_intent, confidence) in zip(samples, local_answers):
+        start = time.perf_counter()
+        predicted = await classifier.classify(message)
+        llm_latencies.append(time.perf_counter() - start)
+        llm_hits.append(predicted == intent)
+        hybrid_hits.append((local_intent if confidence >= threshold else predicted) == intent)
+
+    report("llm", llm_hits, llm_latencies)
+    print(f"hybrid   accuracy={sum(hybrid_hits) / len(hybrid_hits):.1%}")
+    print(f"         mean llm latency={statistics.mean(llm_latencies) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    corpus = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CORPUS
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else settings.INTENT_CONFIDENCE_THRESHOLD
+    asyncio.run(evaluate(corpus, threshold))
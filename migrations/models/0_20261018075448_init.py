@@ -0,0 +1,71 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "project" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(100) NOT NULL,
+    "description" TEXT NOT NULL,
+    "status" VARCHAR(10) NOT NULL DEFAULT 'active' /* ACTIVE: active\nTERMINATED: terminated */,
+    "telegram_chat_id" VARCHAR(50) NOT NULL,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS "scheduler_state" (
+    "name" VARCHAR(50) NOT NULL PRIMARY KEY,
+    "watermark" TIMESTAMP NOT NULL
+);
+CREATE TABLE IF NOT EXISTS "skill" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "type" VARCHAR(13) NOT NULL /* LANGUAGE: language\nFRAMEWORK: framework\nDATABASE: database\nPROTOTYPING: prototyping\nAGILE: agile\nREQUIREMENTS: requirements\nDOCUMENTATION: documentation\nTESTING: testing\nDEVOPS: devops */,
+    "name" VARCHAR(100) NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS "user" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "username" VARCHAR(100),
+    "first_name" VARCHAR(100) NOT NULL,
+    "subscription_type" VARCHAR(7) NOT NULL DEFAULT 'free' /* FREE: free\nPREMIUM: premium */,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS "project_user" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "role" VARCHAR(6) NOT NULL DEFAULT 'member' /* ADMIN: admin\nMEMBER: member */,
+    "project_id" INT NOT NULL REFERENCES "project" ("id") ON DELETE CASCADE,
+    "user_id" BIGINT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "task" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "custom_id" VARCHAR(50),
+    "name" VARCHAR(100) NOT NULL,
+    "description" TEXT,
+    "status" VARCHAR(11) NOT NULL DEFAULT 'assigned' /* ASSIGNED: assigned\nIN_PROGRESS: in_progress\nDONE: done */,
+    "deadline" TIMESTAMP NOT NULL,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "assigned_user_id" BIGINT REFERENCES "user" ("id") ON DELETE CASCADE,
+    "project_id" INT NOT NULL REFERENCES "project" ("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "task_notification" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "last_notified_at" TIMESTAMP NOT NULL,
+    "escalation_level" INT NOT NULL DEFAULT 0,
+    "content_hash" VARCHAR(64) NOT NULL,
+    "task_id" INT NOT NULL UNIQUE REFERENCES "task" ("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "user_skill" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "value" VARCHAR(50) NOT NULL,
+    "skill_id" INT NOT NULL REFERENCES "skill" ("id") ON DELETE CASCADE,
+    "user_id" BIGINT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_project_telegra_d4c17c" ON "project" ("telegram_chat_id");
+        CREATE UNIQUE INDEX IF NOT EXISTS "uid_project_use_project_8265a8" ON "project_user" ("project_id", "user_id");
+        CREATE UNIQUE INDEX IF NOT EXISTS "uid_task_project_78039b" ON "task" ("project_id", "custom_id");
+        CREATE INDEX IF NOT EXISTS "idx_task_project_b4e276" ON "task" ("project_id", "status", "deadline");
+        CREATE INDEX IF NOT EXISTS "idx_task_updated_57b925" ON "task" ("updated_at");
+        CREATE INDEX IF NOT EXISTS "idx_task_deadlin_889520" ON "task" ("deadline");
+        CREATE INDEX IF NOT EXISTS "idx_user_usernam_9987ab" ON "user" ("username");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_user_usernam_9987ab";
+        DROP INDEX IF EXISTS "idx_task_deadlin_889520";
+        DROP INDEX IF EXISTS "idx_task_updated_57b925";
+        DROP INDEX IF EXISTS "idx_task_project_b4e276";
+        DROP INDEX IF EXISTS "uid_task_project_78039b";
+        DROP INDEX IF EXISTS "uid_project_use_project_8265a8";
+        DROP INDEX IF EXISTS "idx_project_telegra_d4c17c";"""
@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Earlier survey runs could store the same skill twice, keep the latest answer
+    return """
+        DELETE FROM "user_skill" WHERE "id" NOT IN (SELECT MAX("id") FROM "user_skill" GROUP BY "user_id", "skill_id");
+        CREATE UNIQUE INDEX IF NOT EXISTS "uid_user_skill_user_id_9d911a" ON "user_skill" ("user_id", "skill_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "uid_user_skill_user_id_9d911a";"""
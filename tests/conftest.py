@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from tortoise import Tortoise
+from tortoise.backends.sqlite.client import SqliteClient, SqliteTransactionWrapper
+
+# Every method that sends a statement to SQLite (the transaction wrapper has its own executemany)
+QUERY_METHODS = (
+    (SqliteClient, "execute_query"),
+    (SqliteClient, "execute_query_dict"),
+    (SqliteClient, "execute_insert"),
+    (SqliteClient, "execute_many"),
+    (SqliteTransactionWrapper, "execute_many"),
+)
+
+
+@pytest.fixture
+def run_in_db():
+    """
+    Runs an async function against a fresh in-memory database: `run_in_db(func, *args)`
+    returns what `func(*args)` returns. Tortoise's connections belong to the event loop,
+    so the database is created and closed inside the same `asyncio.run`.
+    """
+
+    def run(func, *args, **kwargs):
+        async def main():
+            await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+            try:
+                await Tortoise.generate_schemas()
+                return await func(*args, **kwargs)
+            finally:
+                await Tortoise.close_connections()
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def count_queries(monkeypatch):
+    """
+    Starts recording the SQL statements sent to SQLite: `count_queries()` returns the
+    list they're appended to from then until the end of the test.
+    """
+
+    def start():
+        queries = []
+        for client, method in QUERY_METHODS:
+            original = getattr(client, method)
+
+            def counted(self, query, *args, _original=original, **kwargs):
+                queries.append(query)
+                return _original(self, query, *args, **kwargs)
+
+            monkeypatch.setattr(client, method, counted)
+        return queries
+
+    return start
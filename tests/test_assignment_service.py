@@ -0,0 +1,125 @@
+import itertools
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.models.models import Project, ProjectRole, ProjectUser, Skill, SkillType, Task, User, UserSkill
+from app.services.assignment_service import (
+    AssignmentService, encode_members, min_cost_plan, plan_batch, score_members, task_requirements
+)
+from app.services.task_service import TaskService
+
+MEMBERS = {
+    30: {"language": "Python", "framework": "Django", "database": 2, "testing": 5, "devops": 1},
+    10: {"language": "Java", "framework": "SpringBoot", "database": 5, "testing": 2, "devops": 2},
+    20: {"language": "JavaScript", "framework": "React, Angular, Node.js, Express, Vue, etc.",
+         "database": 3, "testing": 3, "devops": 5, "prototyping": 4},
+}
+
+
+def best(title, description=None, members=MEMBERS):
+    matrix = encode_members(members)
+    return AssignmentService.best_members(matrix, task_requirements(title, description)).tolist()
+
+
+def test_members_are_encoded_in_user_id_order():
+    matrix = encode_members(MEMBERS)
+    assert matrix.user_ids.tolist() == [10, 20, 30]
+    assert matrix.levels.shape == (3, 9)
+    assert matrix.languages.tolist() == ["Java", "JavaScript", "Python"]
+
+
+def test_numeric_skills_drive_the_choice():
+    assert best("Diseñar la base de datos", "Esquema SQL en Postgres") == [10]
+    assert best("Pruebas unitarias", "Escribir tests con pytest") == [30]
+    assert best("Despliegue", "Configurar Docker y CI/CD en la nube") == [20]
+
+
+def test_mentioned_stack_matches_language_and_framework():
+    scores = score_members(encode_members(MEMBERS), task_requirements("Vistas en Django"))
+    assert np.argmax(scores) == 2  # user 30
+
+
+def test_ties_resolve_to_lowest_user_id():
+    twins = {7: {"database": 4}, 3: {"database": 4}}
+    assert best("Migración de la base de datos", members=twins) == [3, 7]
+    assert best("Tarea sin palabras clave", members={}) == []
+
+
+def plan_cost(cost, open_tasks, load_weight, members):
+    counts = np.bincount(members, minlength=cost.shape[1])
+    load = sum(o * c + c * (c - 1) / 2 for o, c in zip(open_tasks, counts))
+    return cost[range(len(members)), members].sum() + load_weight * load
+
+
+def test_min_cost_plan_is_optimal():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n_tasks, n_members = rng.integers(1, 6), rng.integers(1, 5)
+        load_weight = rng.choice([0.0, 0.1, 0.5, 2.0])
+        cost = -rng.integers(0, 6, size=(n_tasks, n_members)) / 5
+        open_tasks = rng.integers(0, 4, size=n_members).astype(float)
+
+        members = min_cost_plan(cost, open_tasks, load_weight)
+        best = min(
+            plan_cost(cost, open_tasks, load_weight, np.array(choice))
+            for choice in itertools.product(range(n_members), repeat=n_tasks)
+        )
+        assert plan_cost(cost, open_tasks, load_weight, members) == pytest.approx(best)
+
+
+def test_batch_plan_spreads_load():
+    matrix = encode_members(MEMBERS)
+    requirements = [task_requirements("Pruebas unitarias", "tests con pytest")] * 3
+    # Without load cost every testing task goes to the tester (row 2 = user 30)
+    assert plan_batch(matrix, requirements, np.zeros(3), load_weight=0.0).tolist() == [2, 2, 2]
+    # With it the extra tasks go to the next best members
+    assert sorted(plan_batch(matrix, requirements, np.zeros(3), load_weight=1.0).tolist()) == [0, 1, 2]
+    # An already busy tester loses the tasks
+    assert 2 not in plan_batch(matrix, requirements, np.array([0.0, 0.0, 10.0]), load_weight=1.0).tolist()
+
+
+def test_batch_plan_hundreds_by_hundreds_is_fast():
+    rng = np.random.default_rng(1)
+    members = {i: {s: int(v) for s, v in zip(("database", "testing", "devops", "agile"), rng.integers(1, 6, 4))}
+               for i in range(100)}
+    titles = ["Base de datos SQL", "Pruebas con pytest", "Deploy con Docker", "Planning del sprint"]
+    requirements = [task_requirements(titles[i % 4], f"tarea {i}") for i in range(100)]
+    start = time.perf_counter()
+    rows = plan_batch(encode_members(members), requirements, rng.integers(0, 5, 100).astype(float), 0.15)
+    assert time.perf_counter() - start < 1.0
+    assert len(rows) == 100
+
+
+async def _assign_batch():
+    skills = {s.value: await Skill.create(type=s, name=s.value) for s in SkillType}
+    project = await Project.create(name="P", description="d", telegram_chat_id="1")
+    for user_id, member in MEMBERS.items():
+        await User.create(id=user_id, first_name=str(user_id))
+        await ProjectUser.create(project_id=project.id, user_id=user_id, role=ProjectRole.MEMBER)
+        for name, value in member.items():
+            await UserSkill.create(user_id=user_id, skill_id=skills[name].id, value=str(value))
+    tasks = [
+        await Task.create(custom_id=f"T{i}", name=name, description=desc, deadline=datetime(2030, 1, 1),
+                          project_id=project.id)
+        for i, (name, desc) in enumerate([
+            ("Pruebas unitarias", "tests con pytest"),
+            ("Esquema", "base de datos SQL"),
+            ("Despliegue", "Docker y CI/CD"),
+        ])
+    ]
+    created = max(t.updated_at for t in tasks)
+    plan = await TaskService.assign_users_batch(project.id, [t.id for t in tasks])
+    saved = dict(await Task.filter(project_id=project.id).values_list("id", "assigned_user_id"))
+    # The overdue scan finds reassigned tasks through updated_at
+    touched = await Task.filter(project_id=project.id, updated_at__gt=created).count()
+    return [t.id for t in tasks], plan, saved, touched
+
+
+def test_assign_users_batch_persists_every_assignment(run_in_db):
+    task_ids, plan, saved, touched = run_in_db(_assign_batch)
+    assert plan == saved
+    assert touched == len(task_ids)
+    assert [plan[t] for t in task_ids] == [30, 10, 20]
@@ -0,0 +1,38 @@
+import pytest
+from tortoise.exceptions import DoesNotExist
+
+from app.models.models import Project, ProjectRole, ProjectUser, User
+from app.services.project_service import ProjectService
+
+PROJECT_DATA = {"name": "P", "description": "d", "telegram_chat_id": "-1"}
+
+
+async def _create(member_ids, count_queries=None, users=300):
+    await User.bulk_create([User(id=i, first_name=f"u{i}") for i in range(1, users + 1)])
+    queries = count_queries() if count_queries is not None else []
+
+    try:
+        project = await ProjectService.create_project(dict(PROJECT_DATA), admin_user_id=1, member_ids=member_ids)
+    except DoesNotExist as e:
+        return e, await Project.all().count()
+    members = await ProjectUser.filter(project_id=project.id).order_by("user_id").values_list("user_id", "role")
+    return members, len(queries)
+
+
+def test_members_are_added_once_and_the_admin_keeps_its_role(run_in_db):
+    members, _ = run_in_db(_create, [2, 3, 2, 1])
+    assert members == [(1, ProjectRole.ADMIN), (2, ProjectRole.MEMBER), (3, ProjectRole.MEMBER)]
+
+
+def test_missing_members_are_listed_and_nothing_is_created(run_in_db):
+    error, projects = run_in_db(_create, [2, 404, 3, 405])
+    assert isinstance(error, DoesNotExist)
+    assert "[404, 405]" in str(error)
+    assert projects == 0
+
+
+def test_query_count_does_not_grow_with_members(run_in_db, count_queries):
+    _, small = run_in_db(_create, [2], count_queries)
+    members, large = run_in_db(_create, list(range(2, 301)), count_queries)
+    assert len(members) == 300
+    assert small == large
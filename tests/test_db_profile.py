@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from app.models.db import TUNED_SQLITE_PRAGMAS, WRITE_CONNECTION, build_tortoise_config
+from app.models.models import Project
+
+
+def test_default_profile_is_a_single_connection():
+    config = build_tortoise_config("sqlite://db.sqlite3")
+    assert list(config["connections"]) == ["default"]
+    assert "routers" not in config
+    assert "profile" not in config["connections"]["default"]["credentials"]
+
+
+def test_tuned_profile_adds_pragmas_and_read_connections():
+    config = build_tortoise_config("sqlite:///tmp/app.sqlite3?profile=tuned&read_connections=3&cache_size=-1000")
+    assert list(config["connections"]) == ["default", "read_0", "read_1", "read_2"]
+    writer = config["connections"]["default"]["credentials"]
+    assert writer["synchronous"] == "NORMAL" and writer["busy_timeout"] == TUNED_SQLITE_PRAGMAS["busy_timeout"]
+    assert writer["cache_size"] == "-1000"  # The URL wins over the profile
+    assert "query_only" not in writer
+    assert config["connections"]["read_0"]["credentials"]["query_only"] == "ON"
+    assert config["routers"] == ["app.models.db.ReadWriteRouter"]
+
+
+def test_tuned_profile_keeps_memory_databases_on_one_connection():
+    assert list(build_tortoise_config("sqlite://:memory:?profile=tuned")["connections"]) == ["default"]
+
+
+def test_invalid_profiles():
+    with pytest.raises(ValueError):
+        build_tortoise_config("sqlite://db.sqlite3?profile=fast")
+    with pytest.raises(ValueError):
+        build_tortoise_config("postgres://u:p@localhost:5432/db?profile=tuned")
+
+
+async def _routing(db_path):
+    await Tortoise.init(config=build_tortoise_config(f"sqlite://{db_path}?profile=tuned&read_connections=2"))
+    try:
+        await Tortoise.generate_schemas()
+        writer = Tortoise.get_connection("default")
+        synchronous = (await writer.execute_query_dict("PRAGMA synchronous"))[0]["synchronous"]
+
+        await Project.create(name="P", description="d", telegram_chat_id="1")
+        readers = {Project.filter()._choose_db().connection_name for _ in range(4)}
+        committed = await Project.filter(name="P").exists()
+
+        async with in_transaction(WRITE_CONNECTION):
+            await Project.create(name="Q", description="d", telegram_chat_id="2")
+            own_write = await Project.filter(name="Q").exists()
+        return synchronous, readers, committed, own_write
+    finally:
+        await Tortoise.close_connections()
+
+
+def test_reads_go_to_read_connections_except_inside_transactions(tmp_path):
+    synchronous, readers, committed, own_write = asyncio.run(_routing(tmp_path / "db.sqlite3"))
+    assert synchronous == 1  # NORMAL
+    assert readers == {"read_0", "read_1"}
+    assert committed and own_write
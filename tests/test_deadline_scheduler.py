@@ -0,0 +1,116 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from tortoise.transactions import atomic
+
+from app.models.db import WRITE_CONNECTION
+from app.models.models import Project, ProjectRole, ProjectUser, TaskStatus, User
+from app.models.write_queue import with_commit_hooks
+from app.scheduler.deadlines import DeadlineScheduler, deadline_scheduler
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+
+
+def at(seconds):
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def test_due_tasks_come_out_in_deadline_order():
+    scheduler = DeadlineScheduler(clock=lambda: 0)
+    scheduler.schedule(1, at(30))
+    scheduler.schedule(2, at(10))
+    scheduler.schedule(3, at(20))
+    assert scheduler.next_deadline() == 10
+    assert scheduler.pop_due(now=25) == [2, 3]
+    assert scheduler.pop_due(now=25) == []
+    assert len(scheduler) == 1
+
+
+def test_rescheduled_and_cancelled_tasks_drop_their_old_entries():
+    scheduler = DeadlineScheduler(clock=lambda: 0)
+    scheduler.schedule(1, at(10))
+    scheduler.schedule(2, at(10))
+    scheduler.schedule(1, at(50))
+    scheduler.cancel(2)
+    assert scheduler.next_deadline() == 50
+    assert scheduler.pop_due(now=40) == []
+    assert scheduler.pop_due(now=50) == [1]
+
+
+async def _fire_on_time():
+    scheduler = DeadlineScheduler()
+    fired = []
+
+    async def on_due(task_ids):
+        fired.append((task_ids, time.time()))
+
+    scheduler.start(on_due)
+    try:
+        start = time.time()
+        scheduler.schedule(1, at(start + 0.3))
+        await asyncio.sleep(0.05)
+        scheduler.schedule(2, at(start + 0.1))  # earlier than the current head
+        await asyncio.sleep(0.4)
+        return start, fired
+    finally:
+        await scheduler.stop()
+
+
+def test_runner_fires_when_each_deadline_passes():
+    start, fired = asyncio.run(_fire_on_time())
+    assert [ids for ids, _ in fired] == [[2], [1]]
+    assert 0.1 <= fired[0][1] - start < 0.2
+    assert 0.3 <= fired[1][1] - start < 0.4
+
+
+async def _task_hooks():
+    await deadline_scheduler.load()
+    project = await Project.create(name="P", description="d", telegram_chat_id="1")
+    deadline = datetime.now(timezone.utc) + timedelta(days=1)
+    first = await TaskService.create_task({"name": "a", "deadline": deadline, "project_id": project.id})
+    second = await TaskService.create_task({"name": "b", "deadline": deadline, "project_id": project.id})
+    created = len(deadline_scheduler)
+
+    await TaskService.update_task(first.id, deadline=deadline + timedelta(days=1))
+    await TaskService.update_task(second.id, status=TaskStatus.DONE)
+    after_done = len(deadline_scheduler)
+    moved = deadline_scheduler.next_deadline() == (deadline + timedelta(days=1)).timestamp()
+
+    await TaskService.delete_tasks_by_project(project.id)
+    after_delete = len(deadline_scheduler)
+
+    await TaskService.create_task({"name": "c", "deadline": deadline, "project_id": project.id})
+    reloaded = await deadline_scheduler.load()
+    return created, after_done, moved, after_delete, reloaded
+
+
+def test_task_service_keeps_the_scheduler_current(run_in_db):
+    assert run_in_db(_task_hooks) == (2, 1, True, 0, 1)
+
+
+async def _rolled_back_project_delete():
+    await deadline_scheduler.load()
+    await User.create(id=1, first_name="A")
+    project = await Project.create(name="P", description="d", telegram_chat_id="1")
+    await ProjectUser.create(project=project, user_id=1, role=ProjectRole.ADMIN)
+    deadline = datetime.now(timezone.utc) + timedelta(days=1)
+    await TaskService.create_task({"name": "a", "deadline": deadline, "project_id": project.id})
+
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
+    async def delete_then_fail():
+        await ProjectService.delete_project(project.id, 1)
+        raise RuntimeError("rollback")
+
+    with pytest.raises(RuntimeError):
+        await delete_then_fail()
+    tracked = len(deadline_scheduler)
+
+    await ProjectService.delete_project(project.id, 1)
+    return tracked, len(deadline_scheduler)
+
+
+def test_project_deletes_only_cancel_deadlines_once_committed(run_in_db):
+    assert run_in_db(_rolled_back_project_delete) == (1, 0)
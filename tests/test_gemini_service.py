@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services.gemini_service import GeminiService
+
+
+class SlowModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(text=" AYUDA ")
+
+
+def make_service(latency: float, max_concurrency: int, timeout: float = 5) -> GeminiService:
+    llm = GeminiService(api_key="test", model="test", max_concurrency=max_concurrency, timeout=timeout)
+    llm.client = SimpleNamespace(aio=SimpleNamespace(models=SlowModels(latency)))
+    return llm
+
+
+def test_concurrent_calls_overlap_up_to_the_pool_size():
+    async def run():
+        llm = make_service(latency=0.05, max_concurrency=3)
+        results = await asyncio.gather(*(llm.detect_intent("{user_message}", "hola") for _ in range(9)))
+        return llm.client.aio.models.peak, results
+
+    peak, results = asyncio.run(run())
+    assert peak == 3
+    assert results == ["ayuda"] * 9
+
+
+def test_timeout_returns_none_and_releases_the_slot():
+    async def run():
+        llm = make_service(latency=1, max_concurrency=1, timeout=0.01)
+        first = await llm.detect_intent("{user_message}", "hola")
+        llm.client.aio.models.latency = 0
+        second = await llm.detect_intent("{user_message}", "hola")
+        return first, second
+
+    assert asyncio.run(run()) == (None, "ayuda")
@@ -0,0 +1,82 @@
+import asyncio
+
+from app.bot.handlers.llm.intent_classifier import IntentClassifier, normalize_message
+from app.utils.cache import TTLCache
+
+
+class FakeLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    async def detect_intent(self, text, intent_prompt):
+        self.calls += 1
+        return self.answer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_message():
+    assert normalize_message("?  Quiero ACTUALIZAR mis habilidádes!! ") == "quiero actualizar mis habilidades"
+    assert normalize_message("¿Ayuda, por favor?") == normalize_message("ayuda por favor")
+
+
+def test_cache_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_reports_the_entries_it_drops():
+    clock = FakeClock()
+    evicted = []
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock, on_evict=lambda key, value: evicted.append((key, value)))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    cache.pop("b")
+
+    clock.now = 11
+    assert cache.get("c") is None
+    assert evicted == [("a", 1), ("c", 3)]
+
+
+def test_classifier_calls_llm_once_per_normalized_message():
+    llm = FakeLLM("actualizar_habilidades")
+    classifier = IntentClassifier(llm)
+
+    async def run():
+        first = await classifier.classify("? Quiero actualizar mis habilidades")
+        second = await classifier.classify("?quiero   actualizar mis HABILIDADES.")
+        return first, second
+
+    assert asyncio.run(run()) == ("actualizar_habilidades", "actualizar_habilidades")
+    assert llm.calls == 1
+    assert classifier.cache.stats()["hits"] == 1
+
+
+def test_classifier_does_not_cache_llm_failures():
+    llm = FakeLLM(None)
+    classifier = IntentClassifier(llm)
+
+    async def run():
+        return [await classifier.classify("? hola") for _ in range(2)]
+
+    assert asyncio.run(run()) == ["ayuda", "ayuda"]
+    assert llm.calls == 2
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from app.bot.handlers.llm.local_classifier import LocalIntentClassifier
+from app.bot.handlers.llm.nlp_handler import NLPHandler
+from app.config import settings
+
+
+class FakeLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    async def detect_intent(self, text, intent_prompt):
+        self.calls += 1
+        return self.answer
+
+
+def test_predicts_common_phrasings_with_high_confidence():
+    classifier = LocalIntentClassifier()
+    cases = {
+        "? quiero actualizar mis habilidades": "actualizar_habilidades",
+        "? regístrame": "registro",
+        "crea un proyecto llamado Agenda con @ana": "crear_proyecto_nlp",
+        "agrega la tarea T1 diseñar la base de datos": "agregar_tarea_nlp",
+        "? ayuda": "ayuda",
+    }
+    for message, expected in cases.items():
+        intent, confidence = classifier.predict(message)
+        assert intent == expected, message
+        assert confidence >= 0.8, message
+
+
+def test_out_of_domain_messages_are_low_confidence():
+    classifier = LocalIntentClassifier()
+    for message in ("que tal el clima", "quiero ver mis proyectos", ""):
+        assert classifier.predict(message)[1] < 0.8
+
+
+def test_prediction_is_sub_millisecond():
+    classifier = LocalIntentClassifier()
+    start = time.perf_counter()
+    for _ in range(200):
+        classifier.predict("@bot agrega la tarea T4 desplegar en la nube el viernes")
+    assert (time.perf_counter() - start) / 200 < 0.001
+
+
+def test_handler_only_asks_the_llm_on_low_confidence(monkeypatch):
+    monkeypatch.setattr(settings, "NLP_COMBINED_MODE", False)
+    llm = FakeLLM("ayuda")
+    handler = NLPHandler(llm)
+
+    async def run():
+        confident = await handler.classify("? quiero actualizar mis habilidades")
+        unsure = await handler.classify("que tal el clima")
+        return confident, unsure
+
+    assert asyncio.run(run()) == (("actualizar_habilidades", None), ("ayuda", None))
+    assert llm.calls == 1
@@ -0,0 +1,199 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.bot.handlers.jobs import check_overdue_tasks
+from app.config import settings
+from app.models.models import Project, ProjectRole, ProjectUser, Task, TaskNotification, TaskStatus, User
+from app.scheduler.state import OVERDUE_SCAN, get_watermark, set_watermark
+from app.services.llm_registry import LLM_REGISTRY_KEY
+from app.services.notification_service import escalation_level
+
+
+class FakeLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.contexts = []
+
+    async def summarize_overdue_project(self, context):
+        self.contexts.append(context)
+        return self.answer
+
+
+class FakeBot:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.messages.append((chat_id, text))
+
+
+async def _run_job(llm):
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    await User.create(id=1, username="ana_dev", first_name="Ana")
+    await User.create(id=2, first_name="Luis")
+    for chat_id, overdue in ((100, 3), (200, 1)):
+        project = await Project.create(name=f"P{chat_id}", description="d", telegram_chat_id=str(chat_id))
+        await ProjectUser.create(project_id=project.id, user_id=1, role=ProjectRole.ADMIN)
+        await ProjectUser.create(project_id=project.id, user_id=2, role=ProjectRole.MEMBER)
+        for i in range(overdue):
+            await Task.create(custom_id=f"T{i}", name=f"Tarea {i}", deadline=past,
+                              project_id=project.id, assigned_user_id=1 + i % 2)
+        await Task.create(custom_id="OK", name="A tiempo", deadline=future, project_id=project.id)
+        await Task.create(custom_id="DONE", name="Hecha", deadline=past, project_id=project.id,
+                          status=TaskStatus.DONE)
+
+    bot = FakeBot()
+    registry = SimpleNamespace(get=lambda: llm)
+    await check_overdue_tasks(SimpleNamespace(bot=bot, bot_data={LLM_REGISTRY_KEY: registry}))
+    return bot.messages
+
+
+def test_one_llm_call_and_one_message_per_project(run_in_db):
+    llm = FakeLLM("resumen")
+    messages = run_in_db(_run_job, llm)
+    assert sorted(messages) == [(100, "resumen"), (200, "resumen")]
+    assert sorted(c["overdue_count"] for c in llm.contexts) == ["1", "3"]
+    context = next(c for c in llm.contexts if c["overdue_count"] == "3")
+    assert "OK" not in context["overdue_tasks"] and "DONE" not in context["overdue_tasks"]
+    assert "@ana_dev (admin) | 2 tareas abiertas" in context["team_members"]
+
+
+def test_template_fallback_when_the_llm_fails(run_in_db):
+    messages = dict(run_in_db(_run_job, FakeLLM(None)))
+    assert "3 tarea(s) atrasada(s)" in messages[100]
+    assert "@ana\\_dev" in messages[100] and "Luis" in messages[100]
+    assert "T2" in messages[100] and "A tiempo" not in messages[100]
+
+
+def test_escalation_levels():
+    now = datetime(2025, 1, 10, tzinfo=timezone.utc)
+    assert escalation_level(now - timedelta(hours=1), now, [0, 24, 72]) == 1
+    assert escalation_level(now - timedelta(hours=30), now, [0, 24, 72]) == 2
+    assert escalation_level(now - timedelta(days=5), now, [0, 24, 72]) == 3
+
+
+async def _run_job_twice(llm, change=None):
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    project = await Project.create(name="P", description="d", telegram_chat_id="100")
+    task = await Task.create(custom_id="T1", name="Tarea", deadline=past, project_id=project.id)
+    await Task.create(custom_id="T2", name="Otra", deadline=past, project_id=project.id)
+
+    bot = FakeBot()
+    context = SimpleNamespace(bot=bot, bot_data={LLM_REGISTRY_KEY: SimpleNamespace(get=lambda: llm)})
+    await check_overdue_tasks(context)
+    if change:
+        await change(task)
+    await check_overdue_tasks(context)
+    return bot.messages, len(llm.contexts[-1]["overdue_tasks"].splitlines())
+
+
+def test_unchanged_tasks_are_not_notified_again(run_in_db):
+    messages, _ = run_in_db(_run_job_twice, FakeLLM("resumen"))
+    assert len(messages) == 1
+
+
+def test_changed_tasks_are_notified_after_the_cooldown(run_in_db, monkeypatch):
+    monkeypatch.setattr(settings, "OVERDUE_NOTIFY_COOLDOWN", 0)
+
+    async def start(task):
+        task.status = TaskStatus.IN_PROGRESS
+        await task.save()
+
+    messages, lines = run_in_db(_run_job_twice, FakeLLM("resumen"), change=start)
+    assert len(messages) == 2
+    assert lines == 1  # only the changed task
+
+
+def test_cooldown_holds_back_changed_tasks(run_in_db):
+    async def start(task):
+        task.status = TaskStatus.IN_PROGRESS
+        await task.save()
+
+    messages, _ = run_in_db(_run_job_twice, FakeLLM("resumen"), change=start)
+    assert len(messages) == 1
+
+
+async def _count_job_queries(projects, tasks_per_project, count_queries):
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    await User.bulk_create([User(id=i, first_name=f"u{i}") for i in range(1, 6)])
+    for p in range(projects):
+        project = await Project.create(name=f"P{p}", description="d", telegram_chat_id=str(p))
+        await ProjectUser.bulk_create([
+            ProjectUser(project_id=project.id, user_id=i, role=ProjectRole.MEMBER) for i in range(1, 6)
+        ])
+        await Task.bulk_create([
+            Task(custom_id=f"T{i}", name=f"Tarea {i}", deadline=past, project_id=project.id,
+                 assigned_user_id=1 + i % 5)
+            for i in range(tasks_per_project)
+        ])
+
+    queries = count_queries()
+    llm = FakeLLM("resumen")
+    context = SimpleNamespace(bot=FakeBot(), bot_data={LLM_REGISTRY_KEY: SimpleNamespace(get=lambda: llm)})
+    await check_overdue_tasks(context)
+    assert len(context.bot.messages) == projects
+    return len(queries)
+
+
+def test_job_runs_a_constant_number_of_queries(run_in_db, count_queries):
+    small = run_in_db(_count_job_queries, 2, 2, count_queries)
+    large = run_in_db(_count_job_queries, 8, 40, count_queries)
+    assert small == large
+    assert small <= 8
+
+
+async def _run_incremental(llm):
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    project = await Project.create(name="P", description="d", telegram_chat_id="100")
+    await Task.create(custom_id="OLD", name="Vieja", deadline=past - timedelta(days=400), project_id=project.id)
+    context = SimpleNamespace(bot=FakeBot(), bot_data={LLM_REGISTRY_KEY: SimpleNamespace(get=lambda: llm)})
+
+    await check_overdue_tasks(context)
+    first = await get_watermark(OVERDUE_SCAN)
+    await Task.create(custom_id="NEW", name="Nueva", deadline=past, project_id=project.id)
+    await check_overdue_tasks(context)
+    return first, await get_watermark(OVERDUE_SCAN), [c["overdue_tasks"] for c in llm.contexts]
+
+
+def test_scan_resumes_from_the_persisted_watermark(run_in_db, monkeypatch):
+    # Even without a cooldown, tasks behind the watermark aren't read again
+    monkeypatch.setattr(settings, "OVERDUE_NOTIFY_COOLDOWN", 0)
+    first, second, contexts = run_in_db(_run_incremental, FakeLLM("resumen"))
+    assert first is not None and second > first
+    assert len(contexts) == 2
+    assert "OLD" in contexts[0]
+    assert "NEW" in contexts[1] and "OLD" not in contexts[1]
+
+
+async def _run_through_cooldown(llm):
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    project = await Project.create(name="P", description="d", telegram_chat_id="100")
+    task = await Task.create(custom_id="T1", name="Tarea", deadline=past, project_id=project.id)
+    bot = FakeBot()
+    context = SimpleNamespace(bot=bot, bot_data={LLM_REGISTRY_KEY: SimpleNamespace(get=lambda: llm)})
+
+    await check_overdue_tasks(context)
+    task.status = TaskStatus.IN_PROGRESS
+    await task.save()
+    # Within the cooldown: skipped, but the watermark still moves past the change
+    await check_overdue_tasks(context)
+    held_back = len(bot.messages)
+
+    # Two hours go by: move every stored time back instead of waiting
+    shift = timedelta(hours=2)
+    for t in await Task.all():
+        await Task.filter(id=t.id).update(deadline=t.deadline - shift, updated_at=t.updated_at - shift)
+    for state in await TaskNotification.all():
+        await TaskNotification.filter(id=state.id).update(last_notified_at=state.last_notified_at - shift)
+    await set_watermark(OVERDUE_SCAN, await get_watermark(OVERDUE_SCAN) - shift)
+
+    await check_overdue_tasks(context)
+    return held_back, len(bot.messages)
+
+
+def test_changes_held_back_by_the_cooldown_are_sent_after_it(run_in_db, monkeypatch):
+    monkeypatch.setattr(settings, "OVERDUE_NOTIFY_COOLDOWN", 3600)
+    held_back, sent = run_in_db(_run_through_cooldown, FakeLLM("resumen"))
+    assert held_back == 1
+    assert sent == 2
@@ -0,0 +1,77 @@
+import asyncio
+
+from app.models.models import ProjectStatus, User
+from app.services import project_service
+from app.services.project_service import ProjectService, project_cache
+
+
+async def _with_db(body, count_queries=None):
+    project_cache.clear()
+    project_cache.hits = project_cache.misses = 0
+    await User.bulk_create([User(id=1, first_name="Admin")])
+    queries = count_queries() if count_queries is not None else []
+    return await body(queries)
+
+
+async def _create(chat_id="-1"):
+    return await ProjectService.create_project(
+        {"name": "P", "description": "d", "telegram_chat_id": chat_id}, admin_user_id=1
+    )
+
+
+def test_hits_and_missing_chats_are_served_from_the_cache(run_in_db, count_queries):
+    async def body(queries):
+        await _create()
+        start = len(queries)
+        first = await ProjectService.get_project_by_chat_id("-1")
+        second = await ProjectService.get_project_by_chat_id("-1")
+        missing = [await ProjectService.get_project_by_chat_id("-2") for _ in range(3)]
+        return first, second, missing, len(queries) - start
+
+    first, second, missing, queries = run_in_db(_with_db, body, count_queries)
+    assert first.name == second.name == "P"
+    assert missing == [None, None, None]
+    assert queries == 2
+    assert project_cache.stats()["hits"] == 3 and project_cache.stats()["misses"] == 2
+
+
+def test_updates_are_never_served_stale(run_in_db):
+    async def body(_):
+        project = await _create()
+        await ProjectService.get_project_by_chat_id("-1")
+        await ProjectService.get_project_by_chat_id("-9")
+        await ProjectService.update_project(project.id, {"name": "Renamed", "status": ProjectStatus.TERMINATED}, 1)
+        renamed = await ProjectService.get_project_by_chat_id("-1")
+        await ProjectService.update_project(project.id, {"telegram_chat_id": "-9"}, 1)
+        return renamed, await ProjectService.get_project_by_chat_id("-1"), await ProjectService.get_project_by_chat_id("-9")
+
+    renamed, old_chat, new_chat = run_in_db(_with_db, body)
+    assert (renamed.name, renamed.status) == ("Renamed", ProjectStatus.TERMINATED)
+    assert old_chat is None
+    assert new_chat.name == "Renamed"
+
+
+def test_creation_and_deletion_replace_cached_results(run_in_db):
+    async def body(_):
+        before = await ProjectService.get_project_by_chat_id("-1")
+        project = await _create()
+        created = await ProjectService.get_project_by_chat_id("-1")
+        await ProjectService.delete_project(project.id, 1)
+        return before, created, await ProjectService.get_project_by_chat_id("-1")
+
+    before, created, deleted = run_in_db(_with_db, body)
+    assert before is None
+    assert created.name == "P"
+    assert deleted is None
+
+
+def test_reads_during_a_write_are_dropped_after_it():
+    @project_service._invalidates_project_cache
+    async def write():
+        project_service._invalidate_chat("-1")
+        # A concurrent read caches the row before the write commits
+        project_cache.set("-1", "stale")
+        assert project_cache.get("-1") == "stale"
+
+    asyncio.run(write())
+    assert project_cache.get("-1", "gone") == "gone"
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from app.utils.load_prompt import PromptRegistry, PROMPT_PLACEHOLDERS
+
+
+def write(path, text, mtime):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_shipped_prompts_match_their_format_keys():
+    registry = PromptRegistry()
+    registry.load_all()
+    for name, expected in PROMPT_PLACEHOLDERS.items():
+        assert PromptRegistry.get_placeholders(registry.get(name)) == expected
+
+
+def test_load_all_rejects_unknown_placeholders(tmp_path):
+    write(tmp_path / "greet.txt", "Hola {user}", 1000)
+    registry = PromptRegistry(tmp_path, {"greet": {"user_message"}})
+    with pytest.raises(ValueError):
+        registry.load_all()
+
+
+def test_template_is_reloaded_only_when_mtime_changes(tmp_path):
+    path = tmp_path / "greet.txt"
+    write(path, "Hola {user_message}", 1000)
+    registry = PromptRegistry(tmp_path, {"greet": {"user_message"}}, check_interval=0)
+    registry.load_all()
+
+    # Same mtime: the in-memory copy is served
+    write(path, "Adios {user_message}", 1000)
+    assert registry.get("greet") == "Hola {user_message}"
+
+    write(path, "Adios {user_message}", 2000)
+    assert registry.get("greet") == "Adios {user_message}"
+
+    # A broken edit keeps the last valid template
+    write(path, "Adios {usuario}", 3000)
+    assert registry.get("greet") == "Adios {user_message}"
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.models import Project, ProjectRole, ProjectStatus, ProjectUser, Project_Pydantic, Task, TaskStatus, \
+    Task_Pydantic, User
+from app.models.rows import ProjectRow, TaskRow
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+
+
+async def _listings():
+    await User.create(id=1, first_name="Ana")
+    active = await Project.create(name="A", description="d", telegram_chat_id="1")
+    done = await Project.create(name="B", description="d", telegram_chat_id="2", status=ProjectStatus.TERMINATED)
+    await Project.create(name="C", description="d", telegram_chat_id="3")
+    await ProjectUser.bulk_create([
+        ProjectUser(project=active, user_id=1, role=ProjectRole.ADMIN),
+        ProjectUser(project=done, user_id=1, role=ProjectRole.MEMBER),
+    ])
+    deadline = datetime.now(timezone.utc) + timedelta(days=1)
+    await Task.create(custom_id="T1", name="Uno", project=active, deadline=deadline, assigned_user_id=1)
+    await Task.create(custom_id="T2", name="Dos", project=active, deadline=deadline, status=TaskStatus.DONE)
+    await Task.create(custom_id="T1", name="Otra", project=done, deadline=deadline)
+
+    tasks = await TaskService.get_tasks_by_project(active.id)
+    expected = [await Task_Pydantic.from_tortoise_orm(task) for task in await Task.filter(project=active)]
+    by_user = await ProjectService.get_projects_by_user(1)
+    by_status = await ProjectService.get_projects_by_status(ProjectStatus.TERMINATED)
+    expected_project = await Project_Pydantic.from_tortoise_orm(done)
+    return tasks, expected, by_user, by_status, expected_project
+
+
+def test_rows_carry_the_same_data_as_the_pydantic_models(run_in_db):
+    tasks, expected, by_user, by_status, expected_project = run_in_db(_listings)
+
+    assert all(isinstance(task, TaskRow) for task in tasks)
+    assert [task.custom_id for task in tasks] == ["T1", "T2"]
+    assert tasks[0].status is TaskStatus.ASSIGNED and tasks[0].assigned_user_id == 1
+    assert [Task_Pydantic.model_validate(task) for task in tasks] == expected
+
+    assert sorted(project.name for project in by_user) == ["A", "B"]
+    assert [type(project) for project in by_status] == [ProjectRow]
+    assert Project_Pydantic.model_validate(by_status[0]) == expected_project
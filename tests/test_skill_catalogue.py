@@ -0,0 +1,51 @@
+import pytest
+
+from app.models.models import Skill, SkillType, User, UserSkill
+from app.services.skill_service import skill_catalogue
+from app.services.survey_service import save_user_skill_by_question_key
+
+
+async def _with_catalogue(body, count_queries):
+    # A catalogue row created before the seeding existed
+    await Skill.create(name=SkillType.DEVOPS.value, type=SkillType.DEVOPS)
+    await User.create(id=1, first_name="Ana")
+    await skill_catalogue.load()
+    return await body(count_queries())
+
+
+def test_seeding_is_idempotent(run_in_db, count_queries):
+    async def body(_):
+        first = dict(skill_catalogue._ids)
+        second = await skill_catalogue.load()
+        return first, second, await Skill.all().count()
+
+    first, second, rows = run_in_db(_with_catalogue, body, count_queries)
+    assert first == second
+    assert set(first) == set(SkillType)
+    assert rows == len(SkillType)
+
+
+def test_survey_answers_are_one_upsert(run_in_db, count_queries):
+    async def body(queries):
+        start = len(queries)
+        await save_user_skill_by_question_key(1, "language", "Python")
+        writes = len(queries) - start
+        await save_user_skill_by_question_key(1, "language", "Go")
+        await save_user_skill_by_question_key(1, "devops", "Docker", update_existing=False)
+        await save_user_skill_by_question_key(1, "devops", "K8s", update_existing=False)
+        return writes, await UserSkill.filter(user_id=1).order_by("skill__name").values_list("skill__name", "value")
+
+    writes, answers = run_in_db(_with_catalogue, body, count_queries)
+    assert writes == 1
+    assert answers == [("devops", "Docker"), ("language", "Go")]
+
+
+def test_unknown_users_and_keys_are_rejected(run_in_db, count_queries):
+    async def body(_):
+        with pytest.raises(ValueError):
+            await save_user_skill_by_question_key(404, "language", "Python")
+        with pytest.raises(ValueError):
+            await save_user_skill_by_question_key(1, "cooking", "Paella")
+        return await UserSkill.all().count()
+
+    assert run_in_db(_with_catalogue, body, count_queries) == 0
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from tortoise.transactions import atomic
+
+from app.models.db import WRITE_CONNECTION
+from app.models.models import ProjectUser, SubscriptionType, User
+from app.models.write_queue import with_commit_hooks
+from app.services import survey_service, user_service
+from app.services.assignment_service import AssignmentService, ProjectSkillMatrices, skill_matrices
+from app.services.project_service import ProjectService
+from app.services.skill_service import SkillService, skill_catalogue
+from app.services.survey_service import save_survey_profile, save_user_skill_by_question_key
+from app.services.user_registry import UserRegistry
+
+ADMIN, TESTER, DBA, NEWCOMER = 1, 2, 3, 4
+
+
+async def _with_project(body, monkeypatch, count_queries):
+    skill_matrices.clear()
+    registry = UserRegistry()
+    for module in (survey_service, user_service):
+        monkeypatch.setattr(module, "user_registry", registry)
+
+    await skill_catalogue.load()
+    await User.bulk_create([
+        User(id=user_id, first_name=str(user_id), subscription_type=SubscriptionType.PREMIUM)
+        for user_id in (ADMIN, TESTER, DBA, NEWCOMER)
+    ])
+    for user_id, answers in {
+        TESTER: {"testing": "5", "database": "1"},
+        DBA: {"testing": "2", "database": "5"},
+        NEWCOMER: {"testing": "1", "database": "1", "devops": "5"},
+    }.items():
+        await save_survey_profile(user_id, None, str(user_id), answers)
+    project = await ProjectService.create_project(
+        {"name": "P", "description": "d", "telegram_chat_id": "-1"}, ADMIN, [TESTER, DBA]
+    )
+    return await body(project.id, count_queries())
+
+
+def _assign(project_id, title):
+    return AssignmentService.assign_task(project_id, title, None)
+
+
+def test_assignment_reads_the_matrix_after_the_first_build(run_in_db, monkeypatch, count_queries):
+    async def body(project_id, queries):
+        first = await _assign(project_id, "Pruebas con pytest")
+        start = len(queries)
+        picks = [await _assign(project_id, "Pruebas con pytest"), await _assign(project_id, "Esquema SQL")]
+        return first, picks, len(queries) - start
+
+    first, picks, queries = run_in_db(_with_project, body, monkeypatch, count_queries)
+    assert first == TESTER
+    assert picks == [TESTER, DBA]
+    assert queries == 0
+
+
+def test_membership_changes_update_the_cached_rows(run_in_db, monkeypatch, count_queries):
+    async def body(project_id, queries):
+        before = (await skill_matrices.get(project_id)).user_ids.tolist()
+        await ProjectService.add_member_to_project(project_id, NEWCOMER, ADMIN)
+        added = await skill_matrices.get(project_id)
+        deploy = await _assign(project_id, "Despliegue con Docker")
+        await ProjectService.remove_member_from_project(project_id, TESTER, ADMIN)
+        removed = (await skill_matrices.get(project_id)).user_ids.tolist()
+        return before, added, deploy, removed
+
+    before, added, deploy, removed = run_in_db(_with_project, body, monkeypatch, count_queries)
+    assert before == [ADMIN, TESTER, DBA]
+    assert added.user_ids.tolist() == [ADMIN, TESTER, DBA, NEWCOMER]
+    assert len(added.levels) == len(added.languages) == 4
+    assert deploy == NEWCOMER
+    assert removed == [ADMIN, DBA, NEWCOMER]
+
+
+def test_rolled_back_membership_changes_leave_the_matrix_alone(run_in_db, monkeypatch, count_queries):
+    @with_commit_hooks
+    @atomic(WRITE_CONNECTION)
+    async def add_then_fail(project_id):
+        await ProjectService.add_member_to_project(project_id, NEWCOMER, ADMIN)
+        raise RuntimeError("rollback")
+
+    async def body(project_id, queries):
+        await skill_matrices.get(project_id)
+        with pytest.raises(RuntimeError):
+            await add_then_fail(project_id)
+        members = await ProjectUser.filter(project_id=project_id).count()
+        return (await skill_matrices.get(project_id)).user_ids.tolist(), members
+
+    user_ids, members = run_in_db(_with_project, body, monkeypatch, count_queries)
+    assert user_ids == [ADMIN, TESTER, DBA]
+    assert members == 3
+
+
+def test_survey_updates_change_the_levels(run_in_db, monkeypatch, count_queries):
+    async def body(project_id, queries):
+        await skill_matrices.get(project_id)
+        await save_survey_profile(DBA, None, "3", {"testing": "5", "language": "JavaScript"})
+        await save_user_skill_by_question_key(TESTER, "testing", "1")
+        start = len(queries)
+        matrix = await skill_matrices.get(project_id)
+        pick = await _assign(project_id, "Pruebas con pytest")
+        reads = len(queries) - start
+
+        # Answers that may not have been written drop the cached matrix instead
+        await save_user_skill_by_question_key(DBA, "devops", "4", update_existing=False)
+        return matrix, pick, reads, len(skill_matrices)
+
+    matrix, pick, reads, cached = run_in_db(_with_project, body, monkeypatch, count_queries)
+    assert matrix.languages.tolist() == ["", "", "JavaScript"]
+    assert pick == DBA
+    assert reads == 0
+    assert cached == 0
+
+
+def test_evicted_projects_take_their_answers_with_them(monkeypatch):
+    members = {1: {ADMIN: {}, TESTER: {"testing": 5}}, 2: {ADMIN: {}, DBA: {"database": 5}}}
+
+    async def get_user_skills_by_project(project_id):
+        return {user_id: dict(skills) for user_id, skills in members[project_id].items()}
+
+    async def body():
+        matrices = ProjectSkillMatrices(maxsize=1)
+        await matrices.get(1)
+        matrices.update_skills(TESTER, {"testing": "4", "language": "Python"})
+        updated = matrices.skills_of(1, [TESTER])
+        await matrices.get(2)
+        linked = {user_id: set(projects) for user_id, projects in matrices._projects_by_user.items()}
+        matrices.drop(2)
+        return updated, linked, matrices._projects_by_user
+
+    monkeypatch.setattr(SkillService, "get_user_skills_by_project", get_user_skills_by_project)
+    updated, linked, dropped = asyncio.run(body())
+    assert updated == {TESTER: {"testing": 4, "language": "Python"}}
+    assert linked == {ADMIN: {2}, DBA: {2}}
+    assert dropped == {}
@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.bot.handlers.llm.intent_classifier import IntentClassifier
+from app.services.gemini_service import GeminiService, parse_json_response
+from app.services.nlp_schemas import IntentParams, ProjectParams
+
+
+class ScriptedModels:
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls.append(config)
+        return SimpleNamespace(text=self.text)
+
+
+def make_llm(text):
+    llm = GeminiService(api_key="test", model="test")
+    llm.client = SimpleNamespace(aio=SimpleNamespace(models=ScriptedModels(text)))
+    return llm
+
+
+def test_parse_json_response_accepts_code_fences():
+    fenced = '```json\n{"nombre": "Agenda", "descripcion": null, "miembros": ["@ana", "beto"]}\n```'
+    params = parse_json_response(fenced, ProjectParams)
+    assert params.nombre == "Agenda"
+    assert params.miembros == ["ana", "beto"]
+
+
+def test_combined_mode_returns_intent_and_params_in_one_call():
+    llm = make_llm(
+        '{"intent": "agregar_tarea_nlp", "proyecto": null, '
+        '"tarea": {"identificador": "T1", "nombre": "Login", "descripcion": null, "deadline": "2025-06-01 12:00"}}'
+    )
+    classifier = IntentClassifier(llm)
+
+    intent, params = asyncio.run(classifier.classify_with_params("agrega la tarea T1 Login para el 1 de junio"))
+
+    assert intent == "agregar_tarea_nlp"
+    assert params == {"identificador": "T1", "nombre": "Login", "descripcion": None, "deadline": "2025-06-01 12:00"}
+    calls = llm.client.aio.models.calls
+    assert len(calls) == 1
+    assert calls[0].response_schema is IntentParams
+
+
+def test_invalid_structured_response_falls_back_to_help():
+    classifier = IntentClassifier(make_llm("no es json"))
+    assert asyncio.run(classifier.classify_with_params("algo raro")) == ("ayuda", None)
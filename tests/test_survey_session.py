@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+from telegram.constants import ChatType
+
+from app.bot.handlers import register_handler
+from app.bot.handlers.register_handler import RETRY_SAVE_KEY, handle_survey_response, registro_command, survey, \
+    survey_sessions
+from app.bot.handlers.update_handler import actualizar_habilidades_command
+from app.models.models import SubscriptionType, User, UserSkill
+from app.services import survey_service, user_service
+from app.services.skill_service import skill_catalogue
+from app.services.user_registry import UserRegistry
+
+USER_ID = 7
+
+
+class FakeBot:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, chat_id, text, reply_markup=None, parse_mode=None):
+        self.messages.append(text)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _reply(text):
+    pass
+
+
+async def _answer():
+    pass
+
+
+def _command():
+    user = SimpleNamespace(id=USER_ID, username="Ana_Dev", first_name="Ana")
+    return SimpleNamespace(
+        effective_chat=SimpleNamespace(id=USER_ID, type=ChatType.PRIVATE),
+        effective_user=user,
+        message=SimpleNamespace(reply_text=_reply),
+    )
+
+
+def _button(key, value):
+    return SimpleNamespace(callback_query=SimpleNamespace(
+        answer=_answer, data=f"{key}|{value}", message=SimpleNamespace(chat_id=USER_ID)
+    ))
+
+
+async def _with_db(body, monkeypatch, count_queries):
+    survey_sessions.clear()
+    clock = FakeClock()
+    monkeypatch.setattr(survey_sessions, "_clock", clock)
+    registry = UserRegistry()
+    for module in (register_handler, survey_service, user_service):
+        monkeypatch.setattr(module, "user_registry", registry)
+
+    await skill_catalogue.load()
+    await registry.load()
+    context = SimpleNamespace(bot=FakeBot())
+    return await body(context, clock, count_queries(), registry)
+
+
+def test_answers_are_saved_together_at_the_end(run_in_db, monkeypatch, count_queries):
+    async def body(context, clock, queries, registry):
+        await registro_command(_command(), context)
+        for question in survey[:-1]:
+            await handle_survey_response(_button(question["key"], question["options"][0]), context)
+        during = len(queries)
+        await handle_survey_response(_button(survey[-1]["key"], survey[-1]["options"][-1]), context)
+        saved = len(queries) - during
+
+        user = await User.get(id=USER_ID)
+        skills = await UserSkill.filter(user_id=USER_ID).count()
+        return during, saved, (user.username, user.subscription_type), skills, await registry.is_registered(USER_ID)
+
+    during, saved, user, skills, registered = run_in_db(_with_db, body, monkeypatch, count_queries)
+    assert during == 0
+    assert saved <= 2
+    assert user == ("ana_dev", SubscriptionType.FREE)
+    assert skills == len(survey)
+    assert registered
+
+
+def test_abandoned_surveys_expire_without_writes(run_in_db, monkeypatch, count_queries):
+    async def body(context, clock, queries, registry):
+        await registro_command(_command(), context)
+        await handle_survey_response(_button(survey[0]["key"], "Python"), context)
+        clock.now += survey_sessions.ttl + 1
+        for question in survey[1:]:
+            await handle_survey_response(_button(question["key"], question["options"][0]), context)
+        return len(queries), len(survey_sessions), await User.all().count()
+
+    queries, sessions, users = run_in_db(_with_db, body, monkeypatch, count_queries)
+    assert queries == 0
+    assert sessions == 0
+    assert users == 0
+
+
+def test_updating_skills_keeps_the_subscription(run_in_db, monkeypatch, count_queries):
+    async def body(context, clock, queries, registry):
+        await User.create(id=USER_ID, username="ana_dev", first_name="Ana", subscription_type=SubscriptionType.PREMIUM)
+        await registry.load()
+        await actualizar_habilidades_command(_command(), context)
+        # Pressing an old button again doesn't skip questions
+        await handle_survey_response(_button(survey[0]["key"], "Java"), context)
+        await handle_survey_response(_button(survey[0]["key"], "PHP"), context)
+        for question in survey[1:]:
+            await handle_survey_response(_button(question["key"], question["options"][1]), context)
+        language = await UserSkill.get(user_id=USER_ID, skill__name="language").values_list("value", flat=True)
+        return (await User.get(id=USER_ID)).subscription_type, await registry.get_subscription(USER_ID), language
+
+    stored, cached, language = run_in_db(_with_db, body, monkeypatch, count_queries)
+    assert stored == cached == SubscriptionType.PREMIUM
+    assert language == "Java"
+
+
+def test_a_failed_save_keeps_the_answers_for_a_retry(run_in_db, monkeypatch, count_queries):
+    save = register_handler.save_survey_profile
+    failures = [OSError("disk full")]
+
+    async def flaky_save(*args):
+        if failures:
+            raise failures.pop()
+        return await save(*args)
+
+    async def body(context, clock, queries, registry):
+        monkeypatch.setattr(register_handler, "save_survey_profile", flaky_save)
+        await registro_command(_command(), context)
+        for question in survey:
+            await handle_survey_response(_button(question["key"], question["options"][0]), context)
+        failed = context.bot.messages[-1]
+        kept = len(survey_sessions)
+
+        await handle_survey_response(_button(RETRY_SAVE_KEY, ""), context)
+        skills = await UserSkill.filter(user_id=USER_ID).count()
+        return failed, kept, skills, len(survey_sessions)
+
+    failed, kept, skills, sessions = run_in_db(_with_db, body, monkeypatch, count_queries)
+    assert failed.startswith("❌")
+    assert kept == 1
+    assert skills == len(survey)
+    assert sessions == 0
@@ -0,0 +1,87 @@
+import pytest
+
+from app.bot.handlers.talent_handler import parse_talent_query
+from app.models.models import SkillType, User
+from app.services import survey_service, user_service
+from app.services.skill_service import skill_catalogue
+from app.services.survey_service import save_survey_profile, save_user_skill_by_question_key
+from app.services.talent_index import TalentIndex, TalentQuery
+from app.services.user_registry import UserRegistry
+
+SKILLS = {
+    1: [("database", 5), ("framework", "Django"), ("testing", 2)],
+    2: [("database", 4), ("framework", "django"), ("testing", 5)],
+    3: [("database", 4), ("framework", "Django"), ("testing", 5)],
+    4: [("database", 3), ("framework", "Django"), ("testing", 5)],
+    5: [("database", 5), ("framework", "Laravel"), ("testing", 5)],
+    6: [("database", "alto"), ("language", "Python")],
+}
+
+
+def _index():
+    index = TalentIndex()
+    index.build(SKILLS)
+    return index
+
+
+def test_filters_and_ordering():
+    index = _index()
+    query = TalentQuery(
+        min_levels={SkillType.DATABASE: 4}, equals={SkillType.FRAMEWORK: "DJANGO"}, order_by=SkillType.TESTING
+    )
+    assert index.search(query) == [2, 3, 1]
+    query.limit = 2
+    assert index.search(query) == [2, 3]
+    assert index.search(TalentQuery(min_levels={SkillType.DATABASE: 1})) == [1, 2, 3, 4, 5]
+    assert index.search(TalentQuery(equals={SkillType.FRAMEWORK: "Flask"})) == []
+    assert index.profile(6) == {"language": "Python"}
+    with pytest.raises(ValueError):
+        index.search(TalentQuery(order_by=SkillType.FRAMEWORK))
+
+
+def test_updates_are_searchable_without_a_rebuild():
+    index = _index()
+    index.update(7, {"database": "5", "framework": "Django", "testing": "4"})
+    index.update(1, {"testing": "5"})
+    index.update(2, {"database": "1"}, overwrite=False)
+    index.update(6, {"framework": "Django"}, overwrite=False)
+
+    query = TalentQuery(min_levels={SkillType.DATABASE: 4}, equals={SkillType.FRAMEWORK: "Django"},
+                        order_by=SkillType.TESTING)
+    assert index.search(query) == [1, 2, 3, 7]
+    assert len(index) == 7
+    assert index.profile(6) == {"language": "Python", "framework": "Django"}
+
+
+def test_load_reads_the_table_and_skill_writes_refresh_it(run_in_db, monkeypatch):
+    async def body():
+        await skill_catalogue.load()
+        await save_survey_profile(1, "ana", "Ana", {"database": "4", "framework": "Django"})
+        await User.create(id=2, first_name="Luis")
+        loaded = await index.load()
+
+        await save_survey_profile(2, None, "Luis", {"database": "5", "framework": "Django"})
+        await save_user_skill_by_question_key(1, "database", "2")
+        await save_user_skill_by_question_key(1, "testing", "3", update_existing=False)
+        return loaded
+
+    index = TalentIndex()
+    registry = UserRegistry()
+    monkeypatch.setattr(survey_service, "talent_index", index)
+    monkeypatch.setattr(survey_service, "user_registry", registry)
+    monkeypatch.setattr(user_service, "user_registry", registry)
+
+    assert run_in_db(body) == 1
+    assert index.search(TalentQuery(min_levels={SkillType.DATABASE: 4})) == [2]
+    assert index.profile(1) == {"database": 2, "framework": "Django", "testing": 3}
+
+
+def test_command_arguments():
+    query = parse_talent_query('database>=4 framework="React, Angular, Node.js, Express, Vue, etc." orden=testing top=5')
+    assert query.min_levels == {SkillType.DATABASE: 4}
+    assert query.equals == {SkillType.FRAMEWORK: "React, Angular, Node.js, Express, Vue, etc."}
+    assert (query.order_by, query.limit) == (SkillType.TESTING, 5)
+
+    for invalid in ("cooking>=3", "database>=9", "database=4", "framework>=2", "orden=language", "top=0", "django"):
+        with pytest.raises(ValueError):
+            parse_talent_query(invalid)
@@ -0,0 +1,62 @@
+from app.models.models import Project, ProjectRole, ProjectUser, SubscriptionType, User
+from app.services import user_service
+from app.services.user_registry import UserRegistry
+from app.services.user_service import UserService
+
+
+async def _with_users(body, monkeypatch, count_queries, maxsize=100):
+    await User.bulk_create([
+        User(id=1, first_name="Free"),
+        User(id=2, first_name="Premium", subscription_type=SubscriptionType.PREMIUM),
+        User(id=3, first_name="Busy"),
+    ])
+    project = await Project.create(name="P", description="d", telegram_chat_id="1")
+    await ProjectUser.create(project=project, user_id=3, role=ProjectRole.ADMIN)
+
+    registry = UserRegistry(maxsize=maxsize)
+    monkeypatch.setattr(user_service, "user_registry", registry)
+    await registry.load()
+    return await body(registry, count_queries())
+
+
+def test_registration_checks_are_memory_only_after_load(run_in_db, monkeypatch, count_queries):
+    async def body(registry, queries):
+        checks = [await registry.is_registered(user_id) for user_id in (1, 2, 3, 4)]
+        premium = await UserService.can_create_project(2)
+        unregistered = await UserService.can_create_project(4)
+        return checks, premium, unregistered, len(queries)
+
+    checks, premium, unregistered, queries = run_in_db(_with_users, body, monkeypatch, count_queries)
+    assert checks == [True, True, True, False]
+    assert premium is True and unregistered is False
+    assert queries == 0
+
+
+def test_free_users_are_limited_to_one_active_project(run_in_db, monkeypatch, count_queries):
+    async def body(registry, queries):
+        return await UserService.can_create_project(1), await UserService.can_create_project(3)
+
+    assert run_in_db(_with_users, body, monkeypatch, count_queries) == (True, False)
+
+
+def test_writes_update_the_registry(run_in_db, monkeypatch, count_queries):
+    async def body(registry, queries):
+        await UserService.create_or_update_user(9, "nuevo", "Nuevo")
+        await UserService.update_subscription(1, SubscriptionType.PREMIUM)
+        start = len(queries)
+        result = await registry.get_subscription(9), await registry.get_subscription(1)
+        return result, len(queries) - start
+
+    (new_user, upgraded), queries = run_in_db(_with_users, body, monkeypatch, count_queries)
+    assert new_user == SubscriptionType.FREE
+    assert upgraded == SubscriptionType.PREMIUM
+    assert queries == 0
+
+
+def test_a_full_registry_looks_unknown_ids_up(run_in_db, monkeypatch, count_queries):
+    async def body(registry, queries):
+        return registry.complete, len(registry), await registry.is_registered(3), await registry.is_registered(4)
+
+    complete, size, known, unknown = run_in_db(_with_users, body, monkeypatch, count_queries, maxsize=2)
+    assert not complete and size == 2
+    assert known is True and unknown is False
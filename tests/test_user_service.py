@@ -0,0 +1,40 @@
+from app.models.models import User
+from app.services.user_service import UserService
+
+
+async def _find(identifiers, count_queries=None):
+    await User.bulk_create([
+        User(id=1, username="ana_dev", first_name="Ana"),
+        User(id=2, username="luis", first_name="Luis"),
+        User(id=3, username=None, first_name="Ángela"),
+        User(id=4, username="carla", first_name="Ana"),
+        User(id=5, username="ana", first_name="Otra"),
+        *(User(id=100 + i, username=f"member{i}", first_name=f"M{i}") for i in range(50)),
+    ])
+    queries = count_queries() if count_queries is not None else []
+    return await UserService.find_users_by_identifiers(identifiers), len(queries)
+
+
+def test_identifiers_ignore_case_and_a_leading_at(run_in_db):
+    (ids, missing), _ = run_in_db(_find, ["@ana_dev", "LUIS", "Ángela", "nadie", "@"])
+    assert ids == [1, 2, 3]
+    assert missing == ["nadie", "@"]
+
+
+def test_username_matches_win_over_first_names(run_in_db):
+    (ids, _), _ = run_in_db(_find, ["Ana"])
+    assert ids == [5]
+
+
+def test_first_names_are_only_searched_for_unknown_usernames(run_in_db, count_queries):
+    (ids, missing), queries = run_in_db(_find, ["LUIS", "otra", "ángela"], count_queries)
+    assert ids == [2, 5]
+    assert missing == ["ángela"]
+    assert queries == 2
+
+
+def test_fifty_members_are_resolved_in_one_query(run_in_db, count_queries):
+    (ids, missing), queries = run_in_db(_find, [f"@member{i}" for i in range(50)], count_queries)
+    assert ids == [100 + i for i in range(50)]
+    assert missing == []
+    assert queries == 1
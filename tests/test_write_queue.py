@@ -0,0 +1,165 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+
+import pytest
+from tortoise.exceptions import IntegrityError, OperationalError
+
+from app.models import write_queue
+from app.models.models import Project, Task, TaskStatus, User
+from app.models.write_queue import WriteQueue, after_commit
+from app.services.task_service import TaskService
+from app.services.user_service import UserService
+
+
+async def _run_with_queue(body, **queue_options):
+    queue = WriteQueue(**queue_options)
+    batches = []
+    commit = queue._commit
+
+    async def counting_commit(batch):
+        batches.append(len(batch))
+        await commit(batch)
+
+    queue._commit = counting_commit
+    queue.start()
+    try:
+        return await body(queue), batches
+    finally:
+        await queue.stop()
+
+
+def test_concurrent_writes_share_commits(run_in_db):
+    async def body(queue):
+        users = await asyncio.gather(*(
+            queue.submit(UserService.create_or_update_user.__wrapped__, i, f"user{i}", "U") for i in range(1, 101)
+        ))
+        return [user.id for user in users], await User.all().count()
+
+    (ids, stored), batches = run_in_db(_run_with_queue, body, max_batch=32, max_delay=0.01)
+    assert ids == list(range(1, 101))
+    assert stored == 100
+    assert sum(batches) == 100
+    assert len(batches) <= 5
+
+
+def test_a_failing_write_only_fails_its_caller(run_in_db):
+    async def create(username):
+        return await User.create(id=1 if username != "other" else 2, username=username, first_name="U")
+
+    async def body(queue):
+        return await asyncio.gather(
+            queue.submit(create, "first"),
+            queue.submit(create, "duplicate"),
+            queue.submit(create, "other"),
+            return_exceptions=True
+        ), await User.all().order_by("id").values_list("username", flat=True)
+
+    (results, stored), batches = run_in_db(_run_with_queue, body, max_delay=0.01)
+    assert isinstance(results[1], IntegrityError)
+    assert results[0].username == "first" and results[2].username == "other"
+    assert stored == ["first", "other"]
+    assert batches == [3]
+
+
+def test_writes_from_a_queued_write_run_inline(run_in_db):
+    async def outer(queue):
+        user = await queue.submit(User.create, id=1, username="a", first_name="A")
+        # Queuing again from inside the writer would wait on itself
+        await queue.submit(User.filter(id=user.id).update, first_name="B")
+        return user
+
+    async def body(queue):
+        await asyncio.wait_for(queue.submit(outer, queue), timeout=2)
+        return await User.get(id=1).values_list("first_name", flat=True)
+
+    first_name, _ = run_in_db(_run_with_queue, body)
+    assert first_name == "B"
+
+
+def test_change_status_keeps_its_result_through_the_queue(run_in_db):
+    async def body(queue):
+        project = await Project.create(name="P", description="d", telegram_chat_id="1")
+        task = await Task.create(custom_id="T1", name="T", project=project, deadline="2030-01-01T00:00:00+00:00")
+        changed = await queue.submit(TaskService.change_status.__wrapped__, task.id, TaskStatus.DONE)
+        missing = await queue.submit(TaskService.change_status.__wrapped__, 999, TaskStatus.DONE)
+        return changed.status, missing
+
+    (status, missing), _ = run_in_db(_run_with_queue, body)
+    assert status == TaskStatus.DONE
+    assert missing is None
+
+
+def test_without_a_writer_writes_run_directly(run_in_db):
+    async def body():
+        user = await UserService.create_or_update_user(1, "a", "A")
+        with pytest.raises(IntegrityError):
+            await WriteQueue().submit(User.create, id=1, username="b", first_name="B")
+        return user.username
+
+    assert run_in_db(body) == "a"
+
+
+
+async def _create_and_record(saved, user_id, username):
+    await User.create(id=user_id, username=username, first_name="U")
+    after_commit(lambda: saved.append(username))
+    return list(saved)
+
+
+def test_commit_hooks_only_run_for_committed_writes(run_in_db):
+    async def body(queue):
+        saved = []
+        results = await asyncio.gather(
+            queue.submit(_create_and_record, saved, 1, "first"),
+            queue.submit(_create_and_record, saved, 1, "duplicate"),
+            return_exceptions=True
+        )
+        return results, saved
+
+    (results, saved), _ = run_in_db(_run_with_queue, body, max_delay=0.01)
+    assert results[0] == []  # Not run inside the write
+    assert isinstance(results[1], IntegrityError)
+    assert saved == ["first"]
+
+
+def test_a_failed_commit_runs_no_hooks(run_in_db, monkeypatch):
+    real = write_queue.in_transaction
+
+    async def body(queue):
+        @asynccontextmanager
+        async def failing_commit(name):
+            outer = not queue._in_transaction()
+            async with real(name) as connection:
+                yield connection
+            if outer:
+                raise OperationalError("disk I/O error")
+
+        monkeypatch.setattr(write_queue, "in_transaction", failing_commit)
+        saved = []
+        with pytest.raises(OperationalError):
+            await queue.submit(_create_and_record, saved, 1, "batched")
+        with pytest.raises(OperationalError):
+            await WriteQueue().submit(_create_and_record, saved, 2, "inline")
+        return saved
+
+    saved, _ = run_in_db(_run_with_queue, body, max_delay=0.01)
+    assert saved == []
+
+
+def test_async_hooks_outside_a_write_are_scheduled():
+    async def record(saved, value):
+        saved.append(value)
+
+    async def fail():
+        raise RuntimeError("hook")
+
+    async def body():
+        saved = []
+        after_commit(partial(record, saved, "scheduled"))
+        after_commit(fail)
+        before = list(saved)
+        await asyncio.sleep(0)
+        return before, saved
+
+    assert asyncio.run(body()) == ([], ["scheduled"])